@@ -2,32 +2,59 @@
 
 This package provides Pydantic models for the AsyncAPI 3.0.0 specification,
 allowing for type-safe parsing and validation of AsyncAPI documents.
+
+Submodules are imported on first attribute access, so importing the package
+only loads the models a program actually uses.
 """
 
-from .asyncapi import AsyncAPI
-from .info import Info, Contact, License
-from .server import Server, ServerVariable
-from .channel import Channel, Message
-from .operation import Operation
-from .components import Components
-from .schema import Schema
-from .security import SecurityScheme, OAuthFlows, OAuthFlow
+import importlib
+from typing import TYPE_CHECKING, Any, List
+
+if TYPE_CHECKING:
+    from .asyncapi import AsyncAPI
+    from .info import Info, Contact, License
+    from .server import Server, ServerVariable
+    from .channel import Channel, Message
+    from .operation import Operation
+    from .components import Components
+    from .schema import Schema
+    from .security import SecurityScheme, OAuthFlows, OAuthFlow
+    from .resolver import RefResolver, RefResolutionError, RefCycleError
 
 __version__ = "0.1.0"
 
-__all__ = [
-    "AsyncAPI",
-    "Info",
-    "Contact",
-    "License",
-    "Server",
-    "ServerVariable",
-    "Channel",
-    "Message",
-    "Operation",
-    "Components",
-    "Schema",
-    "SecurityScheme",
-    "OAuthFlows",
-    "OAuthFlow",
-]
+# Public name -> submodule that defines it.
+_EXPORTS = {
+    "AsyncAPI": "asyncapi",
+    "Info": "info",
+    "Contact": "info",
+    "License": "info",
+    "Server": "server",
+    "ServerVariable": "server",
+    "Channel": "channel",
+    "Message": "channel",
+    "Operation": "operation",
+    "Components": "components",
+    "Schema": "schema",
+    "SecurityScheme": "security",
+    "OAuthFlows": "security",
+    "OAuthFlow": "security",
+    "RefResolver": "resolver",
+    "RefResolutionError": "resolver",
+    "RefCycleError": "resolver",
+}
+
+__all__ = list(_EXPORTS)
+
+
+def __getattr__(name: str) -> Any:
+    module = _EXPORTS.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(f".{module}", __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__() -> List[str]:
+    return sorted(set(globals()) | set(__all__))
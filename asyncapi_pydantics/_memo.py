@@ -0,0 +1,47 @@
+"""Identity-keyed caches for per-object memoization.
+
+Pydantic models are unhashable, so caches that hang derived data (compiled
+validators, hashes, effective objects) off a model instance key on identity
+and drop their entry when the instance is garbage collected.
+"""
+
+import weakref
+from typing import Any, Dict, Generic, Optional, Tuple, TypeVar
+
+V = TypeVar("V")
+
+
+class IdentityCache(Generic[V]):
+    """A cache keyed by object identity holding only weak references to keys."""
+
+    def __init__(self) -> None:
+        self._data: Dict[int, Tuple["weakref.ref[Any]", V]] = {}
+
+    def get(self, obj: Any, default: Optional[V] = None) -> Optional[V]:
+        """Return the cached value for ``obj``, or ``default``."""
+        entry = self._data.get(id(obj))
+        if entry is None or entry[0]() is not obj:
+            return default
+        return entry[1]
+
+    def __setitem__(self, obj: Any, value: V) -> None:
+        key = id(obj)
+        data = self._data
+
+        def remove(ref: "weakref.ref[Any]") -> None:
+            entry = data.get(key)
+            if entry is not None and entry[0] is ref:
+                del data[key]
+
+        data[key] = (weakref.ref(obj, remove), value)
+
+    def __contains__(self, obj: Any) -> bool:
+        entry = self._data.get(id(obj))
+        return entry is not None and entry[0]() is obj
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def clear(self) -> None:
+        """Drop every cached value."""
+        self._data.clear()
@@ -3,14 +3,26 @@
 This module contains the root AsyncAPI document object and related models.
 """
 
-from typing import Optional, Dict, Any
-from pydantic import BaseModel, Field
+from typing import Optional, Dict, Any, Type
+from pydantic import (
+    BaseModel,
+    Field,
+    PrivateAttr,
+    SerializerFunctionWrapHandler,
+    ValidationInfo,
+    ValidatorFunctionWrapHandler,
+    field_serializer,
+    field_validator,
+)
 
 from .info import Info
 from .server import Server
 from .channel import Channel
 from .operation import Operation
 from .components import Components
+from .lazy import LazyModelDict
+from .resolver import ModelT, RefResolver
+from .trusted import construct_trusted
 
 
 class AsyncAPI(BaseModel):
@@ -56,8 +68,64 @@ class AsyncAPI(BaseModel):
         description="An element to hold various reusable objects for the specification.",
     )
 
+    _resolver: Optional[RefResolver] = PrivateAttr(None)
+
+    @classmethod
+    def load(
+        cls, data: Dict[str, Any], *, lazy: bool = False, trusted: bool = False
+    ) -> "AsyncAPI":
+        """Validate a document from a dict.
+
+        With ``lazy=True`` the entries of ``channels`` and ``operations`` are kept
+        as raw data and each is validated into its model the first time it is
+        accessed. ``components`` entries are always held as raw data and are
+        typed on demand through the resolver.
+
+        With ``trusted=True`` validation is skipped altogether and the typed
+        tree is constructed directly; only use it for documents that are known
+        to be valid. ``lazy`` has no effect on trusted loads.
+        """
+        if trusted:
+            return construct_trusted(cls, data)
+        return cls.model_validate(data, context={"lazy": lazy})
+
+    @field_validator("channels", "operations", mode="wrap")
+    @classmethod
+    def _defer_entries(
+        cls, value: Any, handler: ValidatorFunctionWrapHandler, info: ValidationInfo
+    ) -> Any:
+        """Defer validation of section entries in lazy mode."""
+        if isinstance(value, LazyModelDict):
+            # A lazy section passed back in, e.g. by apply_patch, stays lazy.
+            return value.copy()
+        if info.context and info.context.get("lazy") and isinstance(value, dict):
+            model = Channel if info.field_name == "channels" else Operation
+            return LazyModelDict(value, model, info.context)
+        return handler(value)
+
+    @field_serializer("channels", "operations", mode="wrap")
+    def _serialize_entries(
+        self, value: Any, handler: SerializerFunctionWrapHandler
+    ) -> Any:
+        """Validate any deferred entries before serializing them."""
+        if isinstance(value, LazyModelDict):
+            value.materialize()
+        return handler(value)
+
+    @property
+    def resolver(self) -> RefResolver:
+        """The memoizing reference resolver for this document."""
+        if self._resolver is None:
+            self._resolver = RefResolver(self)
+        return self._resolver
+
+    def resolve(self, ref: str, model: Optional[Type[ModelT]] = None) -> Any:
+        """Resolve a local ``$ref`` pointer, optionally as a typed model."""
+        return self.resolver.resolve(ref, model)
+
     class Config:
         """Pydantic configuration."""
 
         populate_by_name = True
         extra = "allow"  # Allow specification extensions
+        defer_build = True
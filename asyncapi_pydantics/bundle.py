@@ -0,0 +1,285 @@
+"""Bundling of documents split across files into one self-contained document.
+
+``bundle`` follows every ``$ref`` in a document, including references into
+other local JSON or YAML files, and returns a document without external
+references. By default the targets of external references are copied into
+``components`` and the references rewritten to point there, so each target
+appears once however often it is referenced; identical targets are
+deduplicated by content. With ``inline=True`` references are replaced by
+their targets instead, leaving nothing to resolve at runtime.
+
+References that form a cycle cannot be inlined and always point into
+``components``, as do the references the specification requires to stay
+references (an operation's channel and messages).
+"""
+
+import json
+import os
+import re
+from typing import Any, Dict, List, Optional, Tuple, Union
+from urllib.parse import unquote
+
+from .patch import _raw
+from .resolver import (
+    _MISSING,
+    ModelT,
+    RefResolutionError,
+    child,
+    escape_token,
+    normalize_pointer,
+    split_pointer,
+)
+from .streaming import _yaml_loader
+
+# A reference target: the absolute path of its file (None for the document
+# being bundled) and a plain JSON pointer within it.
+Key = Tuple[Optional[str], str]
+Path = Tuple[str, ...]
+
+_INVALID_NAME = re.compile(r"[^A-Za-z0-9._-]+")
+
+
+class BundleError(ValueError):
+    """Raised when a reference cannot be followed or placed in components."""
+
+
+def _section(path: Path) -> Optional[str]:
+    """Return the components section for a reference found at ``path``."""
+    if len(path) == 3 and path[0] == "components":
+        return path[1]
+    if path[:2] == ("components", "schemas") or {"payload", "headers"} & set(path):
+        return "schemas"
+    if not path:
+        return None
+    last = path[-1]
+    parent = path[-2] if len(path) > 1 else ""
+    if last == "channel":
+        return "channels"
+    if last == "reply":
+        return "replies"
+    if last == "address" and parent == "reply":
+        return "replyAddresses"
+    if last in ("correlationId", "externalDocs"):
+        return last + ("s" if last == "correlationId" else "")
+    if parent == "traits":
+        return "messageTraits" if "messages" in path else "operationTraits"
+    return {
+        "servers": "servers",
+        "channels": "channels",
+        "operations": "operations",
+        "messages": "messages",
+        "parameters": "parameters",
+        "tags": "tags",
+        "security": "securitySchemes",
+    }.get(parent)
+
+
+def _must_reference(path: Path) -> bool:
+    """Whether the specification requires a Reference Object at ``path``."""
+    in_operation = path[:1] == ("operations",) or path[:2] == (
+        "components",
+        "operations",
+    )
+    return in_operation and (
+        path[-1] == "channel" or (len(path) > 1 and path[-2] == "messages")
+    )
+
+
+class _Bundler:
+    def __init__(
+        self, root: Dict[str, Any], base: str, main: Optional[str], inline: bool
+    ) -> None:
+        self.root = root
+        self.base = base
+        # The file the document was loaded from; references back into it
+        # are local references.
+        self.main = main
+        self.inline = inline
+        self.files: Dict[str, Any] = {}
+        # External target -> the local reference it was imported as.
+        self.imported: Dict[Key, str] = {}
+        # (section, context, content) -> local reference, for deduplication.
+        self.by_content: Dict[Tuple[str, str, str], str] = {}
+        self.added: Dict[str, Dict[str, Any]] = {}
+        self.expanded: Dict[Key, Any] = {}
+        self.stack: List[Key] = []
+        components = root.get("components")
+        for section, entries in (components or {}).items():
+            if isinstance(entries, dict):
+                for name, value in entries.items():
+                    ref = f"#/components/{section}/{escape_token(name)}"
+                    self.by_content.setdefault(self._content(section, None, value), ref)
+
+    def run(self) -> Dict[str, Any]:
+        bundled = self.walk(self.root, None, ())
+        if self.added:
+            components = bundled.setdefault("components", {})
+            for section, entries in self.added.items():
+                components.setdefault(section, {}).update(entries)
+        return bundled  # type: ignore[no-any-return]
+
+    def walk(self, node: Any, file: Optional[str], path: Path) -> Any:
+        if isinstance(node, dict):
+            ref = node.get("$ref")
+            if isinstance(ref, str):
+                return self.reference(ref, file, path)
+            return {
+                key: self.walk(value, file, path + (key,))
+                for key, value in node.items()
+            }
+        if isinstance(node, list):
+            return [
+                self.walk(item, file, path + (str(index),))
+                for index, item in enumerate(node)
+            ]
+        return node
+
+    def reference(self, ref: str, file: Optional[str], path: Path) -> Any:
+        key = self.target(ref, file)
+        if key in self.stack:
+            # A cycle cannot be inlined; point at a component instead.
+            return {"$ref": self.component(key, path, required=True)}
+        if not self.inline or _must_reference(path):
+            if key[0] is None:
+                return {"$ref": "#" + key[1]}
+            local = self.component(key, path)
+            if local is not None:
+                return {"$ref": local}
+        return self.expand(key, path)
+
+    def expand(self, key: Key, path: Path) -> Any:
+        """Return the bundled target of a reference, to be used in its place."""
+        expanded = self.expanded.get(key, _MISSING)
+        if expanded is _MISSING:
+            self.stack.append(key)
+            try:
+                expanded = self.walk(self.lookup(key), key[0], path)
+            finally:
+                self.stack.pop()
+            # Repeated references share one copy of the target.
+            self.expanded[key] = expanded
+        return expanded
+
+    def component(self, key: Key, path: Path, required: bool = False) -> Optional[str]:
+        """Return the local reference for a target, importing it if external."""
+        file, pointer = key
+        if file is None:
+            return "#" + pointer
+        ref = self.imported.get(key)
+        if ref is not None:
+            return ref
+        section = _section(path)
+        if section is None:
+            if required:
+                raise BundleError(
+                    f"Cannot bundle cyclic reference to {self.describe(key)} "
+                    f"found at /{'/'.join(path)}"
+                )
+            return None
+        target = self.lookup(key)
+        content = self._content(section, file, target)
+        ref = self.by_content.get(content)
+        if ref is not None:
+            self.imported[key] = ref
+            return ref
+
+        entries = self.added.setdefault(section, {})
+        existing = (self.root.get("components") or {}).get(section) or {}
+        stem = split_pointer(pointer)[-1] if pointer else os.path.basename(file)
+        if not pointer:
+            stem = os.path.splitext(stem)[0]
+        stem = _INVALID_NAME.sub("_", stem) or "bundled"
+        name = stem
+        suffix = 1
+        while name in entries or name in existing:
+            suffix += 1
+            name = f"{stem}{suffix}"
+        ref = f"#/components/{section}/{escape_token(name)}"
+        self.imported[key] = ref
+        self.by_content[content] = ref
+        entries[name] = None
+        self.stack.append(key)
+        try:
+            entries[name] = self.walk(target, file, ("components", section, name))
+        finally:
+            self.stack.pop()
+        return ref
+
+    def target(self, ref: str, file: Optional[str]) -> Key:
+        location, _, fragment = ref.partition("#")
+        try:
+            pointer = normalize_pointer("#" + fragment)
+        except RefResolutionError as exc:
+            raise BundleError(str(exc)) from exc
+        if not location:
+            return file, pointer
+        if "://" in location:
+            raise BundleError(f"Remote references are not supported: {ref!r}")
+        base = os.path.dirname(file) if file is not None else self.base
+        path = os.path.normpath(os.path.join(base, unquote(location)))
+        return (None if path == self.main else path), pointer
+
+    def lookup(self, key: Key) -> Any:
+        file, pointer = key
+        node = self.root if file is None else self.load(file)
+        for token in split_pointer(pointer):
+            node = child(node, token)
+            if node is _MISSING:
+                raise BundleError(f"Unresolvable reference: {self.describe(key)}")
+        return node
+
+    def load(self, file: str) -> Any:
+        data = self.files.get(file, _MISSING)
+        if data is _MISSING:
+            try:
+                with open(file, "rb") as fp:
+                    if file.lower().endswith((".yaml", ".yml")):
+                        loader = _yaml_loader(fp)
+                        try:
+                            data = loader.get_single_data()
+                        finally:
+                            loader.dispose()
+                    else:
+                        data = json.load(fp)
+            except (OSError, ValueError) as exc:
+                raise BundleError(
+                    f"Cannot read referenced file {file!r}: {exc}"
+                ) from exc
+            self.files[file] = data
+        return data
+
+    def describe(self, key: Key) -> str:
+        file, pointer = key
+        return f"{file or ''}#{pointer}"
+
+    @staticmethod
+    def _content(section: str, file: Optional[str], value: Any) -> Tuple[str, str, str]:
+        encoded = json.dumps(value, sort_keys=True, default=str)
+        # References inside the target are relative to its file.
+        context = (
+            ""
+            if '"$ref"' not in encoded
+            else (os.path.dirname(file) if file is not None else "#")
+        )
+        return section, context, encoded
+
+
+def bundle(
+    document: ModelT,
+    *,
+    base_path: Union[str, "os.PathLike[str]", None] = None,
+    inline: bool = False,
+) -> ModelT:
+    """Return a self-contained copy of a document with its references bundled.
+
+    ``base_path`` is the path of the document's file (or its directory) that
+    relative external references are resolved against; it defaults to the
+    working directory. Raises BundleError if a reference cannot be followed.
+    """
+    base = os.path.abspath(base_path if base_path is not None else os.curdir)
+    main = None
+    if not os.path.isdir(base):
+        main = base
+        base = os.path.dirname(base)
+    bundled = _Bundler(_raw(document), base, main, inline).run()
+    return type(document).model_validate(bundled)
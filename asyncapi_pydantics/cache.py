@@ -0,0 +1,270 @@
+"""Content-addressed on-disk cache of parsed AsyncAPI documents.
+
+Loading the same document repeatedly (on every service start, in every
+worker process) pays for full validation each time. ParseCache keys a raw
+document by a hash of its content and stores the validated model tree in a
+compact, compressed marshal form. A later load of identical content skips
+validation and rehydrates the tree with ``model_construct``.
+"""
+
+import gc
+import hashlib
+import importlib
+import io
+import json
+import marshal
+import os
+import sys
+import tempfile
+import time
+import zlib
+from typing import Any, Dict, Optional, Tuple, Type, Union
+
+from pydantic import BaseModel, HttpUrl
+
+from . import __version__
+from .asyncapi import AsyncAPI
+from .streaming import Source, _detect_format, load_spec
+
+# Bumped whenever the encoding changes, so stale entries are never decoded.
+_FORMAT = 1
+
+# Reserved keys tagging encoded nodes. Documents containing NUL-prefixed keys
+# are rejected by put(), so tags never collide with document data.
+_MODEL = "\x00m"
+_DICT = "\x00d"
+_LIST = "\x00l"
+_URL = "\x00u"
+
+_SUFFIX = ".cache"
+_TMP_SUFFIX = ".tmp"
+
+# Temporary files older than this were left by a writer that died.
+_STALE_TMP_SECONDS = 3600
+
+# Marshal data is only readable by the interpreter version that wrote it.
+_SALT = f"{__version__}:{_FORMAT}:{sys.implementation.cache_tag}:{marshal.version}:"
+
+_model_classes: Dict[str, Type[BaseModel]] = {}
+
+
+def _encode(value: Any) -> Tuple[Any, bool]:
+    """Convert a model tree into marshallable data.
+
+    Returns the encoded value and whether it contains tagged nodes. Models
+    and URLs are tagged, as are containers holding them; plain data is kept
+    as is, so the decoder can return it without walking it.
+    """
+    if isinstance(value, BaseModel):
+        cls = type(value)
+        encoded = {_MODEL: f"{cls.__module__}.{cls.__qualname__}"}
+        for name in value.model_fields_set:
+            encoded[name] = _encode(getattr(value, name))[0]
+        for key, extra in (value.__pydantic_extra__ or {}).items():
+            if key[:1] == "\x00":
+                raise TypeError(f"Cannot cache key {key!r}")
+            encoded[key] = _encode(extra)[0]
+        return encoded, True
+    if isinstance(value, dict):
+        # LazyModelDict.items() materializes the deferred entries.
+        items = {}
+        tagged = False
+        for key, item in value.items():
+            if not isinstance(key, str) or key[:1] == "\x00":
+                raise TypeError(f"Cannot cache key {key!r}")
+            items[key], item_tagged = _encode(item)
+            tagged |= item_tagged
+        return ({_DICT: items} if tagged else items), tagged
+    if isinstance(value, (list, tuple)):
+        encoded_items = [_encode(item) for item in value]
+        if any(item_tagged for _, item_tagged in encoded_items):
+            return {_LIST: [item for item, _ in encoded_items]}, True
+        return [item for item, _ in encoded_items], False
+    if isinstance(value, HttpUrl):
+        return {_URL: str(value)}, True
+    if value is None or isinstance(value, (str, int, float, bool)):
+        return value, False
+    raise TypeError(f"Cannot cache value of type {type(value).__name__}")
+
+
+def _model_class(path: str) -> Type[BaseModel]:
+    cls = _model_classes.get(path)
+    if cls is None:
+        module, _, name = path.rpartition(".")
+        if module.split(".")[0] != __name__.split(".")[0]:
+            raise ValueError(f"Refusing to rehydrate foreign model {path!r}")
+        cls = getattr(importlib.import_module(module), name)
+        if not (isinstance(cls, type) and issubclass(cls, BaseModel)):
+            raise ValueError(f"{path!r} is not a model")
+        _model_classes[path] = cls
+    return cls
+
+
+def _decode(value: Any) -> Any:
+    """Rebuild a model tree from encoded data without validation."""
+    if type(value) is not dict:
+        return value
+    path = value.get(_MODEL)
+    if path is not None:
+        fields = {key: _decode(item) for key, item in value.items() if key != _MODEL}
+        # Validation counts extras as set fields, so pass them explicitly.
+        return _model_class(path).model_construct(set(fields), **fields)
+    if _DICT in value:
+        return {key: _decode(item) for key, item in value[_DICT].items()}
+    if _LIST in value:
+        return [_decode(item) for item in value[_LIST]]
+    if _URL in value:
+        return HttpUrl(value[_URL])
+    return value
+
+
+class ParseCache:
+    """An on-disk cache of validated documents keyed by content hash.
+
+    Entries are written atomically to ``directory``. When the directory
+    grows beyond ``max_bytes``, the least recently used entries are evicted.
+    Only point the cache at a directory you trust: entries are rehydrated
+    without validation.
+    """
+
+    def __init__(
+        self, directory: Union[str, "os.PathLike[str]"], max_bytes: int = 64 << 20
+    ) -> None:
+        self.directory = os.fspath(directory)
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        os.makedirs(self.directory, exist_ok=True)
+
+    @staticmethod
+    def key(content: bytes) -> str:
+        """Return the cache key for raw document content."""
+        digest = hashlib.sha256(_SALT.encode())
+        digest.update(content)
+        return digest.hexdigest()
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.directory, key + _SUFFIX)
+
+    def get(self, key: str) -> Optional[AsyncAPI]:
+        """Return the cached document for a key, or None on a miss."""
+        path = self._path(key)
+        try:
+            with open(path, "rb") as fp:
+                data = fp.read()
+        except FileNotFoundError:
+            return None
+        # Rehydration allocates many containers and no cycles; pausing the
+        # collector avoids repeated full collections while the tree is built.
+        enabled = gc.isenabled()
+        gc.disable()
+        try:
+            document = _decode(marshal.loads(zlib.decompress(data)))
+        except (EOFError, TypeError, ValueError, zlib.error):
+            # A corrupt or truncated entry is treated as a miss.
+            self._remove(path)
+            return None
+        finally:
+            if enabled:
+                gc.enable()
+        if not isinstance(document, AsyncAPI):
+            self._remove(path)
+            return None
+        os.utime(path)
+        return document
+
+    def put(self, key: str, document: AsyncAPI) -> None:
+        """Store a validated document under a key and evict if over budget."""
+        try:
+            encoded = marshal.dumps(_encode(document)[0])
+        except TypeError:
+            return
+        data = zlib.compress(encoded, 1)
+        # Written to a temporary file first so readers never see a partial
+        # entry; the file is removed if writing fails.
+        fp = tempfile.NamedTemporaryFile(
+            dir=self.directory, prefix=key + ".", suffix=_TMP_SUFFIX, delete=False
+        )
+        try:
+            with fp:
+                fp.write(data)
+            os.replace(fp.name, self._path(key))
+        except BaseException:
+            self._remove(fp.name)
+            raise
+        self.evict()
+
+    def load(self, source: Source, *, format: Optional[str] = None) -> AsyncAPI:
+        """Load a JSON or YAML document file, using the cache when possible."""
+        fmt = _detect_format(source, format)
+        if isinstance(source, (str, os.PathLike)):
+            with open(source, "rb") as fp:
+                content = fp.read()
+        else:
+            content = source.read()
+            if isinstance(content, str):
+                content = content.encode("utf-8")
+        key = self.key(fmt.encode() + b"\x00" + content)
+        document = self.get(key)
+        if document is not None:
+            self.hits += 1
+            return document
+        self.misses += 1
+        if fmt == "json":
+            document = AsyncAPI.model_validate_json(content)
+        else:
+            document = load_spec(io.BytesIO(content), format=fmt)
+        self.put(key, document)
+        return document
+
+    def validate(self, data: Dict[str, Any]) -> AsyncAPI:
+        """Validate already parsed document data, using the cache when possible."""
+        content = json.dumps(data, sort_keys=True, separators=(",", ":"), default=str)
+        key = self.key(b"data\x00" + content.encode())
+        document = self.get(key)
+        if document is not None:
+            self.hits += 1
+            return document
+        self.misses += 1
+        document = AsyncAPI.model_validate(data)
+        self.put(key, document)
+        return document
+
+    def evict(self) -> None:
+        """Remove least recently used entries until under ``max_bytes``.
+
+        Temporary files left behind by writers that died are removed too.
+        """
+        entries = []
+        total = 0
+        stale = time.time() - _STALE_TMP_SECONDS
+        with os.scandir(self.directory) as it:
+            for entry in it:
+                if entry.name.endswith(_SUFFIX):
+                    stat = entry.stat()
+                    entries.append((stat.st_mtime, stat.st_size, entry.path))
+                    total += stat.st_size
+                elif entry.name.endswith(_TMP_SUFFIX):
+                    if entry.stat().st_mtime < stale:
+                        self._remove(entry.path)
+        if total <= self.max_bytes:
+            return
+        for _, size, path in sorted(entries):
+            self._remove(path)
+            total -= size
+            if total <= self.max_bytes:
+                break
+
+    def clear(self) -> None:
+        """Remove every cached entry."""
+        with os.scandir(self.directory) as it:
+            for entry in it:
+                if entry.name.endswith(_SUFFIX):
+                    self._remove(entry.path)
+
+    @staticmethod
+    def _remove(path: str) -> None:
+        try:
+            os.remove(path)
+        except FileNotFoundError:
+            pass
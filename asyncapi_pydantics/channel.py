@@ -15,6 +15,7 @@ class CorrelationId(BaseModel):
 
     class Config:
         extra = "allow"
+        defer_build = True
 
 
 class MessageExample(BaseModel):
@@ -27,6 +28,7 @@ class MessageExample(BaseModel):
 
     class Config:
         extra = "allow"
+        defer_build = True
 
 
 class Message(BaseModel):
@@ -51,6 +53,7 @@ class Message(BaseModel):
     class Config:
         populate_by_name = True
         extra = "allow"
+        defer_build = True
 
 
 class Parameter(BaseModel):
@@ -64,6 +67,7 @@ class Parameter(BaseModel):
 
     class Config:
         extra = "allow"
+        defer_build = True
 
 
 class Channel(BaseModel):
@@ -87,3 +91,4 @@ class Channel(BaseModel):
     class Config:
         populate_by_name = True
         extra = "allow"
+        defer_build = True
@@ -0,0 +1,189 @@
+"""Command-line interface.
+
+``asyncapi-pydantics validate`` validates many AsyncAPI documents, spreading
+files over a process pool and printing each result as soon as it is ready.
+``asyncapi-pydantics diff`` reports the changes between two documents and
+fails if any of them is breaking.
+"""
+
+import argparse
+import json
+import os
+import sys
+import time
+from concurrent.futures import Future, ProcessPoolExecutor, as_completed
+from typing import IO, Iterable, Iterator, List, NamedTuple, Optional, Sequence
+
+from pydantic import ValidationError
+
+EXTENSIONS = (".json", ".yaml", ".yml")
+
+
+class FileResult(NamedTuple):
+    """The outcome of validating one file."""
+
+    path: str
+    ok: bool
+    seconds: float
+    errors: List[str]
+
+
+def iter_spec_files(paths: Iterable[str]) -> Iterator[str]:
+    """Yield the files to validate, walking directories for spec files."""
+    for path in paths:
+        if not os.path.isdir(path):
+            yield path
+            continue
+        for root, dirs, files in os.walk(path):
+            dirs[:] = sorted(d for d in dirs if not d.startswith("."))
+            for name in sorted(files):
+                if name.lower().endswith(EXTENSIONS):
+                    yield os.path.join(root, name)
+
+
+def _format_error(error: ValidationError) -> List[str]:
+    messages = []
+    sources = getattr(error, "locations", None) or [None] * error.error_count()
+    for item, source in zip(error.errors(), sources):
+        location = ".".join(str(part) for part in item["loc"]) or "<root>"
+        suffix = f" ({source})" if source is not None else ""
+        messages.append(f"{location}: {item['msg']}{suffix}")
+    return messages
+
+
+def validate_file(path: str) -> FileResult:
+    """Validate one document file, capturing any errors."""
+    # Imported here so that argument parsing does not load the models.
+    from .streaming import load_spec
+
+    start = time.perf_counter()
+    try:
+        load_spec(path, locations=True)
+    except ValidationError as exc:
+        errors = _format_error(exc)
+    except Exception as exc:  # noqa: BLE001 - I/O, JSON and YAML errors
+        errors = [f"{type(exc).__name__}: {exc}"]
+    else:
+        errors = []
+    return FileResult(path, not errors, time.perf_counter() - start, errors)
+
+
+def _iter_results(files: Sequence[str], jobs: int) -> Iterator[FileResult]:
+    """Validate files, yielding results in completion order."""
+    if jobs <= 1 or len(files) <= 1:
+        for path in files:
+            yield validate_file(path)
+        return
+    with ProcessPoolExecutor(max_workers=jobs) as pool:
+        futures: List["Future[FileResult]"] = [
+            pool.submit(validate_file, path) for path in files
+        ]
+        for future in as_completed(futures):
+            yield future.result()
+
+
+def _report(result: FileResult, out: IO[str], output_format: str, quiet: bool) -> None:
+    if output_format == "json":
+        out.write(json.dumps(result._asdict()) + "\n")
+    elif not (quiet and result.ok):
+        status = "ok" if result.ok else "FAIL"
+        out.write(f"{status:4} {result.path} ({result.seconds * 1000:.1f} ms)\n")
+        for error in result.errors:
+            out.write(f"     {error}\n")
+    out.flush()
+
+
+def validate_command(args: argparse.Namespace, out: IO[str]) -> int:
+    """Run the ``validate`` subcommand and return the exit status."""
+    files = list(iter_spec_files(args.paths))
+    if not files:
+        sys.stderr.write("No spec files found\n")
+        return 2
+    jobs = args.jobs or os.cpu_count() or 1
+    start = time.perf_counter()
+    failed = 0
+    busy = 0.0
+    for result in _iter_results(files, jobs):
+        failed += not result.ok
+        busy += result.seconds
+        _report(result, out, args.format, args.quiet)
+    elapsed = time.perf_counter() - start
+    if args.format == "text":
+        out.write(
+            f"{len(files)} files, {failed} failed in {elapsed:.2f} s "
+            f"({busy:.2f} s validating, {min(jobs, len(files))} jobs)\n"
+        )
+    return 1 if failed else 0
+
+
+def diff_command(args: argparse.Namespace, out: IO[str]) -> int:
+    """Run the ``diff`` subcommand and return the exit status."""
+    from .diff import diff_documents
+    from .streaming import load_spec
+
+    changes = diff_documents(load_spec(args.old), load_spec(args.new))
+    for change in changes:
+        if args.format == "json":
+            out.write(json.dumps(change._asdict()) + "\n")
+        else:
+            out.write(f"{change}\n")
+    if args.format == "text":
+        out.write(f"{len(changes)} changes, {len(changes.breaking)} breaking\n")
+    return 1 if changes.has_breaking else 0
+
+
+def build_parser() -> argparse.ArgumentParser:
+    """Return the argument parser for the command-line interface."""
+    parser = argparse.ArgumentParser(
+        prog="asyncapi-pydantics", description="Work with AsyncAPI documents."
+    )
+    commands = parser.add_subparsers(dest="command", required=True)
+    validate = commands.add_parser(
+        "validate", help="validate AsyncAPI documents in parallel"
+    )
+    validate.add_argument(
+        "paths",
+        nargs="+",
+        help="spec files, or directories searched for .json/.yaml/.yml files",
+    )
+    validate.add_argument(
+        "-j",
+        "--jobs",
+        type=int,
+        default=0,
+        help="number of worker processes (default: number of CPUs)",
+    )
+    validate.add_argument(
+        "--format",
+        choices=("text", "json"),
+        default="text",
+        help="print results as text or as one JSON object per line",
+    )
+    validate.add_argument(
+        "-q", "--quiet", action="store_true", help="only print failures"
+    )
+    validate.set_defaults(handler=validate_command)
+
+    diff = commands.add_parser(
+        "diff", help="report changes between two documents, failing if breaking"
+    )
+    diff.add_argument("old", help="the previous version of the spec file")
+    diff.add_argument("new", help="the new version of the spec file")
+    diff.add_argument(
+        "--format",
+        choices=("text", "json"),
+        default="text",
+        help="print changes as text or as one JSON object per line",
+    )
+    diff.set_defaults(handler=diff_command)
+    return parser
+
+
+def main(argv: Optional[Sequence[str]] = None, out: Optional[IO[str]] = None) -> int:
+    """Entry point of the ``asyncapi-pydantics`` console script."""
+    args = build_parser().parse_args(argv)
+    return int(args.handler(args, out or sys.stdout))
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,315 @@
+"""Ahead-of-time code generation for payload models.
+
+This module emits a static Python module containing Pydantic models for
+every ``Components.schemas`` entry and every inline message payload of a
+document, so services can import precompiled models instead of generating
+them at startup. The type mapping matches ``asyncapi_pydantics.dynamic``.
+"""
+
+import json
+import os
+from typing import Any, Dict, List, Optional, Set, Tuple, Union
+
+from pydantic import BaseModel
+
+from .asyncapi import AsyncAPI
+from .dynamic import (
+    _class_name,
+    _constraints,
+    _field_name,
+    _is_object,
+    _merge_all_of,
+    _schema_dict,
+)
+from .resolver import escape_token, get_ref, normalize_pointer
+
+_FORMATS = {"date-time": "datetime", "date": "date", "uuid": "UUID"}
+
+_HEADER = '''"""Pydantic models generated from the AsyncAPI document {title!r} {version}.
+
+Generated by asyncapi_pydantics.codegen. Do not edit by hand.
+"""
+
+from __future__ import annotations
+
+from datetime import date, datetime  # noqa: F401
+from typing import Any, Dict, List, Optional, Union  # noqa: F401
+from uuid import UUID  # noqa: F401
+
+from pydantic import BaseModel, ConfigDict, Field  # noqa: F401
+from typing_extensions import Annotated, Literal  # noqa: F401
+'''
+
+
+class CodegenError(ValueError):
+    """Raised when a document cannot be converted into model source code."""
+
+
+def _field_args(constraints: Dict[str, Any]) -> str:
+    return ", ".join(f"{key}={value!r}" for key, value in constraints.items())
+
+
+class _Emitter:
+    """Collects class and alias definitions while walking schemas."""
+
+    def __init__(self, document: AsyncAPI) -> None:
+        self.document = document
+        self.blocks: List[str] = []
+        self.aliases: List[str] = []
+        # (name, target) of schemas that are just a ``$ref`` to another one.
+        self.ref_aliases: List[Tuple[str, str]] = []
+        self.classes: List[str] = []
+        self.names: Set[str] = set()
+        self.ref_names: Dict[str, str] = {}
+        self.by_content: Dict[str, str] = {}
+        schemas = (document.components.schemas if document.components else None) or {}
+        for key in schemas:
+            pointer = "/components/schemas/" + escape_token(key)
+            self.ref_names[pointer] = self._unique(key)
+
+    def _unique(self, hint: str) -> str:
+        base = _class_name(hint)
+        name, index = base, 2
+        while name in self.names:
+            name = f"{base}{index}"
+            index += 1
+        self.names.add(name)
+        return name
+
+    def ref(self, ref: str) -> str:
+        name = None
+        if ref.startswith("#"):
+            name = self.ref_names.get(normalize_pointer(ref))
+        if name is None:
+            raise CodegenError(
+                f"Only references to components.schemas are supported: {ref!r}"
+            )
+        return name
+
+    def type_expr(self, schema: Any, hint: str) -> str:
+        """Return the Python source of the type annotation for a schema."""
+        schema = _schema_dict(schema)
+        if schema is True or schema is None or schema == {}:
+            return "Any"
+        if not isinstance(schema, dict):
+            raise CodegenError(f"Unsupported schema: {schema!r}")
+        ref = get_ref(schema)
+        if ref is not None:
+            return repr(self.ref(ref))
+        if "const" in schema:
+            return f"Literal[{schema['const']!r}]"
+        if schema.get("enum") is not None:
+            values = schema["enum"]
+            if all(isinstance(v, (str, int, bool)) or v is None for v in values):
+                return f"Literal[{', '.join(repr(v) for v in values)}]"
+            return "Any"
+        for key in ("anyOf", "oneOf"):
+            if schema.get(key):
+                members = [
+                    self.type_expr(sub, f"{hint}Option{index}")
+                    for index, sub in enumerate(schema[key])
+                ]
+                return f"Union[{', '.join(members)}]"
+        if schema.get("allOf"):
+            merged = _merge_all_of(schema, self.document.resolver)
+            return repr(self.object_class(merged, hint)) if merged else "Any"
+
+        types = schema.get("type")
+        if isinstance(types, list):
+            members = [self.type_expr({**schema, "type": t}, hint) for t in types]
+            return f"Union[{', '.join(members)}]"
+        if types is None and _is_object(schema):
+            types = "object"
+        return self._typed(types, schema, hint)
+
+    def _typed(self, types: Optional[str], schema: Dict[str, Any], hint: str) -> str:
+        if types == "string":
+            base = _FORMATS.get(schema.get("format") or "", "str")
+            if base != "str":
+                return base
+        elif types in ("integer", "number"):
+            base = "int" if types == "integer" else "float"
+        elif types == "boolean":
+            return "bool"
+        elif types == "null":
+            return "None"
+        elif types == "array":
+            items = schema.get("items")
+            if isinstance(items, (dict, BaseModel)):
+                base = f"List[{self.type_expr(items, hint + 'Item')}]"
+            else:
+                base = "List[Any]"
+        elif types == "object":
+            if schema.get("properties"):
+                return repr(self.object_class(schema, hint))
+            additional = schema.get("additionalProperties")
+            if isinstance(additional, dict):
+                return f"Dict[str, {self.type_expr(additional, hint + 'Value')}]"
+            return "Dict[str, Any]"
+        else:
+            return "Any"
+        constraints = _constraints(types, schema)
+        if constraints:
+            return f"Annotated[{base}, Field({_field_args(constraints)})]"
+        return base
+
+    def object_class(
+        self, schema: Dict[str, Any], hint: str, name: Optional[str] = None
+    ) -> str:
+        """Emit a model class for an object schema and return its name."""
+        key = json.dumps(schema, sort_keys=True, default=str)
+        if name is None:
+            if key in self.by_content:
+                return self.by_content[key]
+            name = self._unique(hint)
+        self.by_content.setdefault(key, name)
+
+        required = set(schema.get("required") or ())
+        taken: Set[str] = set()
+        lines: List[str] = []
+        for prop, sub in (schema.get("properties") or {}).items():
+            annotation = self.type_expr(sub, name + _class_name(prop))
+            attr = _field_name(prop, taken)
+            args: List[str] = []
+            sub_schema = _schema_dict(sub)
+            if prop in required:
+                args.append("...")
+            else:
+                annotation = f"Optional[{annotation}]"
+                default = (
+                    sub_schema.get("default") if isinstance(sub_schema, dict) else None
+                )
+                args.append(repr(default))
+            if attr != prop:
+                args.append(f"alias={prop!r}")
+            lines.append(f"    {attr}: {annotation} = Field({', '.join(args)})")
+
+        extra = "forbid" if schema.get("additionalProperties") is False else "allow"
+        body = [f"class {name}(BaseModel):"]
+        description = schema.get("description") or schema.get("title")
+        if description:
+            body.append(f"    {_docstring(description)}")
+            body.append("")
+        body.append(
+            f"    model_config = ConfigDict(extra={extra!r}, populate_by_name=True)"
+        )
+        if lines:
+            body.append("")
+            body.extend(lines)
+        self.classes.append(name)
+        self.blocks.append("\n".join(body))
+        return name
+
+    def named(self, schema: Any, name: str) -> str:
+        """Emit a named model (or type alias) for a top-level schema."""
+        schema = _schema_dict(schema)
+        ref = get_ref(schema) if isinstance(schema, dict) else None
+        if ref is not None:
+            target = self.ref(ref)
+            if target != name:
+                self.ref_aliases.append((name, target))
+            return target
+        if isinstance(schema, dict) and schema.get("allOf"):
+            merged = _merge_all_of(schema, self.document.resolver)
+            if merged is not None:
+                return self.object_class(merged, name, name=name)
+        elif _is_object(schema):
+            return self.object_class(schema, name, name=name)
+        self.aliases.append(f"{name} = {self.type_expr(schema, name)}")
+        return name
+
+    def alias_lines(self) -> List[str]:
+        """Return the alias definitions, each after the names it refers to.
+
+        Other aliases refer to names in quotes and can come in any order; a
+        ``$ref`` alias binds its target directly, so chains are emitted from
+        their end.
+        """
+        lines = list(self.aliases)
+        pending = dict(self.ref_aliases)
+        while pending:
+            ready = [name for name, target in pending.items() if target not in pending]
+            if not ready:
+                raise CodegenError(
+                    "Reference cycle between schemas: " + ", ".join(sorted(pending))
+                )
+            for name in ready:
+                lines.append(f"{name} = {pending.pop(name)}")
+        return lines
+
+
+def _docstring(text: str) -> str:
+    first_line = " ".join(str(text).split())
+    return repr(first_line) if '"""' in first_line else f'"""{first_line}"""'
+
+
+def _message_payloads(document: AsyncAPI) -> List[Tuple[str, str, Any]]:
+    """Return ``(pointer, name hint, payload)`` for every inline message."""
+    found: List[Tuple[str, str, Any]] = []
+    components = document.components
+    for key, message in ((components.messages if components else None) or {}).items():
+        if isinstance(message, dict) and "payload" in message and not get_ref(message):
+            pointer = "#/components/messages/" + escape_token(key)
+            found.append((pointer, key, message["payload"]))
+    for channel_id, channel in (document.channels or {}).items():
+        for key, message in (channel.messages or {}).items():
+            if get_ref(message) is not None:
+                continue
+            payload = (
+                message.get("payload")
+                if isinstance(message, dict)
+                else getattr(message, "payload", None)
+            )
+            if payload is not None:
+                pointer = (
+                    f"#/channels/{escape_token(channel_id)}"
+                    f"/messages/{escape_token(key)}"
+                )
+                found.append((pointer, f"{channel_id} {key}", payload))
+    return found
+
+
+def generate_models(document: AsyncAPI) -> str:
+    """Return the source of a module with models for a document's payloads.
+
+    The module defines one model (or type alias, for non-object schemas) per
+    ``components.schemas`` entry and per inline message payload, plus the
+    ``SCHEMAS`` and ``MESSAGE_PAYLOADS`` registries keyed by ``$ref`` pointer.
+    """
+    emitter = _Emitter(document)
+    schemas: Dict[str, str] = {}
+    components = document.components
+    for key, schema in ((components.schemas if components else None) or {}).items():
+        pointer = "/components/schemas/" + escape_token(key)
+        schemas["#" + pointer] = emitter.named(schema, emitter.ref_names[pointer])
+
+    payloads: Dict[str, str] = {}
+    for pointer, hint, payload in _message_payloads(document):
+        payloads[pointer] = emitter.named(payload, emitter._unique(hint + " Payload"))
+
+    parts = [_HEADER.format(title=document.info.title, version=document.info.version)]
+    parts.extend(block + "\n" for block in emitter.blocks)
+    aliases = emitter.alias_lines()
+    if aliases:
+        parts.append("\n".join(aliases) + "\n")
+    if emitter.classes:
+        parts.append(
+            "\n".join(f"{name}.model_rebuild()" for name in emitter.classes) + "\n"
+        )
+    parts.append(_registry("SCHEMAS", schemas))
+    parts.append(_registry("MESSAGE_PAYLOADS", payloads))
+    return "\n\n".join(parts)
+
+
+def _registry(name: str, entries: Dict[str, str]) -> str:
+    lines = [f"{name}: Dict[str, Any] = {{"]
+    lines.extend(f"    {key!r}: {value}," for key, value in entries.items())
+    lines.append("}")
+    return "\n".join(lines) + "\n"
+
+
+def write_models(document: AsyncAPI, path: Union[str, "os.PathLike[str]"]) -> None:
+    """Generate the models module for a document and write it to ``path``."""
+    source = generate_models(document)
+    with open(path, "w", encoding="utf-8") as fp:
+        fp.write(source)
@@ -116,3 +116,4 @@ class Components(BaseModel):
 
         populate_by_name = True
         extra = "allow"
+        defer_build = True
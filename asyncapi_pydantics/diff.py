@@ -0,0 +1,561 @@
+"""Structural diff of AsyncAPI documents with breaking-change detection.
+
+``diff_documents`` compares two documents and reports added, removed and
+changed servers, channels, operations, messages and components, classifying
+each change as breaking or not. Payload schemas are compared keyword by
+keyword: anything that can reject a message the old schema accepted (a
+removed property, a new required field, a narrower type, enum or range)
+is breaking.
+
+Every subtree is summarized by a content hash built from the hashes of its
+children. Equal subtrees are skipped without being walked, so once hashes
+are known a diff costs time proportional to the size of the change. Hashes
+of model instances are cached per instance, which makes repeated diffs
+against the same document (and against documents sharing submodels, as
+``apply_patch`` produces) cheap; documents must not be mutated in place
+after they have been hashed.
+"""
+
+import hashlib
+import json
+from typing import Any, Callable, Dict, Iterator, List, NamedTuple, Optional, Set, Tuple
+
+from pydantic import BaseModel
+
+from ._memo import IdentityCache
+from .resolver import RefResolutionError, escape_token, get_ref, iter_children
+
+_hashes: IdentityCache[bytes] = IdentityCache()
+
+# Keywords whose changes never affect which payloads a schema accepts.
+_ANNOTATIONS = {
+    "title",
+    "description",
+    "examples",
+    "default",
+    "deprecated",
+    "readOnly",
+    "writeOnly",
+    "externalDocs",
+    "$comment",
+    "discriminator",
+}
+# Keywords compared explicitly by _Differ.schema.
+_SCHEMA_HANDLED = {
+    "type",
+    "enum",
+    "const",
+    "required",
+    "properties",
+    "additionalProperties",
+    "items",
+    "maximum",
+    "exclusiveMaximum",
+    "maxLength",
+    "maxItems",
+    "maxProperties",
+    "minimum",
+    "exclusiveMinimum",
+    "minLength",
+    "minItems",
+    "minProperties",
+    "pattern",
+    "format",
+}
+_UPPER_BOUNDS = (
+    "maximum",
+    "exclusiveMaximum",
+    "maxLength",
+    "maxItems",
+    "maxProperties",
+)
+_LOWER_BOUNDS = (
+    "minimum",
+    "exclusiveMinimum",
+    "minLength",
+    "minItems",
+    "minProperties",
+)
+
+
+class Change(NamedTuple):
+    """One difference between two documents."""
+
+    path: str
+    kind: str
+    breaking: bool
+    message: str
+
+    def __str__(self) -> str:
+        flag = "BREAKING " if self.breaking else ""
+        return f"{flag}{self.kind} {self.path}: {self.message}"
+
+
+class DocumentDiff:
+    """The changes between two documents."""
+
+    def __init__(self, changes: List[Change]) -> None:
+        self.changes = changes
+
+    @property
+    def breaking(self) -> List[Change]:
+        """The changes that can break existing producers or consumers."""
+        return [change for change in self.changes if change.breaking]
+
+    @property
+    def has_breaking(self) -> bool:
+        """Whether any change is breaking."""
+        return any(change.breaking for change in self.changes)
+
+    def __iter__(self) -> Iterator[Change]:
+        return iter(self.changes)
+
+    def __len__(self) -> int:
+        return len(self.changes)
+
+    def __bool__(self) -> bool:
+        return bool(self.changes)
+
+    def __repr__(self) -> str:
+        return (
+            f"DocumentDiff({len(self.changes)} changes, {len(self.breaking)} breaking)"
+        )
+
+
+class _Hasher:
+    """Computes Merkle-style content hashes of document subtrees.
+
+    Model hashes are cached per instance for the process; dicts and lists
+    cannot be weakly referenced, so theirs are cached for one diff only.
+    Plain JSON subtrees are hashed from their canonical serialization in a
+    single call rather than node by node.
+    """
+
+    def __init__(self) -> None:
+        self._memo: Dict[int, Tuple[Any, bytes]] = {}
+
+    def __call__(self, node: Any) -> bytes:
+        if isinstance(node, BaseModel):
+            digest = _hashes.get(node)
+            if digest is None:
+                digest = _hashes[node] = self._mapping(iter_children(node))
+            return digest
+        if isinstance(node, (dict, list)):
+            entry = self._memo.get(id(node))
+            if entry is not None and entry[0] is node:
+                return entry[1]
+            try:
+                encoded = json.dumps(node, sort_keys=True, separators=(",", ":"))
+            except (TypeError, ValueError):
+                # Holds models or values without a JSON form.
+                if isinstance(node, dict):
+                    digest = self._mapping(node.items())
+                else:
+                    hasher = hashlib.blake2b(b"[", digest_size=16)
+                    for item in node:
+                        hasher.update(self(item))
+                    digest = hasher.digest()
+            else:
+                digest = hashlib.blake2b(encoded.encode(), digest_size=16).digest()
+            self._memo[id(node)] = (node, digest)
+            return digest
+        return hashlib.blake2b(self._scalar(node), digest_size=16).digest()
+
+    @staticmethod
+    def _scalar(value: Any) -> bytes:
+        return f"{type(value).__name__}:{value!r}".encode()
+
+    def _mapping(self, items: Any) -> bytes:
+        hasher = hashlib.blake2b(b"{", digest_size=16)
+        for key, value in sorted(items, key=lambda item: str(item[0])):
+            hasher.update(str(key).encode() + b"\x00")
+            if isinstance(value, (BaseModel, dict, list)):
+                hasher.update(self(value))
+            else:
+                hasher.update(self._scalar(value) + b"\x00")
+        return hasher.digest()
+
+
+def subtree_hash(node: Any) -> bytes:
+    """Return the content hash of a model or raw subtree.
+
+    Equal subtrees of the same shape have equal hashes; the hash of a model
+    is cached for the lifetime of the instance.
+    """
+    return _Hasher()(node)
+
+
+def _view(node: Any) -> Dict[str, Any]:
+    """Return the children of a model or mapping keyed as in the spec."""
+    if isinstance(node, BaseModel):
+        return dict(iter_children(node))
+    if isinstance(node, dict):
+        return {key: value for key, value in node.items() if value is not None}
+    return {}
+
+
+def _types(schema: Dict[str, Any]) -> Optional[Set[str]]:
+    types = schema.get("type")
+    if types is None:
+        return None
+    types = {types} if isinstance(types, str) else set(types)
+    if "number" in types:
+        types.add("integer")
+    return types
+
+
+class _Differ:
+    def __init__(self, old: Any, new: Any) -> None:
+        self.old = old
+        self.new = new
+        self.hash = _Hasher()
+        self.changes: List[Change] = []
+        self._seen: Set[Tuple[Optional[str], Optional[str]]] = set()
+
+    def same(self, old: Any, new: Any) -> bool:
+        return old is new or self.hash(old) == self.hash(new)
+
+    def report(self, path: str, kind: str, breaking: bool, message: str) -> None:
+        self.changes.append(Change(path or "/", kind, breaking, message))
+
+    def entries(
+        self,
+        path: str,
+        old: Any,
+        new: Any,
+        what: str,
+        compare: Callable[[str, Any, Any], None],
+        removal_breaks: bool = True,
+    ) -> None:
+        """Compare two maps of named entries."""
+        old_map = _view(old) if old is not None else {}
+        new_map = _view(new) if new is not None else {}
+        for key, value in old_map.items():
+            child = f"{path}/{escape_token(key)}"
+            if key not in new_map:
+                self.report(child, "removed", removal_breaks, f"{what} removed")
+            elif not self.same(value, new_map[key]):
+                compare(child, value, new_map[key])
+        for key in new_map:
+            if key not in old_map:
+                self.report(
+                    f"{path}/{escape_token(key)}", "added", False, f"{what} added"
+                )
+
+    def fields(
+        self,
+        path: str,
+        old: Any,
+        new: Any,
+        what: str,
+        breaking: Set[str],
+        nested: Optional[Dict[str, Callable[[str, Any, Any], None]]] = None,
+    ) -> None:
+        """Compare the fields of two objects, delegating nested ones."""
+        old_map = _view(old)
+        new_map = _view(new)
+        other: List[str] = []
+        for key in sorted(set(old_map) | set(new_map)):
+            old_value = old_map.get(key)
+            new_value = new_map.get(key)
+            if old_value is new_value or (
+                old_value is not None
+                and new_value is not None
+                and self.same(old_value, new_value)
+            ):
+                continue
+            child = f"{path}/{escape_token(key)}"
+            if nested and key in nested:
+                nested[key](child, old_value, new_value)
+            elif key in breaking:
+                self.report(child, "changed", True, f"{what} {key} changed")
+            else:
+                other.append(key)
+        if other:
+            self.report(path, "changed", False, f"{what} {', '.join(other)} changed")
+
+    def diff(self) -> List[Change]:
+        self.fields(
+            "",
+            self.old,
+            self.new,
+            "document",
+            breaking={"asyncapi", "defaultContentType"},
+            nested={
+                "servers": lambda p, a, b: self.entries(p, a, b, "server", self.server),
+                "channels": lambda p, a, b: self.entries(
+                    p, a, b, "channel", self.channel
+                ),
+                "operations": lambda p, a, b: self.entries(
+                    p, a, b, "operation", self.operation
+                ),
+                "components": self.components,
+                "info": lambda p, a, b: self.fields(p, a, b, "info", set()),
+            },
+        )
+        return self.changes
+
+    def server(self, path: str, old: Any, new: Any) -> None:
+        self.fields(
+            path,
+            old,
+            new,
+            "server",
+            breaking={"host", "protocol", "protocolVersion", "pathname", "security"},
+        )
+
+    def channel(self, path: str, old: Any, new: Any) -> None:
+        self.fields(
+            path,
+            old,
+            new,
+            "channel",
+            breaking={"address", "servers"},
+            nested={
+                "messages": lambda p, a, b: self.entries(
+                    p, a, b, "message", self.message
+                ),
+                "parameters": lambda p, a, b: self.entries(
+                    p, a, b, "parameter", self.parameter
+                ),
+            },
+        )
+
+    def parameter(self, path: str, old: Any, new: Any) -> None:
+        old_map, new_map = _view(old), _view(new)
+        self.enum(path + "/enum", old_map.get("enum"), new_map.get("enum"))
+        self.fields(
+            path,
+            {k: v for k, v in old_map.items() if k != "enum"},
+            {k: v for k, v in new_map.items() if k != "enum"},
+            "parameter",
+            breaking={"location"},
+        )
+
+    def operation(self, path: str, old: Any, new: Any) -> None:
+        self.fields(
+            path,
+            old,
+            new,
+            "operation",
+            breaking={"action", "channel", "reply", "security"},
+            nested={"messages": self.operation_messages},
+        )
+
+    def operation_messages(self, path: str, old: Any, new: Any) -> None:
+        old_refs = [get_ref(item) for item in old or ()]
+        new_refs = [get_ref(item) for item in new or ()]
+        for ref in old_refs:
+            if ref not in new_refs:
+                self.report(path, "removed", True, f"message {ref} removed")
+        for ref in new_refs:
+            if ref not in old_refs:
+                self.report(path, "added", False, f"message {ref} added")
+
+    def message(self, path: str, old: Any, new: Any) -> None:
+        old_ref, new_ref = get_ref(old), get_ref(new)
+        if old_ref is not None and old_ref == new_ref:
+            # Changes to the shared target are reported where it is defined.
+            return
+        old = self.deref(self.old, old)
+        new = self.deref(self.new, new)
+        if self.same(old, new):
+            return
+        self.fields(
+            path,
+            old,
+            new,
+            "message",
+            breaking={"contentType", "schemaFormat", "correlationId"},
+            nested={
+                "payload": lambda p, a, b: self.schema(p, a, b),
+                "headers": lambda p, a, b: self.schema(p, a, b),
+            },
+        )
+
+    def components(self, path: str, old: Any, new: Any) -> None:
+        old_map, new_map = _view(old), _view(new)
+        for key in sorted(set(old_map) | set(new_map)):
+            old_value = old_map.get(key) or {}
+            new_value = new_map.get(key) or {}
+            if self.same(old_value, new_value):
+                continue
+            child = f"{path}/{escape_token(key)}"
+            if key == "schemas":
+                self.entries(child, old_value, new_value, "schema", self.schema)
+            elif key == "messages":
+                self.entries(child, old_value, new_value, "message", self.message)
+            else:
+                what = key[:-1] if key.endswith("s") else key
+                self.entries(
+                    child,
+                    old_value,
+                    new_value,
+                    what,
+                    lambda p, a, b, what=what: self.report(
+                        p, "changed", True, f"{what} changed"
+                    ),
+                )
+
+    def deref(self, document: Any, node: Any) -> Any:
+        ref = get_ref(node)
+        if ref is None:
+            return node
+        try:
+            return document.resolver.resolve(ref)
+        except (RefResolutionError, AttributeError):
+            return node
+
+    def enum(self, path: str, old: Any, new: Any) -> None:
+        if old is None and new is None:
+            return
+        if new is None:
+            self.report(path, "removed", False, "enum restriction removed")
+        elif old is None:
+            self.report(path, "added", True, "enum restriction added")
+        else:
+            removed = [value for value in old if value not in new]
+            added = [value for value in new if value not in old]
+            if removed:
+                self.report(path, "removed", True, f"enum values {removed} removed")
+            if added:
+                self.report(path, "added", False, f"enum values {added} added")
+
+    def schema(self, path: str, old: Any, new: Any) -> None:
+        """Compare two schemas, flagging changes that reject old payloads."""
+        if old is None or new is None:
+            kind = "added" if old is None else "removed"
+            self.report(path, kind, old is None, f"schema {kind}")
+            return
+        old_ref, new_ref = get_ref(old), get_ref(new)
+        if old_ref is not None and old_ref == new_ref:
+            return
+        if old_ref is not None or new_ref is not None:
+            if (old_ref, new_ref) in self._seen:
+                return
+            self._seen.add((old_ref, new_ref))
+        old = self.deref(self.old, old)
+        new = self.deref(self.new, new)
+        if self.same(old, new):
+            return
+        if isinstance(old, bool) or isinstance(new, bool):
+            self.report(path, "changed", new is False, "schema changed")
+            return
+        a, b = _view(old), _view(new)
+
+        old_types, new_types = _types(a), _types(b)
+        if old_types != new_types:
+            if new_types is not None and (old_types is None or old_types - new_types):
+                self.report(
+                    path + "/type", "changed", True, f"type narrowed to {b['type']}"
+                )
+            else:
+                self.report(path + "/type", "changed", False, "type widened")
+        self.enum(path + "/enum", a.get("enum"), b.get("enum"))
+        if "const" in a or "const" in b:
+            if a.get("const") != b.get("const"):
+                self.report(path + "/const", "changed", "const" in b, "const changed")
+        for key in _UPPER_BOUNDS + _LOWER_BOUNDS:
+            self.bound(path, key, a.get(key), b.get(key), key in _UPPER_BOUNDS)
+        for key in ("pattern", "format"):
+            if a.get(key) != b.get(key):
+                self.report(
+                    f"{path}/{key}", "changed", b.get(key) is not None, f"{key} changed"
+                )
+
+        old_required = set(a.get("required") or ())
+        new_required = set(b.get("required") or ())
+        for name in sorted(new_required - old_required):
+            self.report(
+                path + "/required", "added", True, f"property {name!r} now required"
+            )
+        for name in sorted(old_required - new_required):
+            self.report(
+                path + "/required", "removed", False, f"property {name!r} optional"
+            )
+
+        old_props = _view(a.get("properties"))
+        new_props = _view(b.get("properties"))
+        for name in old_props:
+            child = f"{path}/properties/{escape_token(name)}"
+            if name not in new_props:
+                self.report(child, "removed", True, "property removed")
+            elif not self.same(old_props[name], new_props[name]):
+                self.schema(child, old_props[name], new_props[name])
+        for name in new_props:
+            if name not in old_props:
+                self.report(
+                    f"{path}/properties/{escape_token(name)}",
+                    "added",
+                    False,
+                    "property added",
+                )
+
+        old_extra = a.get("additionalProperties")
+        new_extra = b.get("additionalProperties")
+        if not (old_extra is None and new_extra is None) and not self.same(
+            old_extra, new_extra
+        ):
+            child = path + "/additionalProperties"
+            if new_extra is False:
+                self.report(child, "changed", True, "additional properties forbidden")
+            elif new_extra is None or new_extra is True:
+                self.report(child, "changed", False, "additional properties allowed")
+            elif old_extra is None or old_extra is True:
+                self.report(child, "changed", True, "additional properties restricted")
+            else:
+                self.schema(child, old_extra, new_extra)
+
+        if "items" in a or "items" in b:
+            old_items, new_items = a.get("items"), b.get("items")
+            if old_items is None or not self.same(old_items, new_items):
+                if isinstance(old_items, list) or isinstance(new_items, list):
+                    self.report(path + "/items", "changed", True, "items changed")
+                elif old_items is None:
+                    self.report(path + "/items", "added", True, "items restricted")
+                else:
+                    self.schema(path + "/items", old_items, new_items)
+
+        other = sorted(
+            key
+            for key in set(a) | set(b)
+            if key not in _SCHEMA_HANDLED
+            and (
+                a.get(key) is None
+                or b.get(key) is None
+                or not self.same(a[key], b[key])
+            )
+        )
+        breaking = [
+            key for key in other if key not in _ANNOTATIONS and not key.startswith("x-")
+        ]
+        if breaking:
+            self.report(path, "changed", True, f"schema {', '.join(breaking)} changed")
+        if len(other) > len(breaking):
+            names = ", ".join(key for key in other if key not in breaking)
+            self.report(path, "changed", False, f"schema {names} changed")
+
+    def bound(self, path: str, key: str, old: Any, new: Any, upper: bool) -> None:
+        if old == new:
+            return
+        if new is None:
+            self.report(f"{path}/{key}", "removed", False, f"{key} removed")
+        elif old is None:
+            self.report(f"{path}/{key}", "added", True, f"{key} {new} added")
+        else:
+            tighter = new < old if upper else new > old
+            self.report(
+                f"{path}/{key}",
+                "changed",
+                tighter,
+                f"{key} changed from {old} to {new}",
+            )
+
+
+def diff_documents(old: Any, new: Any) -> DocumentDiff:
+    """Compare two AsyncAPI documents.
+
+    Paths in the result are JSON pointers; payload changes are reported at
+    the message or component where the schema is written.
+    """
+    return DocumentDiff(_Differ(old, new).diff())
@@ -0,0 +1,411 @@
+"""Dynamic Pydantic models generated from Schema Objects.
+
+This module converts Schema Objects (such as message payloads) into Pydantic
+model classes with ``create_model``, so runtime payloads are parsed and
+validated by pydantic-core. Generated models are cached: schemas reached
+through ``$ref`` become one shared, named model per document.
+"""
+
+import json
+import keyword
+import re
+from functools import lru_cache
+from datetime import date, datetime
+from typing import Any, Dict, List, Optional, Set, Tuple, Type, Union
+from uuid import UUID
+
+from pydantic import BaseModel, ConfigDict, Field, RootModel, create_model
+from typing_extensions import Annotated, Literal
+
+from ._memo import IdentityCache
+from .channel import Message
+from .resolver import RefResolver, get_ref, normalize_pointer, split_pointer
+from .schema import MultiFormatSchema, Schema
+
+_FORMATS: Dict[str, Any] = {"date-time": datetime, "date": date, "uuid": UUID}
+
+_RESERVED = set(dir(BaseModel))
+
+# JSON Schema keyword -> ``Field`` argument, per type.
+_NUMBER_CONSTRAINTS = (
+    ("minimum", "ge"),
+    ("maximum", "le"),
+    ("exclusiveMinimum", "gt"),
+    ("exclusiveMaximum", "lt"),
+    ("multipleOf", "multiple_of"),
+)
+_CONSTRAINTS: Dict[str, Tuple[Tuple[str, str], ...]] = {
+    "string": (
+        ("minLength", "min_length"),
+        ("maxLength", "max_length"),
+        ("pattern", "pattern"),
+    ),
+    "integer": _NUMBER_CONSTRAINTS,
+    "number": _NUMBER_CONSTRAINTS,
+    "array": (("minItems", "min_length"), ("maxItems", "max_length")),
+}
+
+
+class ModelGenerationError(ValueError):
+    """Raised when a schema cannot be converted into a model."""
+
+
+def _schema_dict(schema: Any) -> Any:
+    if isinstance(schema, MultiFormatSchema):
+        schema = schema.schema
+    if isinstance(schema, BaseModel):
+        return schema.model_dump(by_alias=True, exclude_unset=True)
+    return schema
+
+
+def _class_name(hint: str) -> str:
+    """Turn an arbitrary string into a CamelCase class name."""
+    words = re.split(r"[^0-9A-Za-z]+", hint)
+    name = "".join(word[:1].upper() + word[1:] for word in words if word)
+    if not name or name[0].isdigit():
+        name = "Model" + name
+    return name
+
+
+def _constraints(types: str, schema: Dict[str, Any]) -> Dict[str, Any]:
+    """Return the ``Field`` arguments for the constraints of a typed schema."""
+    return {
+        arg: schema[key]
+        for key, arg in _CONSTRAINTS.get(types, ())
+        if schema.get(key) is not None
+    }
+
+
+def _is_object(schema: Any) -> bool:
+    return isinstance(schema, dict) and (
+        schema.get("type") == "object"
+        or (schema.get("type") is None and bool(schema.get("properties")))
+    )
+
+
+def _merge_all_of(
+    schema: Dict[str, Any], resolver: Optional[RefResolver]
+) -> Optional[Dict[str, Any]]:
+    """Merge ``allOf`` object schemas into a single object schema.
+
+    Returns None if a part is not an object schema, or is a reference that
+    cannot be resolved without a resolver.
+    """
+    merged: Dict[str, Any] = {"type": "object", "properties": {}, "required": []}
+    parts = [schema] + list(schema["allOf"])
+    for part in parts:
+        part = _schema_dict(part)
+        ref = get_ref(part)
+        if ref is not None:
+            if resolver is None:
+                return None
+            part = _schema_dict(resolver.resolve(ref))
+        if part is schema:
+            part = {k: v for k, v in schema.items() if k != "allOf"}
+        elif part.get("allOf"):
+            part = _merge_all_of(part, resolver)
+            if part is None:
+                return None
+        if part.get("type") not in (None, "object"):
+            return None
+        merged["properties"].update(part.get("properties") or {})
+        merged["required"].extend(part.get("required") or [])
+        if part.get("additionalProperties") is False:
+            merged["additionalProperties"] = False
+    return merged
+
+
+def _field_name(name: str, taken: Set[str]) -> str:
+    """Return a valid, non-clashing attribute name for a property."""
+    candidate = re.sub(r"\W", "_", name)
+    if (
+        not candidate
+        or candidate[0].isdigit()
+        or candidate.startswith("_")
+        or keyword.iskeyword(candidate)
+        or candidate in _RESERVED
+        or candidate.startswith("model_")
+    ):
+        candidate = "field_" + candidate.lstrip("_")
+    while candidate in taken:
+        candidate += "_"
+    taken.add(candidate)
+    return candidate
+
+
+class ModelFactory:
+    """Builds and caches Pydantic models for the schemas of one document.
+
+    Models generated for ``$ref`` targets are cached by pointer and named
+    after the component, so messages that share a schema share its model.
+    Inline schemas, including those that become a ``RootModel``, are cached
+    by content.
+    """
+
+    def __init__(self, resolver: Optional[RefResolver] = None) -> None:
+        self.resolver = resolver
+        self._by_ref: Dict[str, Any] = {}
+        self._by_content: Dict[str, Type[BaseModel]] = {}
+        self._roots: Dict[str, Type[BaseModel]] = {}
+        self._names: Dict[str, Type[BaseModel]] = {}
+        self._building: Set[str] = set()
+        self._pending_rebuild: List[Type[BaseModel]] = []
+
+    def model(self, schema: Any, name: str = "Payload") -> Type[BaseModel]:
+        """Return a model for a schema.
+
+        Object schemas become regular models; any other schema becomes a
+        ``RootModel`` wrapping the corresponding type.
+        """
+        schema = _schema_dict(schema)
+        ref = get_ref(schema)
+        if ref is not None:
+            annotation = self._ref(ref)
+            if isinstance(annotation, type) and issubclass(annotation, BaseModel):
+                self._rebuild()
+                return annotation
+        elif _is_object(schema):
+            model = self._object_model(schema, name)
+            self._rebuild()
+            return model
+        key = json.dumps(schema, sort_keys=True, default=str)
+        cached = self._roots.get(key)
+        if cached is not None:
+            return cached
+        if ref is None:
+            annotation = self.annotation(schema, name)
+        model = create_model(  # type: ignore[call-overload]
+            self._unique_name(name), __base__=RootModel, root=(annotation, ...)
+        )
+        self._roots[key] = model
+        self._rebuild()
+        return model  # type: ignore[no-any-return]
+
+    def annotation(self, schema: Any, hint: str) -> Any:
+        """Return the type annotation for a schema."""
+        schema = _schema_dict(schema)
+        if schema is True or schema is None or schema == {}:
+            return Any
+        if schema is False:
+            raise ModelGenerationError("Boolean 'false' schemas cannot be modelled")
+        if not isinstance(schema, dict):
+            raise ModelGenerationError(f"Invalid schema: {schema!r}")
+        ref = get_ref(schema)
+        if ref is not None:
+            return self._ref(ref)
+
+        if "const" in schema:
+            return Literal[schema["const"]]  # type: ignore[valid-type]
+        if schema.get("enum") is not None:
+            values = tuple(schema["enum"])
+            if all(isinstance(v, (str, int, bool)) or v is None for v in values):
+                return Literal[values]  # type: ignore[valid-type]
+            return Any
+        for key in ("anyOf", "oneOf"):
+            if schema.get(key):
+                members = [
+                    self.annotation(sub, f"{hint}Option{index}")
+                    for index, sub in enumerate(schema[key])
+                ]
+                return Union[tuple(members)]  # type: ignore[return-value]
+        if schema.get("allOf"):
+            merged = _merge_all_of(schema, self.resolver)
+            if merged is None:
+                return Any
+            return self._object_model(merged, hint)
+
+        types = schema.get("type")
+        if isinstance(types, list):
+            members = [
+                self.annotation({**schema, "type": item}, hint) for item in types
+            ]
+            return Union[tuple(members)]  # type: ignore[return-value]
+        if types is None and _is_object(schema):
+            types = "object"
+        return self._typed(types, schema, hint)
+
+    def _typed(self, types: Optional[str], schema: Dict[str, Any], hint: str) -> Any:
+        if types == "string":
+            base = _FORMATS.get(schema.get("format") or "", str)
+            if base is not str:
+                return base
+        elif types in ("integer", "number"):
+            base = int if types == "integer" else float
+        elif types == "boolean":
+            return bool
+        elif types == "null":
+            return type(None)
+        elif types == "array":
+            items = schema.get("items")
+            if isinstance(items, dict) or isinstance(items, BaseModel):
+                base = List[self.annotation(items, hint + "Item")]  # type: ignore[misc]
+            else:
+                base = List[Any]
+        elif types == "object":
+            if schema.get("properties"):
+                return self._object_model(schema, hint)
+            additional = schema.get("additionalProperties")
+            if isinstance(additional, dict):
+                return Dict[str, self.annotation(additional, hint + "Value")]  # type: ignore[misc]
+            return Dict[str, Any]
+        else:
+            return Any
+        constraints = _constraints(types, schema)
+        if constraints:
+            return Annotated[base, Field(**constraints)]
+        return base
+
+    def _ref(self, ref: str) -> Any:
+        pointer = normalize_pointer(ref)
+        if pointer in self._by_ref:
+            return self._by_ref[pointer]
+        if pointer in self._building:
+            # Recursive reference: refer to the model by name and rebuild it
+            # once the whole cycle has been created.
+            return self._ref_name(pointer)
+        if self.resolver is None:
+            raise ModelGenerationError(f"Cannot resolve {ref!r} without a resolver")
+        target = _schema_dict(self.resolver.resolve(ref))
+        name = self._ref_name(pointer)
+        self._building.add(pointer)
+        try:
+            if _is_object(target):
+                annotation: Any = self._object_model(target, name, exact_name=True)
+            else:
+                annotation = self.annotation(target, name)
+        finally:
+            self._building.discard(pointer)
+        self._by_ref[pointer] = annotation
+        return annotation
+
+    def _ref_name(self, pointer: str) -> str:
+        tokens = split_pointer(pointer)
+        return _class_name(tokens[-1] if tokens else "Root")
+
+    def _unique_name(self, name: str) -> str:
+        base = _class_name(name)
+        candidate, index = base, 2
+        while candidate in self._names:
+            candidate = f"{base}{index}"
+            index += 1
+        return candidate
+
+    def _object_model(
+        self, schema: Dict[str, Any], name: str, exact_name: bool = False
+    ) -> Type[BaseModel]:
+        key = json.dumps(schema, sort_keys=True, default=str)
+        cached = self._by_content.get(key)
+        if cached is not None and (not exact_name or cached.__name__ == name):
+            return cached
+
+        class_name = _class_name(name) if exact_name else self._unique_name(name)
+        required = set(schema.get("required") or ())
+        taken: Set[str] = set()
+        fields: Dict[str, Tuple[Any, Any]] = {}
+        has_forward_refs = False
+        for prop, sub in (schema.get("properties") or {}).items():
+            annotation = self.annotation(sub, class_name + _class_name(prop))
+            has_forward_refs |= isinstance(annotation, str)
+            attr = _field_name(prop, taken)
+            alias = prop if attr != prop else None
+            sub_schema = _schema_dict(sub)
+            if prop in required:
+                fields[attr] = (annotation, Field(..., alias=alias))
+            else:
+                default = (
+                    sub_schema.get("default") if isinstance(sub_schema, dict) else None
+                )
+                fields[attr] = (Optional[annotation], Field(default, alias=alias))
+
+        extra = "forbid" if schema.get("additionalProperties") is False else "allow"
+        model = create_model(  # type: ignore[call-overload]
+            class_name,
+            __config__=ConfigDict(extra=extra, populate_by_name=True),
+            **fields,
+        )
+        self._names.setdefault(class_name, model)
+        self._by_content[key] = model
+        if has_forward_refs or self._building:
+            self._pending_rebuild.append(model)
+        return model  # type: ignore[no-any-return]
+
+    def _rebuild(self) -> None:
+        """Resolve forward references left by recursive schemas."""
+        if self._building:
+            return
+        pending, self._pending_rebuild = self._pending_rebuild, []
+        for model in pending:
+            model.model_rebuild(_types_namespace=dict(self._names))
+
+
+# Models generated without a resolver; the others are kept on the resolver
+# they were built against, so a Schema or Message shared between documents
+# (for example by apply_patch) gets a model for each document.
+_schema_models: IdentityCache[Type[BaseModel]] = IdentityCache()
+_message_models: IdentityCache[Type[BaseModel]] = IdentityCache()
+
+
+def model_factory(resolver: Optional[RefResolver] = None) -> ModelFactory:
+    """Return the shared model factory for a document's resolver.
+
+    The factory is kept on the resolver. Without a resolver, a new factory is
+    returned, so inline schemas do not pile up in a process-wide cache.
+    """
+    if resolver is None:
+        return ModelFactory()
+    return resolver.derived("model_factory", lambda: ModelFactory(resolver))
+
+
+@lru_cache(maxsize=1024)
+def _model_json(canonical: str, name: str) -> Type[BaseModel]:
+    return ModelFactory().model(json.loads(canonical), name)
+
+
+def schema_model(
+    schema: Union[Schema, Dict[str, Any]],
+    name: str = "Payload",
+    resolver: Optional[RefResolver] = None,
+) -> Type[BaseModel]:
+    """Return a Pydantic model for a schema.
+
+    Models are cached per Schema instance, and by content for plain dicts:
+    on the resolver's factory when one is given, otherwise in a bounded
+    process-wide cache.
+    """
+    if isinstance(schema, BaseModel):
+        models = (
+            _schema_models
+            if resolver is None
+            else resolver.derived("schema_models", IdentityCache)
+        )
+        cached = models.get(schema)
+        if cached is None:
+            cached = models[schema] = model_factory(resolver).model(schema, name)
+        return cached
+    if resolver is None and isinstance(schema, dict):
+        try:
+            canonical = json.dumps(schema, sort_keys=True)
+        except (TypeError, ValueError):
+            return ModelFactory().model(schema, name)
+        return _model_json(canonical, name)
+    return model_factory(resolver).model(schema, name)
+
+
+def message_model(
+    message: Message, resolver: Optional[RefResolver] = None
+) -> Type[BaseModel]:
+    """Return the Pydantic model for a message's payload, cached per message.
+
+    With a resolver, the model is cached per message and resolver.
+    """
+    models = (
+        _message_models
+        if resolver is None
+        else resolver.derived("message_models", IdentityCache)
+    )
+    cached = models.get(message)
+    if cached is None:
+        name = _class_name(message.name or message.title or "Payload")
+        payload = message.payload if message.payload is not None else {}
+        cached = models[message] = model_factory(resolver).model(payload, name)
+    return cached
@@ -23,3 +23,4 @@ class ExternalDocumentation(BaseModel):
         """Pydantic configuration."""
 
         extra = "allow"
+        defer_build = True
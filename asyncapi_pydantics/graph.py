@@ -0,0 +1,294 @@
+"""Cross-reference graph of the objects in a document.
+
+DocumentGraph records which operations use which channels, which channels
+carry which messages and are available on which servers, which schemas a
+message's payload and headers use (directly or through other schemas), and
+which security schemes operations and servers require. It is built in one
+pass over the document and answers both forward and reverse questions with
+a single dict lookup.
+
+Nodes are identified by the JSON pointer reference of their definition,
+such as ``"#/channels/lights"`` or ``"#/components/schemas/Reading"``;
+references are followed to the object they finally point to, so a message
+reached through several references is a single node.
+"""
+
+from typing import Any, Dict, FrozenSet, Iterable, List, Optional, Set, Tuple
+
+from pydantic import BaseModel
+
+from .resolver import (
+    _MISSING,
+    RefResolutionError,
+    child,
+    escape_token,
+    get_ref,
+    iter_children,
+    normalize_pointer,
+    split_pointer,
+)
+
+# Edge kinds, each stored with its reverse.
+OPERATION_CHANNEL = "operation-channel"
+OPERATION_MESSAGE = "operation-message"
+CHANNEL_MESSAGE = "channel-message"
+CHANNEL_SERVER = "channel-server"
+MESSAGE_SCHEMA = "message-schema"
+SCHEMA_SCHEMA = "schema-schema"
+OPERATION_SECURITY = "operation-security"
+SERVER_SECURITY = "server-security"
+
+_EMPTY: FrozenSet[str] = frozenset()
+
+Relation = Dict[str, FrozenSet[str]]
+
+
+def _frozen(relation: Dict[str, Set[str]]) -> Relation:
+    return {node: frozenset(targets) for node, targets in relation.items()}
+
+
+def _entries(node: Any, key: str) -> List[Tuple[str, Any]]:
+    value = child(node, key)
+    return [] if value is _MISSING else iter_children(value)
+
+
+def _refs(node: Any) -> Iterable[str]:
+    """Yield every ``$ref`` within a raw or model subtree."""
+    stack = [node]
+    while stack:
+        node = stack.pop()
+        if isinstance(node, dict):
+            ref = node.get("$ref")
+            if isinstance(ref, str):
+                yield ref
+                continue
+            values: Iterable[Any] = node.values()
+        elif isinstance(node, list):
+            values = node
+        else:
+            ref = get_ref(node)
+            if ref is not None:
+                yield ref
+                continue
+            values = [value for _, value in iter_children(node)]
+        stack.extend(
+            value for value in values if isinstance(value, (BaseModel, dict, list))
+        )
+
+
+class DocumentGraph:
+    """Forward and reverse cross-references between the objects of a document.
+
+    The graph is a snapshot of the document at the time it is built.
+    """
+
+    def __init__(self, document: Any) -> None:
+        self.document = document
+        self._nodes: Dict[str, Any] = {}
+        self._out: Dict[str, Dict[str, Set[str]]] = {}
+        self._in: Dict[str, Dict[str, Set[str]]] = {}
+        self._messages: Dict[str, Any] = {}
+        self._build(document)
+        self._freeze()
+
+    def _lookup(self, ref: str) -> Any:
+        """Return the node a reference points to by stepping down from the root.
+
+        Only the handful of pointers references actually use are visited, so
+        unlike RefResolver no index of the whole document is built.
+        """
+        node = self._nodes.get(ref, _MISSING)
+        if node is _MISSING:
+            node = self.document
+            for token in split_pointer(normalize_pointer(ref)):
+                node = child(node, token)
+                if node is _MISSING:
+                    raise RefResolutionError(f"Unresolvable reference: {ref!r}")
+            self._nodes[ref] = node
+        return node
+
+    def _canonical(self, ref: str) -> str:
+        """Return the pointer of the definition a reference finally reaches."""
+        seen = set()
+        while True:
+            try:
+                pointer = normalize_pointer(ref)
+                node = self._lookup(ref)
+            except RefResolutionError:
+                # Dangling and external references are kept as they are.
+                return ref
+            target = get_ref(node)
+            if target is None or pointer in seen:
+                return "#" + pointer
+            seen.add(pointer)
+            ref = target
+
+    def _add(self, kind: str, source: str, target: str) -> None:
+        self._out.setdefault(kind, {}).setdefault(source, set()).add(target)
+        self._in.setdefault(kind, {}).setdefault(target, set()).add(source)
+
+    def _node(self, node: Any, pointer: str) -> Tuple[str, Any]:
+        """Return the id and definition of a node that may be a reference."""
+        ref = get_ref(node)
+        if ref is None:
+            return pointer, node
+        target = self._canonical(ref)
+        try:
+            return target, self._lookup(target)
+        except RefResolutionError:
+            return target, None
+
+    def _security(self, kind: str, source: str, node: Any, pointer: str) -> None:
+        for index, requirement in _entries(node, "security"):
+            scheme, _ = self._node(requirement, f"{pointer}/security/{index}")
+            self._add(kind, source, scheme)
+
+    def _build(self, document: Any) -> None:
+        servers = []
+        for name, server in _entries(document, "servers"):
+            pointer = "#/servers/" + escape_token(name)
+            servers.append(pointer)
+            self._security(SERVER_SECURITY, pointer, server, pointer)
+
+        messages = self._messages
+        for name, channel in _entries(document, "channels"):
+            pointer = "#/channels/" + escape_token(name)
+            for key, message in _entries(channel, "messages"):
+                location = f"{pointer}/messages/{escape_token(key)}"
+                message_id, definition = self._node(message, location)
+                messages[message_id] = definition
+                self._add(CHANNEL_MESSAGE, pointer, message_id)
+            channel_servers = _entries(channel, "servers")
+            # A channel without servers is available on all of them.
+            for _, server in channel_servers:
+                self._add(CHANNEL_SERVER, pointer, self._node(server, "")[0])
+            if not channel_servers:
+                for server in servers:
+                    self._add(CHANNEL_SERVER, pointer, server)
+
+        channel_messages = self._out.get(CHANNEL_MESSAGE, {})
+        for name, operation in _entries(document, "operations"):
+            pointer = "#/operations/" + escape_token(name)
+            channel = child(operation, "channel")
+            channel_id = None
+            if channel is not _MISSING:
+                channel_id = self._node(channel, pointer + "/channel")[0]
+                self._add(OPERATION_CHANNEL, pointer, channel_id)
+            listed = _entries(operation, "messages")
+            for index, message in listed:
+                location = f"{pointer}/messages/{index}"
+                message_id, definition = self._node(message, location)
+                messages.setdefault(message_id, definition)
+                self._add(OPERATION_MESSAGE, pointer, message_id)
+            if not listed and channel_id is not None:
+                # Without a list the operation handles every channel message.
+                for message_id in channel_messages.get(channel_id, ()):
+                    self._add(OPERATION_MESSAGE, pointer, message_id)
+            self._security(OPERATION_SECURITY, pointer, operation, pointer)
+
+        components = child(document, "components")
+        if components is not _MISSING:
+            for name, message in _entries(components, "messages"):
+                pointer = "#/components/messages/" + escape_token(name)
+                messages.setdefault(pointer, message)
+            for name, schema in _entries(components, "schemas"):
+                pointer = "#/components/schemas/" + escape_token(name)
+                for ref in _refs(schema):
+                    self._add(SCHEMA_SCHEMA, pointer, self._canonical(ref))
+
+        for message_id, message in messages.items():
+            if message is None:
+                continue
+            for key in ("payload", "headers"):
+                value = child(message, key)
+                if value is not _MISSING:
+                    for ref in _refs(value):
+                        self._add(MESSAGE_SCHEMA, message_id, self._canonical(ref))
+
+    def _freeze(self) -> None:
+        """Precompute the transitive schema relations and freeze every edge set."""
+        nested = self._out.get(SCHEMA_SCHEMA, {})
+        used: Dict[str, Set[str]] = {}
+        for message_id, schemas in self._out.get(MESSAGE_SCHEMA, {}).items():
+            closure = set(schemas)
+            stack = list(schemas)
+            while stack:
+                for schema in nested.get(stack.pop(), ()):
+                    if schema not in closure:
+                        closure.add(schema)
+                        stack.append(schema)
+            used[message_id] = closure
+        users: Dict[str, Set[str]] = {}
+        operations: Dict[str, Set[str]] = {}
+        message_operations = self._in.get(OPERATION_MESSAGE, {})
+        for message_id, schemas in used.items():
+            for schema in schemas:
+                users.setdefault(schema, set()).add(message_id)
+                operations.setdefault(schema, set()).update(
+                    message_operations.get(message_id, ())
+                )
+        self._schemas_of = _frozen(used)
+        self._schema_messages = _frozen(users)
+        self._schema_operations = _frozen(operations)
+        self._forward = {kind: _frozen(edges) for kind, edges in self._out.items()}
+        self._reverse = {kind: _frozen(edges) for kind, edges in self._in.items()}
+        del self._out, self._in
+
+    @property
+    def messages(self) -> Dict[str, Any]:
+        """Every message in the document, by id, with its (raw or model) definition.
+
+        Unresolvable message references map to None.
+        """
+        return self._messages
+
+    def targets(self, kind: str, node: str) -> FrozenSet[str]:
+        """Return the nodes an edge of ``kind`` leads to from ``node``."""
+        return self._forward.get(kind, {}).get(node, _EMPTY)
+
+    def sources(self, kind: str, node: str) -> FrozenSet[str]:
+        """Return the nodes with an edge of ``kind`` leading to ``node``."""
+        return self._reverse.get(kind, {}).get(node, _EMPTY)
+
+    def channel_of(self, operation: str) -> Optional[str]:
+        """Return the channel an operation is performed on."""
+        return next(iter(self.targets(OPERATION_CHANNEL, operation)), None)
+
+    def operations_on_channel(self, channel: str) -> FrozenSet[str]:
+        """Return the operations performed on a channel."""
+        return self.sources(OPERATION_CHANNEL, channel)
+
+    def messages_of(self, node: str) -> FrozenSet[str]:
+        """Return the messages of a channel or operation."""
+        kind = (
+            OPERATION_MESSAGE if node.startswith("#/operations/") else CHANNEL_MESSAGE
+        )
+        return self.targets(kind, node)
+
+    def channels_on_server(self, server: str) -> FrozenSet[str]:
+        """Return the channels available on a server."""
+        return self.sources(CHANNEL_SERVER, server)
+
+    def servers_of(self, channel: str) -> FrozenSet[str]:
+        """Return the servers a channel is available on."""
+        return self.targets(CHANNEL_SERVER, channel)
+
+    def schemas_of(self, message: str) -> FrozenSet[str]:
+        """Return every named schema a message uses, directly or indirectly."""
+        return self._schemas_of.get(message, _EMPTY)
+
+    def messages_using_schema(self, schema: str) -> FrozenSet[str]:
+        """Return the messages whose payload or headers use a schema."""
+        return self._schema_messages.get(schema, _EMPTY)
+
+    def operations_using_schema(self, schema: str) -> FrozenSet[str]:
+        """Return the operations sending or receiving messages using a schema."""
+        return self._schema_operations.get(schema, _EMPTY)
+
+    def operations_using_security(self, scheme: str) -> FrozenSet[str]:
+        """Return the operations that require a security scheme."""
+        return self.sources(OPERATION_SECURITY, scheme)
+
+    def servers_using_security(self, scheme: str) -> FrozenSet[str]:
+        """Return the servers that require a security scheme."""
+        return self.sources(SERVER_SECURITY, scheme)
@@ -29,6 +29,7 @@ class Contact(BaseModel):
         """Pydantic configuration."""
 
         extra = "allow"
+        defer_build = True
 
 
 class License(BaseModel):
@@ -44,6 +45,7 @@ class License(BaseModel):
         """Pydantic configuration."""
 
         extra = "allow"
+        defer_build = True
 
 
 class Info(BaseModel):
@@ -88,3 +90,4 @@ class Info(BaseModel):
 
         populate_by_name = True
         extra = "allow"
+        defer_build = True
@@ -0,0 +1,158 @@
+"""Hash-consing of repeated subtrees in AsyncAPI documents.
+
+Large documents repeat the same fragments many times inline: payload
+schemas for timestamps and identifiers, envelopes, tags, links to external
+documentation. ``intern_document`` walks a loaded document once and makes
+every structurally identical dict, list and string share one object, and
+likewise every identical ``Schema``, ``Tag`` and ``ExternalDocumentation``.
+The document then holds each distinct fragment once, and caches keyed on
+Schema instances (compiled validators, generated models) hit for every copy.
+
+Interned values are shared between all the places they appear. They are
+not frozen: treat them as read-only, and use ``model_copy`` or
+``copy.deepcopy`` before changing one.
+"""
+
+from typing import Any, Dict, Set, Tuple
+
+from pydantic import BaseModel
+
+from .external_docs import ExternalDocumentation
+from .schema import Schema
+from .tag import Tag
+
+# Models shared by content; other models are only walked.
+SHARED = (Schema, Tag, ExternalDocumentation)
+
+# Separates a model's extra fields from its declared ones in its key.
+_EXTRA = object()
+
+
+class Interner:
+    """Canonical instances of data and models, by content.
+
+    An Interner is only needed while documents are interned; dropping it
+    afterwards releases its tables but leaves the sharing in place.
+    """
+
+    def __init__(self) -> None:
+        # Structural key -> canonical container or model. A key holds its
+        # children's keys: the string itself, ``(type, value)`` for other
+        # scalars and the id of the canonical child for containers and
+        # models, which the table keeps alive.
+        self._containers: Dict[Any, Any] = {}
+        self._strings: Dict[str, str] = {}
+        # Ids of canonical containers, to skip subtrees already interned.
+        self._canonical: Set[int] = set()
+        # Id of each model visited -> its canonical model and key part.
+        self._models: Dict[int, Tuple[Any, Any]] = {}
+        self.hits = 0
+
+    def data(self, value: Any) -> Any:
+        """Return the canonical copy of a value.
+
+        Containers are only rebuilt where a child was replaced by an
+        existing equal value; otherwise the given object becomes canonical.
+        Models are updated in place to refer to canonical children.
+        """
+        return self._intern(value)[0]
+
+    def _intern(self, value: Any) -> Tuple[Any, Any]:
+        """Return the canonical value and its key part."""
+        kind = type(value)
+        if kind is str:
+            value = self._strings.setdefault(value, value)
+            return value, value
+        if kind is float:
+            # hex() keeps -0.0 apart from 0.0, which compare equal.
+            return value, (kind, value.hex())
+        if kind is not dict and kind is not list:
+            if isinstance(value, BaseModel):
+                return self._model(value)
+            if isinstance(value, dict):
+                return self._mapping(value)
+            try:
+                hash(value)
+            except TypeError:
+                return value, id(value)
+            return value, (kind, value)
+        if id(value) in self._canonical:
+            return value, id(value)
+        intern = self._intern
+        changed = False
+        if kind is dict:
+            items = {}
+            parts = []
+            for name, item in value.items():
+                canonical, part = intern(item)
+                changed = changed or canonical is not item
+                items[name] = canonical
+                parts.append(name)
+                parts.append(part)
+        else:
+            items = []
+            parts = []
+            for item in value:
+                canonical, part = intern(item)
+                changed = changed or canonical is not item
+                items.append(canonical)
+                parts.append(part)
+        key = (kind, tuple(parts))
+        found = self._containers.get(key)
+        if found is None:
+            found = self._containers[key] = items if changed else value
+            self._canonical.add(id(found))
+        elif found is not value:
+            self.hits += 1
+        return found, id(found)
+
+    def _mapping(self, mapping: Dict[str, Any]) -> Tuple[Any, Any]:
+        """Intern the values of a dict subclass, such as a lazy section, in place."""
+        if id(mapping) not in self._canonical:
+            self._canonical.add(id(mapping))
+            for key, item in dict.items(mapping):
+                canonical = self._intern(item)[0]
+                if canonical is not item:
+                    dict.__setitem__(mapping, key, canonical)
+        return mapping, id(mapping)
+
+    def _model(self, model: BaseModel) -> Tuple[Any, Any]:
+        """Point a model at canonical children and return its canonical model."""
+        seen = self._models.get(id(model))
+        if seen is not None:
+            return seen
+        parts = [tuple(sorted(model.model_fields_set))]
+        for fields in (model.__dict__, model.__pydantic_extra__ or {}):
+            parts.append(_EXTRA)
+            for name, item in fields.items():
+                canonical, part = self._intern(item)
+                if canonical is not item:
+                    fields[name] = canonical
+                parts.append(name)
+                parts.append(part)
+        found = model
+        if isinstance(model, SHARED):
+            key = (type(model), tuple(parts))
+            found = self._containers.setdefault(key, model)
+            if found is not model:
+                self.hits += 1
+        result = self._models[id(model)] = (found, id(found))
+        # Keep the model alive so that its id is not reused during the pass.
+        self._containers[(id(model),)] = model
+        return result
+
+    def __len__(self) -> int:
+        return len(self._containers) + len(self._strings)
+
+
+def intern_document(document: BaseModel) -> int:
+    """Share identical subtrees of a loaded document in place.
+
+    Raw data, such as message payloads, and ``Schema``, ``Tag`` and
+    ``ExternalDocumentation`` objects are shared. The raw entries of lazy
+    sections are shared as data; models validated from them later are not.
+    Returns the number of duplicates replaced by a shared value.
+    """
+    interner = Interner()
+    interner.data(document)
+    return interner.hits
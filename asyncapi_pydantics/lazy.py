@@ -0,0 +1,138 @@
+"""Lazily validated mappings.
+
+This module contains the LazyModelDict used by the lazy load mode of AsyncAPI.
+"""
+
+from typing import (
+    Any,
+    Dict,
+    Generic,
+    ItemsView,
+    Iterator,
+    Optional,
+    Tuple,
+    Type,
+    TypeVar,
+    ValuesView,
+)
+
+from pydantic import BaseModel
+
+ModelT = TypeVar("ModelT", bound=BaseModel)
+
+_MISSING = object()
+
+
+class LazyModelDict(Dict[str, ModelT], Generic[ModelT]):
+    """A dict of models whose entries are validated on first access.
+
+    Entries are stored as raw data and replaced in place by their validated
+    model the first time they are read, so each entry is validated at most
+    once. Validation errors surface when the invalid entry is accessed.
+    """
+
+    def __init__(
+        self,
+        raw: Dict[str, Any],
+        model: Type[ModelT],
+        context: Optional[Dict[str, Any]] = None,
+    ) -> None:
+        super().__init__(raw)
+        self.model = model
+        self.context = context
+
+    def _load(self, key: str, value: Any) -> ModelT:
+        if isinstance(value, self.model):
+            return value
+        loaded = self.model.model_validate(value, context=self.context)
+        dict.__setitem__(self, key, loaded)
+        return loaded
+
+    def is_loaded(self, key: str) -> bool:
+        """Return whether the entry for ``key`` has already been validated."""
+        return isinstance(dict.__getitem__(self, key), self.model)
+
+    def materialize(self) -> "LazyModelDict[ModelT]":
+        """Validate every remaining entry."""
+        for key, value in dict.items(self):
+            if not isinstance(value, self.model):
+                self._load(key, value)
+        return self
+
+    def __getitem__(self, key: str) -> ModelT:
+        return self._load(key, dict.__getitem__(self, key))
+
+    def get(self, key: str, default: Any = None) -> Any:
+        value = dict.get(self, key, _MISSING)
+        if value is _MISSING:
+            return default
+        return self._load(key, value)
+
+    def pop(self, key: str, *args: Any) -> Any:
+        if key not in self:
+            return dict.pop(self, key, *args)
+        value = dict.pop(self, key)
+        if isinstance(value, self.model):
+            return value
+        return self.model.model_validate(value, context=self.context)
+
+    def popitem(self) -> Tuple[str, ModelT]:
+        key, value = dict.popitem(self)
+        if not isinstance(value, self.model):
+            value = self.model.model_validate(value, context=self.context)
+        return key, value
+
+    def setdefault(self, key: str, default: Any = None) -> Any:
+        if key in self:
+            return self[key]
+        dict.__setitem__(self, key, default)
+        return default
+
+    def values(self) -> ValuesView[ModelT]:
+        return dict.values(self.materialize())
+
+    def items(self) -> ItemsView[str, ModelT]:
+        return dict.items(self.materialize())
+
+    def __iter__(self) -> Iterator[str]:
+        # Overriding __iter__ turns off CPython's dict-merge fast path, so
+        # dict(self), {**self} and other.update(self) read entries through
+        # __getitem__ and get models rather than raw data.
+        return dict.__iter__(self)
+
+    def copy(self) -> "LazyModelDict[ModelT]":
+        """Return a shallow copy that keeps unvalidated entries deferred."""
+        return type(self)(dict(dict.items(self)), self.model, self.context)
+
+    __copy__ = copy
+
+    def __or__(self, other: Any) -> Any:
+        if not isinstance(other, dict):
+            return NotImplemented
+        merged = dict(self)
+        merged.update(other)
+        return merged
+
+    def __ror__(self, other: Any) -> Any:
+        if not isinstance(other, dict):
+            return NotImplemented
+        merged = dict(other)
+        merged.update(self)
+        return merged
+
+    def __eq__(self, other: object) -> bool:
+        if isinstance(other, LazyModelDict):
+            other.materialize()
+        return dict.__eq__(self.materialize(), other)
+
+    __hash__ = None  # type: ignore[assignment]
+
+    def __reduce__(self) -> Any:
+        return (dict, (dict(self.materialize()),))
+
+    def __repr__(self) -> str:
+        loaded = sum(isinstance(value, self.model) for value in dict.values(self))
+        return (
+            f"{type(self).__name__}({self.model.__name__}, "
+            f"{loaded}/{len(self)} loaded)"
+        )
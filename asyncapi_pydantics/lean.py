@@ -0,0 +1,204 @@
+"""Lean documents that leave documentation out of the model tree.
+
+Services that only route and validate messages never read prose:
+``description``, ``summary``, ``title``, ``examples`` and ``externalDocs``.
+``strip_document`` returns a copy of a raw document without these keys on
+Info, Channel, Message, Operation and Tag objects, in the raw JSON Schemas
+of message payloads and headers, and in the ``components`` entries of those
+kinds. Loading the copy with ``AsyncAPI.load`` keeps the values out of the
+tree. Required fields, such as the title of Info, are kept.
+
+``extensions=True`` removes ``x-`` specification extensions from the same
+objects, on its own or with ``documentation=False`` to keep the prose.
+"""
+
+from typing import Any, Callable, Dict, FrozenSet, NamedTuple, Optional
+
+from .channel import Channel, Message
+from .info import Info
+from .operation import Operation
+from .tag import Tag
+
+DOCUMENTATION = frozenset(
+    {"description", "summary", "title", "examples", "externalDocs"}
+)
+
+# JSON Schema keywords holding subschemas, directly, as a list or by name.
+_SUBSCHEMA = frozenset(
+    {
+        "additionalItems",
+        "additionalProperties",
+        "contains",
+        "else",
+        "if",
+        "items",
+        "not",
+        "propertyNames",
+        "then",
+        "unevaluatedItems",
+        "unevaluatedProperties",
+    }
+)
+_SUBSCHEMA_LISTS = frozenset({"allOf", "anyOf", "oneOf", "prefixItems", "items"})
+_SUBSCHEMA_MAPS = frozenset(
+    {
+        "$defs",
+        "definitions",
+        "dependencies",
+        "dependentSchemas",
+        "patternProperties",
+        "properties",
+    }
+)
+
+
+class LeanProfile(NamedTuple):
+    """What a lean document leaves out."""
+
+    documentation: bool = True
+    extensions: bool = False
+
+
+_droppable: Dict[type, FrozenSet[str]] = {}
+
+
+def _keys(cls: Optional[type], profile: LeanProfile) -> FrozenSet[str]:
+    """Return the documentation keys a model can do without."""
+    if not profile.documentation:
+        return frozenset()
+    if cls is None:
+        return DOCUMENTATION
+    keys = _droppable.get(cls)
+    if keys is None:
+        required = {
+            field.alias or name
+            for name, field in cls.model_fields.items()  # type: ignore[attr-defined]
+            if field.is_required()
+        }
+        keys = _droppable[cls] = DOCUMENTATION - required
+    return keys
+
+
+def strip_object(
+    value: Dict[str, Any], keys: FrozenSet[str], extensions: bool
+) -> Dict[str, Any]:
+    """Return a mapping without the given keys and, optionally, ``x-`` keys."""
+    return {
+        key: item
+        for key, item in value.items()
+        if key not in keys and not (extensions and key.startswith("x-"))
+    }
+
+
+def strip_schema(schema: Any, profile: LeanProfile) -> Any:
+    """Return a raw JSON Schema without documentation, at every level.
+
+    Only schema keywords are removed: property names and values of ``enum``,
+    ``const`` or ``default`` are left alone.
+    """
+    if not isinstance(schema, dict):
+        return schema
+    stripped = strip_object(schema, _keys(None, profile), profile.extensions)
+    for key, value in stripped.items():
+        if key in _SUBSCHEMA_MAPS and isinstance(value, dict):
+            stripped[key] = {
+                name: strip_schema(item, profile) for name, item in value.items()
+            }
+        elif key in _SUBSCHEMA_LISTS and isinstance(value, list):
+            stripped[key] = [strip_schema(item, profile) for item in value]
+        elif key in _SUBSCHEMA:
+            stripped[key] = strip_schema(value, profile)
+    return stripped
+
+
+def _strip_model(value: Any, cls: type, profile: LeanProfile) -> Any:
+    """Strip an object of a model and the tags it carries."""
+    if not isinstance(value, dict):
+        return value
+    stripped = strip_object(value, _keys(cls, profile), profile.extensions)
+    tags = stripped.get("tags")
+    if isinstance(tags, list):
+        stripped["tags"] = [_strip_model(tag, Tag, profile) for tag in tags]
+    return stripped
+
+
+def _strip_message(message: Any, profile: LeanProfile) -> Any:
+    stripped = _strip_model(message, Message, profile)
+    if isinstance(stripped, dict):
+        for key in ("payload", "headers"):
+            if key in stripped:
+                stripped[key] = strip_schema(stripped[key], profile)
+    return stripped
+
+
+def _strip_channel(channel: Any, profile: LeanProfile) -> Any:
+    stripped = _strip_model(channel, Channel, profile)
+    messages = stripped.get("messages") if isinstance(stripped, dict) else None
+    if isinstance(messages, dict):
+        stripped["messages"] = {
+            name: _strip_message(message, profile) for name, message in messages.items()
+        }
+    return stripped
+
+
+def _strip_operation(operation: Any, profile: LeanProfile) -> Any:
+    return _strip_model(operation, Operation, profile)
+
+
+def _strip_tag(tag: Any, profile: LeanProfile) -> Any:
+    return _strip_model(tag, Tag, profile)
+
+
+Stripper = Callable[[Any, LeanProfile], Any]
+
+# Components section -> stripper for each raw entry.
+_COMPONENTS: Dict[str, Stripper] = {
+    "schemas": strip_schema,
+    "messages": _strip_message,
+    "messageTraits": _strip_message,
+    "channels": _strip_channel,
+    "operations": _strip_operation,
+    "operationTraits": _strip_operation,
+    "tags": _strip_tag,
+}
+
+# Top-level section holding named entries -> stripper for each entry.
+_SECTIONS: Dict[str, Stripper] = {
+    "channels": _strip_channel,
+    "operations": _strip_operation,
+}
+
+
+def _strip_entries(section: Any, strip: Stripper, profile: LeanProfile) -> Any:
+    if not isinstance(section, dict):
+        return section
+    return {name: strip(entry, profile) for name, entry in section.items()}
+
+
+def strip_document(
+    data: Dict[str, Any], *, documentation: bool = True, extensions: bool = False
+) -> Dict[str, Any]:
+    """Return a copy of a raw document without documentation.
+
+    ``documentation=False`` keeps the prose, for use with ``extensions=True``
+    to drop only ``x-`` extensions. The input is not modified; unchanged
+    values are shared with it.
+    """
+    profile = LeanProfile(documentation=documentation, extensions=extensions)
+    stripped = dict(data)
+    if "info" in stripped:
+        stripped["info"] = _strip_model(stripped["info"], Info, profile)
+    for key, strip in _SECTIONS.items():
+        if key in stripped:
+            stripped[key] = _strip_entries(stripped[key], strip, profile)
+    components = stripped.get("components")
+    if isinstance(components, dict):
+        stripped["components"] = {
+            key: (
+                _strip_entries(section, _COMPONENTS[key], profile)
+                if key in _COMPONENTS
+                else section
+            )
+            for key, section in components.items()
+        }
+    return stripped
@@ -0,0 +1,92 @@
+"""Source locations of values in YAML documents.
+
+The YAML loader can record where each value of a document starts, keyed by
+JSON pointer, in a SourceMap. Validation errors raised while loading are then
+annotated with the line and column of the value each error refers to, so
+tools can point at the offending line of the file rather than at a path in
+the model tree.
+"""
+
+from typing import Any, Dict, Iterator, List, NamedTuple, Optional, Sequence, Union
+
+from pydantic import ValidationError
+
+from .resolver import escape_token
+
+# Positions are packed into one int per pointer, which keeps the table at
+# about the size of its pointer strings.
+_COLUMN_BITS = 24
+_COLUMN_MASK = (1 << _COLUMN_BITS) - 1
+
+
+class SourceLocation(NamedTuple):
+    """The 1-based line and column where the value at ``pointer`` starts."""
+
+    pointer: str
+    line: int
+    column: int
+
+    def __str__(self) -> str:
+        return f"line {self.line}, column {self.column}"
+
+
+class SourceMap:
+    """Line and column of each value of a document, keyed by JSON pointer.
+
+    Mapping values are located at their key, sequence items at the item.
+    """
+
+    def __init__(self, name: Optional[str] = None) -> None:
+        self.name = name
+        self._positions: Dict[str, int] = {}
+
+    def add(self, pointer: str, line: int, column: int) -> None:
+        """Record a 0-based position, as reported by the YAML parser."""
+        self._positions[pointer] = (line + 1) << _COLUMN_BITS | (column + 1)
+
+    def get(self, pointer: str) -> Optional[SourceLocation]:
+        """Return the location of the value at a pointer, if recorded."""
+        packed = self._positions.get(pointer)
+        if packed is None:
+            return None
+        return SourceLocation(pointer, packed >> _COLUMN_BITS, packed & _COLUMN_MASK)
+
+    def locate(self, loc: Sequence[Union[str, int]]) -> Optional[SourceLocation]:
+        """Return the location of the deepest recorded value along a Pydantic loc.
+
+        Parts that are not keys of the document, such as the union member
+        names Pydantic adds to error locations, are skipped.
+        """
+        pointer = "#"
+        for part in loc:
+            child = f"{pointer}/{escape_token(str(part))}"
+            if child in self._positions:
+                pointer = child
+        return self.get(pointer)
+
+    def __contains__(self, pointer: object) -> bool:
+        return pointer in self._positions
+
+    def __len__(self) -> int:
+        return len(self._positions)
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._positions)
+
+
+def annotate_error(
+    error: ValidationError, source_map: SourceMap, prefix: Sequence[Any] = ()
+) -> ValidationError:
+    """Attach source locations to a validation error and return it.
+
+    ``error.locations`` is set to a list aligned with ``error.errors()``
+    holding the SourceLocation of each error, or None where the document
+    has no recorded position. ``prefix`` is the location of the validated
+    value within the document, for errors raised by one of its entries.
+    """
+    locations: List[Optional[SourceLocation]] = [
+        source_map.locate((*prefix, *item["loc"])) for item in error.errors()
+    ]
+    error.locations = locations  # type: ignore[attr-defined]
+    error.source_map = source_map  # type: ignore[attr-defined]
+    return error
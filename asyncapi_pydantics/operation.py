@@ -29,6 +29,7 @@ class OperationReplyAddress(BaseModel):
         """Pydantic configuration."""
 
         extra = "allow"
+        defer_build = True
 
 
 class OperationReply(BaseModel):
@@ -56,6 +57,7 @@ class OperationReply(BaseModel):
         """Pydantic configuration."""
 
         extra = "allow"
+        defer_build = True
 
 
 class OperationTrait(BaseModel):
@@ -102,6 +104,7 @@ class OperationTrait(BaseModel):
 
         populate_by_name = True
         extra = "allow"
+        defer_build = True
 
 
 class Operation(BaseModel):
@@ -171,3 +174,4 @@ class Operation(BaseModel):
 
         populate_by_name = True
         extra = "allow"
+        defer_build = True
@@ -0,0 +1,206 @@
+"""Incremental re-validation of documents from JSON Patch operations.
+
+``apply_patch`` applies an RFC 6902 JSON Patch to a validated model and
+returns a new model in which only the subtrees on the patched paths are
+validated again. Every model along a patched path is copied shallowly;
+untouched submodels are passed back to validation as instances, which
+Pydantic accepts without revalidating, so they are shared with the original.
+"""
+
+import copy
+from typing import Any, Dict, Iterable, List, Mapping, Tuple, Union
+
+from pydantic import BaseModel
+from pydantic_core import to_jsonable_python
+
+from .lazy import LazyModelDict
+from .resolver import ModelT, _field_keys, split_pointer
+
+Container = Union[Dict[str, Any], List[Any]]
+
+
+class PatchError(ValueError):
+    """Raised when a patch operation is malformed or cannot be applied."""
+
+
+def _thaw(node: Any, path: str) -> Container:
+    """Return a shallow, mutable copy of a node keyed as in the spec."""
+    if isinstance(node, BaseModel):
+        fields_set = node.model_fields_set
+        thawed = {
+            key: getattr(node, name)
+            for name, key in _field_keys(type(node))
+            if name in fields_set
+        }
+        if node.__pydantic_extra__:
+            thawed.update(node.__pydantic_extra__)
+        return thawed
+    if isinstance(node, LazyModelDict):
+        # Entries that are still deferred are copied without validating them.
+        return node.copy()
+    if isinstance(node, dict):
+        return dict(node)
+    if isinstance(node, list):
+        return list(node)
+    raise PatchError(f"Cannot descend into a scalar value at {path!r}")
+
+
+def _raw(value: Any) -> Any:
+    """Return plain data for a value that may hold models."""
+    if isinstance(value, BaseModel):
+        return value.model_dump(mode="json", by_alias=True, exclude_unset=True)
+    if isinstance(value, dict):
+        return {key: _raw(item) for key, item in value.items()}
+    if isinstance(value, list):
+        return [_raw(item) for item in value]
+    return to_jsonable_python(value)
+
+
+def _index(container: List[Any], token: str, path: str, append: bool) -> int:
+    if append and token == "-":
+        return len(container)
+    if not token.isdigit() or (token != "0" and token.startswith("0")):
+        raise PatchError(f"Invalid array index {token!r} in {path!r}")
+    index = int(token)
+    if index > len(container) or (index == len(container) and not append):
+        raise PatchError(f"Array index out of range in {path!r}")
+    return index
+
+
+class _Patcher:
+    """Applies operations to a copy-on-write view of a model tree."""
+
+    def __init__(self, document: BaseModel) -> None:
+        self.root: Any = _thaw(document, "")
+        # Containers created here, which may be mutated in place; kept by id
+        # with the objects themselves so that ids cannot be reused.
+        self._owned: Dict[int, Container] = {id(self.root): self.root}
+        # Entries written to lazy sections, validated before the result is.
+        self._deferred: List[Tuple[LazyModelDict[Any], str]] = []
+
+    def _own(self, node: Any, path: str) -> Container:
+        if id(node) in self._owned:
+            return node  # type: ignore[no-any-return]
+        thawed = _thaw(node, path)
+        self._owned[id(thawed)] = thawed
+        return thawed
+
+    def _set(self, container: Container, token: str, value: Any) -> None:
+        if isinstance(container, dict):
+            container[token] = value
+            if isinstance(container, LazyModelDict):
+                self._deferred.append((container, token))
+        else:
+            container[int(token)] = value
+
+    def validate_deferred(self) -> None:
+        """Validate the entries of lazy sections that the patch changed."""
+        for container, token in self._deferred:
+            if token in container:
+                container[token]
+
+    def _child(self, container: Container, token: str, path: str) -> Any:
+        if isinstance(container, dict):
+            if token not in container:
+                raise PatchError(f"Path {path!r} does not exist")
+            return container[token]
+        return container[_index(container, token, path, append=False)]
+
+    def _parent(self, path: str) -> Tuple[Container, str]:
+        """Return the owned container holding ``path`` and the last token."""
+        tokens = split_pointer(path)
+        if not tokens:
+            raise PatchError("The document root has no parent")
+        node = self.root
+        for token in tokens[:-1]:
+            value = self._child(node, token, path)
+            owned = self._own(value, path)
+            if owned is not value:
+                self._set(node, token, owned)
+            node = owned
+        return node, tokens[-1]
+
+    def get(self, path: str) -> Any:
+        node = self.root
+        for token in split_pointer(path):
+            if not isinstance(node, (dict, list)):
+                node = _thaw(node, path)
+            node = self._child(node, token, path)
+        return node
+
+    def add(self, path: str, value: Any) -> None:
+        if not path:
+            self.root = value
+            return
+        parent, token = self._parent(path)
+        if isinstance(parent, dict):
+            self._set(parent, token, value)
+        else:
+            parent.insert(_index(parent, token, path, append=True), value)
+
+    def remove(self, path: str) -> Any:
+        parent, token = self._parent(path)
+        if isinstance(parent, dict):
+            if token not in parent:
+                raise PatchError(f"Path {path!r} does not exist")
+            return parent.pop(token)
+        return parent.pop(_index(parent, token, path, append=False))
+
+    def replace(self, path: str, value: Any) -> None:
+        if not path:
+            self.root = value
+            return
+        parent, token = self._parent(path)
+        if isinstance(parent, dict):
+            if token not in parent:
+                raise PatchError(f"Path {path!r} does not exist")
+            self._set(parent, token, value)
+        else:
+            parent[_index(parent, token, path, append=False)] = value
+
+    def apply(self, operation: Mapping[str, Any]) -> None:
+        op = operation.get("op")
+        path = operation.get("path")
+        if not isinstance(path, str) or (path and not path.startswith("/")):
+            raise PatchError(f"Invalid path in operation {operation!r}")
+        if op in ("add", "replace", "test") and "value" not in operation:
+            raise PatchError(f"Missing value in operation {operation!r}")
+        if op in ("move", "copy"):
+            source = operation.get("from")
+            if not isinstance(source, str):
+                raise PatchError(f"Invalid from in operation {operation!r}")
+
+        if op == "add":
+            self.add(path, copy.deepcopy(operation["value"]))
+        elif op == "remove":
+            self.remove(path)
+        elif op == "replace":
+            self.replace(path, copy.deepcopy(operation["value"]))
+        elif op == "move":
+            if path.startswith(source + "/"):
+                raise PatchError(f"Cannot move {source!r} into its own child")
+            self.add(path, _raw(self.remove(source)))
+        elif op == "copy":
+            self.add(path, _raw(self.get(source)))
+        elif op == "test":
+            if _raw(self.get(path)) != operation["value"]:
+                raise PatchError(f"Test failed for path {path!r}")
+        else:
+            raise PatchError(f"Unknown operation {op!r}")
+
+
+def apply_patch(document: ModelT, patch: Iterable[Mapping[str, Any]]) -> ModelT:
+    """Apply a JSON Patch to a model, re-validating only the patched subtrees.
+
+    Operations are applied in order to a copy; the original model is never
+    modified. Raises PatchError if an operation cannot be applied and
+    ``pydantic.ValidationError`` if the patched document is invalid.
+
+    Sections of a lazily loaded document stay lazy: entries the patch does
+    not touch are not validated.
+    """
+    patcher = _Patcher(document)
+    for operation in patch:
+        patcher.apply(operation)
+    patcher.validate_deferred()
+    return type(document).model_validate(patcher.root)
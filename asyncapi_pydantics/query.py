@@ -0,0 +1,246 @@
+"""Indexed queries over the channels, operations and messages of a document.
+
+DocumentIndex finds channels, operations and messages by tag name, server
+protocol, operation action, message content type, binding type or
+specification extension key. Each index is built the first time a query
+uses it, by one pass over the document, and answers later queries with a
+dict lookup; criteria are combined by intersecting the matching sets.
+
+Relations between objects come from the document's cross-reference graph:
+a channel matches ``action="send"`` if a send operation uses it, and a
+message matches ``protocol="mqtt"`` if it is carried on a channel available
+on an MQTT server.
+"""
+
+from typing import Any, Callable, Dict, FrozenSet, Iterable, List, Optional, Set
+
+from .channel import Channel, Message
+from .graph import CHANNEL_MESSAGE, OPERATION_MESSAGE, DocumentGraph
+from .operation import Operation
+from .resolver import escape_token
+
+KINDS = ("channels", "operations", "messages")
+CRITERIA = ("tag", "protocol", "action", "content_type", "binding", "extension")
+
+Index = Dict[Any, FrozenSet[str]]
+
+
+def _index(pairs: Iterable[Any]) -> Index:
+    """Build an index from ``(value, ids)`` pairs."""
+    index: Dict[Any, Set[str]] = {}
+    for value, ids in pairs:
+        index.setdefault(value, set()).update(ids)
+    return {value: frozenset(ids) for value, ids in index.items()}
+
+
+class DocumentIndex:
+    """Lazily built indexes for filtering a document's objects.
+
+    Objects are identified by their pointer, as in DocumentGraph. The indexes
+    are a snapshot of the document: changes to it, including replacing or
+    adding entries, are only seen after ``invalidate()``.
+    """
+
+    def __init__(self, document: Any, graph: Optional[DocumentGraph] = None) -> None:
+        self.document = document
+        self.graph = graph if graph is not None else DocumentGraph(document)
+        self._objects: Dict[str, Dict[str, Any]] = {}
+        self._positions: Dict[str, Dict[str, int]] = {}
+        self._indexes: Dict[str, Index] = {}
+
+    def invalidate(self) -> None:
+        """Drop every index and rebuild the graph, after changing the document."""
+        self.graph = DocumentGraph(self.document)
+        self._objects.clear()
+        self._positions.clear()
+        self._indexes.clear()
+
+    def objects(self, kind: str) -> Dict[str, Any]:
+        """Return every object of a kind by id, in document order."""
+        objects = self._objects.get(kind)
+        if objects is None:
+            if kind == "messages":
+                objects = {
+                    message_id: (
+                        definition
+                        if isinstance(definition, Message)
+                        else Message.model_validate(definition)
+                    )
+                    for message_id, definition in self.graph.messages.items()
+                    if definition is not None
+                }
+            elif kind in ("channels", "operations"):
+                section = getattr(self.document, kind) or {}
+                objects = {
+                    f"#/{kind}/{escape_token(name)}": value
+                    for name, value in section.items()
+                }
+            else:
+                raise ValueError(f"Unknown kind {kind!r}; expected one of {KINDS}")
+            self._objects[kind] = objects
+            self._positions[kind] = {
+                object_id: i for i, object_id in enumerate(objects)
+            }
+        return objects
+
+    def index(self, criterion: str, kind: str) -> Index:
+        """Return the index of one criterion for one kind, building it if needed."""
+        key = f"{criterion}:{kind}"
+        index = self._indexes.get(key)
+        if index is None:
+            if criterion not in CRITERIA:
+                raise ValueError(
+                    f"Unknown criterion {criterion!r}; expected one of {CRITERIA}"
+                )
+            index = self._indexes[key] = getattr(self, f"_by_{criterion}")(kind)
+        return index
+
+    def _own(self, kind: str, values: Callable[[Any], Iterable[Any]]) -> Index:
+        return _index(
+            (value, (object_id,))
+            for object_id, obj in self.objects(kind).items()
+            for value in values(obj)
+        )
+
+    def _related(self, index: Index, source: str, kind: str) -> Index:
+        """Carry an index of ``source`` objects over to related ``kind`` objects."""
+        if source == kind:
+            return index
+        graph = self.graph
+        related: Callable[[str], Iterable[str]]
+        if source == "operations" and kind == "channels":
+            related = lambda node: filter(None, (graph.channel_of(node),))
+        elif source == "channels" and kind == "operations":
+            related = graph.operations_on_channel
+        elif source == "messages":
+            edge = CHANNEL_MESSAGE if kind == "channels" else OPERATION_MESSAGE
+            related = lambda node: graph.sources(edge, node)
+        else:
+            related = graph.messages_of
+        return _index(
+            (value, [target for node in ids for target in related(node)])
+            for value, ids in index.items()
+        )
+
+    def _by_tag(self, kind: str) -> Index:
+        return self._own(kind, lambda obj: [tag.name for tag in obj.tags or ()])
+
+    def _by_binding(self, kind: str) -> Index:
+        return self._own(kind, lambda obj: list(obj.bindings or ()))
+
+    def _by_extension(self, kind: str) -> Index:
+        return self._own(
+            kind,
+            lambda obj: [key for key in obj.model_extra or () if key.startswith("x-")],
+        )
+
+    def _by_action(self, kind: str) -> Index:
+        if kind == "operations":
+            return self._own(kind, lambda operation: [operation.action])
+        return self._related(self.index("action", "operations"), "operations", kind)
+
+    def _by_content_type(self, kind: str) -> Index:
+        if kind == "messages":
+            default = self.document.default_content_type
+            return self._own(
+                kind, lambda message: filter(None, [message.content_type or default])
+            )
+        return self._related(self.index("content_type", "messages"), "messages", kind)
+
+    def _by_protocol(self, kind: str) -> Index:
+        if kind == "channels":
+            return _index(
+                (
+                    server.protocol,
+                    self.graph.channels_on_server("#/servers/" + escape_token(name)),
+                )
+                for name, server in (self.document.servers or {}).items()
+            )
+        return self._related(self.index("protocol", "channels"), "channels", kind)
+
+    def find(self, kind: str, **criteria: Any) -> Dict[str, Any]:
+        """Return the objects of a kind matching every given criterion.
+
+        Criteria left as None are ignored; with none given, every object of
+        the kind is returned. Results are keyed by id in document order.
+        """
+        objects = self.objects(kind)
+        matches: Optional[FrozenSet[str]] = None
+        for criterion, value in criteria.items():
+            if value is None:
+                continue
+            found = self.index(criterion, kind).get(value, frozenset())
+            matches = found if matches is None else matches & found
+            if not matches:
+                return {}
+        if matches is None:
+            return dict(objects)
+        position = self._positions[kind]
+        ordered: List[str] = sorted(
+            (object_id for object_id in matches if object_id in position),
+            key=position.__getitem__,
+        )
+        return {object_id: objects[object_id] for object_id in ordered}
+
+    def channels(
+        self,
+        *,
+        tag: Optional[str] = None,
+        protocol: Optional[str] = None,
+        action: Optional[str] = None,
+        content_type: Optional[str] = None,
+        binding: Optional[str] = None,
+        extension: Optional[str] = None,
+    ) -> Dict[str, Channel]:
+        """Return the channels matching every given criterion."""
+        return self.find(
+            "channels",
+            tag=tag,
+            protocol=protocol,
+            action=action,
+            content_type=content_type,
+            binding=binding,
+            extension=extension,
+        )
+
+    def operations(
+        self,
+        *,
+        tag: Optional[str] = None,
+        protocol: Optional[str] = None,
+        action: Optional[str] = None,
+        content_type: Optional[str] = None,
+        binding: Optional[str] = None,
+        extension: Optional[str] = None,
+    ) -> Dict[str, Operation]:
+        """Return the operations matching every given criterion."""
+        return self.find(
+            "operations",
+            tag=tag,
+            protocol=protocol,
+            action=action,
+            content_type=content_type,
+            binding=binding,
+            extension=extension,
+        )
+
+    def messages(
+        self,
+        *,
+        tag: Optional[str] = None,
+        protocol: Optional[str] = None,
+        action: Optional[str] = None,
+        content_type: Optional[str] = None,
+        binding: Optional[str] = None,
+        extension: Optional[str] = None,
+    ) -> Dict[str, Message]:
+        """Return the messages matching every given criterion."""
+        return self.find(
+            "messages",
+            tag=tag,
+            protocol=protocol,
+            action=action,
+            content_type=content_type,
+            binding=binding,
+            extension=extension,
+        )
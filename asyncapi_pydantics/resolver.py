@@ -0,0 +1,260 @@
+"""Reference resolution for AsyncAPI documents.
+
+This module contains the RefResolver used to follow local ``$ref`` pointers.
+"""
+
+from typing import Any, Callable, Dict, List, Optional, Tuple, Type, TypeVar
+from urllib.parse import unquote
+
+from pydantic import BaseModel
+
+from .channel import Channel, Message
+from .lazy import LazyModelDict
+from .operation import Operation
+from .schema import Schema
+
+ModelT = TypeVar("ModelT", bound=BaseModel)
+V = TypeVar("V")
+
+_MISSING = object()
+
+_FIELD_KEYS: Dict[type, List[Tuple[str, str]]] = {}
+
+
+class RefResolutionError(ValueError):
+    """Raised when a ``$ref`` pointer cannot be resolved."""
+
+
+class RefCycleError(RefResolutionError):
+    """Raised when a chain of ``$ref`` pointers refers back to itself."""
+
+    def __init__(self, chain: List[str]) -> None:
+        self.chain = chain
+        super().__init__("Reference cycle detected: " + " -> ".join(chain))
+
+
+def get_ref(node: Any) -> Optional[str]:
+    """Return the ``$ref`` target of a node, or None if it is not a reference.
+
+    References are kept either as raw dicts or, where a model allows extra
+    fields, as a model instance carrying ``$ref`` as an extension.
+    """
+    if isinstance(node, dict):
+        ref = node.get("$ref")
+    elif isinstance(node, BaseModel):
+        extra = node.__pydantic_extra__
+        ref = extra.get("$ref") if extra else None
+    else:
+        return None
+    return ref if isinstance(ref, str) else None
+
+
+def escape_token(token: str) -> str:
+    """Escape a single JSON pointer reference token."""
+    return token.replace("~", "~0").replace("/", "~1")
+
+
+def unescape_token(token: str) -> str:
+    """Unescape a single JSON pointer reference token."""
+    return token.replace("~1", "/").replace("~0", "~")
+
+
+def normalize_pointer(ref: str) -> str:
+    """Normalize a local ``$ref`` (``#/a/b``) to a plain JSON pointer (``/a/b``)."""
+    if not ref.startswith("#"):
+        raise RefResolutionError(f"Only local references are supported: {ref!r}")
+    pointer = unquote(ref[1:])
+    if pointer and not pointer.startswith("/"):
+        raise RefResolutionError(f"Invalid JSON pointer in reference: {ref!r}")
+    return pointer
+
+
+def split_pointer(pointer: str) -> List[str]:
+    """Split a plain JSON pointer into unescaped reference tokens."""
+    if not pointer:
+        return []
+    return [unescape_token(token) for token in pointer[1:].split("/")]
+
+
+def _field_keys(model_cls: type) -> List[Tuple[str, str]]:
+    """Return ``(attribute, key)`` pairs for a model class, keyed by alias."""
+    keys = _FIELD_KEYS.get(model_cls)
+    if keys is None:
+        keys = [
+            (name, field.alias or name)
+            for name, field in model_cls.model_fields.items()  # type: ignore[attr-defined]
+        ]
+        _FIELD_KEYS[model_cls] = keys
+    return keys
+
+
+def iter_children(node: Any) -> List[Tuple[str, Any]]:
+    """Return the ``(key, value)`` children of a node as they appear in the spec."""
+    if isinstance(node, BaseModel):
+        children = [
+            (key, getattr(node, name))
+            for name, key in _field_keys(type(node))
+            if getattr(node, name) is not None
+        ]
+        if node.__pydantic_extra__:
+            children.extend(node.__pydantic_extra__.items())
+        return children
+    if isinstance(node, dict):
+        return [(str(key), value) for key, value in node.items()]
+    if isinstance(node, list):
+        return [(str(index), value) for index, value in enumerate(node)]
+    return []
+
+
+def child(node: Any, token: str) -> Any:
+    """Step from a node to one of its children, returning ``_MISSING`` if absent."""
+    if isinstance(node, BaseModel):
+        for name, key in _field_keys(type(node)):
+            if key == token:
+                value = getattr(node, name)
+                return _MISSING if value is None else value
+        extra = node.__pydantic_extra__
+        return extra.get(token, _MISSING) if extra else _MISSING
+    if isinstance(node, dict):
+        return node.get(token, _MISSING)
+    if isinstance(node, list):
+        try:
+            return node[int(token)]
+        except (ValueError, IndexError):
+            return _MISSING
+    return _MISSING
+
+
+class RefResolver:
+    """Resolves local ``$ref`` pointers against a document.
+
+    The resolver builds a JSON pointer index of every object in the document
+    the first time it is used, so each lookup is a single dict access.
+    Resolved (and, where requested, validated) targets are memoized.
+    """
+
+    def __init__(self, document: Any) -> None:
+        self.document = document
+        self._index: Optional[Dict[str, Any]] = None
+        self._cache: Dict[Tuple[str, Optional[type]], Any] = {}
+        self._derived: Dict[str, Any] = {}
+
+    @property
+    def index(self) -> Dict[str, Any]:
+        """Mapping of JSON pointer to every container node in the document."""
+        if self._index is None:
+            self._index = self._build_index()
+        return self._index
+
+    def _build_index(self) -> Dict[str, Any]:
+        index: Dict[str, Any] = {}
+        stack: List[Tuple[str, Any]] = [("", self.document)]
+        while stack:
+            pointer, node = stack.pop()
+            index[pointer] = node
+            if isinstance(node, LazyModelDict):
+                # Entries are validated when a reference actually reaches them.
+                continue
+            for key, value in iter_children(node):
+                if isinstance(value, (BaseModel, dict, list)):
+                    stack.append((pointer + "/" + escape_token(key), value))
+        return index
+
+    def clear(self) -> None:
+        """Drop the index and memoized results, e.g. after mutating the document."""
+        self._index = None
+        self._cache.clear()
+        self._derived.clear()
+
+    def derived(self, name: str, factory: Callable[[], V]) -> V:
+        """Return the value ``name`` derived from this document, creating it once.
+
+        Compiled validators and generated models refer back to the resolver,
+        so they are kept here rather than in module-level caches, which would
+        keep the document alive.
+        """
+        value = self._derived.get(name, _MISSING)
+        if value is _MISSING:
+            value = self._derived[name] = factory()
+        return value  # type: ignore[no-any-return]
+
+    def lookup(self, ref: str) -> Any:
+        """Return the node a single reference points to, without following chains."""
+        pointer = normalize_pointer(ref)
+        index = self.index
+        node = index.get(pointer, _MISSING)
+        if node is _MISSING:
+            # Scalars and the contents of lazy sections are not indexed, so
+            # step down from the nearest indexed ancestor.
+            base = pointer
+            remaining: List[str] = []
+            while node is _MISSING and base:
+                base, _, token = base.rpartition("/")
+                remaining.append(unescape_token(token))
+                node = index.get(base, _MISSING)
+            for token in reversed(remaining):
+                if node is _MISSING:
+                    break
+                node = child(node, token)
+        if node is _MISSING:
+            raise RefResolutionError(f"Unresolvable reference: {ref!r}")
+        return node
+
+    def resolve(self, ref: str, model: Optional[Type[ModelT]] = None) -> Any:
+        """Resolve a reference, following chained references.
+
+        If ``model`` is given the target is returned as an instance of that
+        model, validating raw data (such as ``Components`` entries) on first use.
+        """
+        key = (ref, model)
+        cached = self._cache.get(key, _MISSING)
+        if cached is not _MISSING:
+            return cached
+
+        chain = [ref]
+        node = self.lookup(ref)
+        target = get_ref(node)
+        while target is not None:
+            if target in chain:
+                raise RefCycleError(chain + [target])
+            chain.append(target)
+            node = self.lookup(target)
+            target = get_ref(node)
+
+        if model is not None:
+            node = self._coerce(node, model)
+        self._cache[key] = node
+        return node
+
+    def deref(self, node: Any, model: Optional[Type[ModelT]] = None) -> Any:
+        """Return a node itself, or its target if the node is a reference."""
+        ref = get_ref(node)
+        if ref is not None:
+            return self.resolve(ref, model)
+        if model is not None:
+            return self._coerce(node, model)
+        return node
+
+    @staticmethod
+    def _coerce(node: Any, model: Type[ModelT]) -> ModelT:
+        if isinstance(node, model):
+            return node
+        if isinstance(node, BaseModel):
+            node = node.model_dump(by_alias=True, exclude_unset=True)
+        return model.model_validate(node)
+
+    def resolve_message(self, ref: str) -> Message:
+        """Resolve a reference to a Message Object."""
+        return self.resolve(ref, Message)  # type: ignore[no-any-return]
+
+    def resolve_channel(self, ref: str) -> Channel:
+        """Resolve a reference to a Channel Object."""
+        return self.resolve(ref, Channel)  # type: ignore[no-any-return]
+
+    def resolve_operation(self, ref: str) -> Operation:
+        """Resolve a reference to an Operation Object."""
+        return self.resolve(ref, Operation)  # type: ignore[no-any-return]
+
+    def resolve_schema(self, ref: str) -> Schema:
+        """Resolve a reference to a Schema Object."""
+        return self.resolve(ref, Schema)  # type: ignore[no-any-return]
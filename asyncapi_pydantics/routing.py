@@ -0,0 +1,401 @@
+"""Channel address routing and formatting.
+
+This module contains the ChannelRouter, which maps concrete addresses (such
+as MQTT topics) back to the Channel Object whose address template matches,
+the AddressFormatter, which builds concrete addresses for publishing, and
+ChannelParameters, the compiled constraints of a channel's parameters.
+"""
+
+import re
+from typing import (
+    Any,
+    Dict,
+    FrozenSet,
+    Iterable,
+    List,
+    Mapping,
+    NamedTuple,
+    Optional,
+    Tuple,
+    Union,
+)
+
+from ._memo import IdentityCache
+from .channel import Channel, Parameter
+from .resolver import RefResolutionError, RefResolver, get_ref
+
+_PARAMETER = re.compile(r"\{([^{}]+)\}")
+
+
+class RouteMatch(NamedTuple):
+    """The channel matched by an address, with its parameter values."""
+
+    channel_id: str
+    channel: Channel
+    params: Dict[str, str]
+
+
+class _Route(NamedTuple):
+    channel_id: str
+    channel: Channel
+    parameters: Optional["ChannelParameters"]
+    # (segment index, parameter name) for segments that are a single parameter.
+    params: Tuple[Tuple[int, str], ...]
+    # (segment index, compiled pattern, parameter names) for mixed segments.
+    patterns: Tuple[Tuple[int, "re.Pattern[str]", Tuple[str, ...]], ...]
+
+
+class _TrieNode:
+    __slots__ = ("literals", "patterns", "wildcard", "route")
+
+    def __init__(self) -> None:
+        self.literals: Dict[str, _TrieNode] = {}
+        self.patterns: Dict[str, Tuple["re.Pattern[str]", _TrieNode]] = {}
+        self.wildcard: Optional[_TrieNode] = None
+        self.route: Optional[_Route] = None
+
+
+Segment = Union[str, Tuple[str], Tuple["re.Pattern[str]", Tuple[str, ...]]]
+
+
+def parse_address(address: str, separator: str = "/") -> List[Segment]:
+    """Split an address template into segments.
+
+    Each segment is a literal string, a 1-tuple ``(name,)`` for a segment that
+    is exactly one parameter, or a ``(pattern, names)`` pair for a segment that
+    mixes literal text and parameters.
+    """
+    segments: List[Segment] = []
+    for part in address.split(separator):
+        names = _PARAMETER.findall(part)
+        if not names:
+            segments.append(part)
+        elif _PARAMETER.fullmatch(part):
+            segments.append((names[0],))
+        else:
+            regex = ""
+            position = 0
+            for index, match in enumerate(_PARAMETER.finditer(part)):
+                regex += re.escape(part[position : match.start()])
+                regex += f"(?P<p{index}>.+?)"
+                position = match.end()
+            regex += re.escape(part[position:])
+            segments.append((re.compile(regex), tuple(names)))
+    return segments
+
+
+class ParameterError(ValueError):
+    """Raised when channel parameter values are missing or not allowed."""
+
+
+def _cache(
+    cache: IdentityCache[Any], name: str, resolver: Optional[RefResolver]
+) -> IdentityCache[Any]:
+    """Return ``cache``, or the resolver's own cache ``name`` if given one.
+
+    What is compiled for a channel depends on the resolver used to follow
+    its ``$ref`` parameters.
+    """
+    return cache if resolver is None else resolver.derived(name, IdentityCache)
+
+
+_channel_parameters: IdentityCache["ChannelParameters"] = IdentityCache()
+
+
+class ChannelParameters:
+    """The compiled constraints of a channel's Parameter Objects.
+
+    ``enum`` lists become frozensets for constant-time membership checks and
+    ``default`` values are collected for filling in missing parameters.
+    """
+
+    __slots__ = ("defaults", "enums", "_enum_items")
+
+    def __init__(
+        self, channel: Channel, resolver: Optional[RefResolver] = None
+    ) -> None:
+        self.defaults: Dict[str, str] = {}
+        self.enums: Dict[str, FrozenSet[str]] = {}
+        for name, parameter in (channel.parameters or {}).items():
+            ref = get_ref(parameter)
+            if ref is not None:
+                if resolver is None:
+                    raise RefResolutionError(
+                        f"Cannot resolve parameter {name!r} ({ref!r}) "
+                        "without a resolver"
+                    )
+                parameter = resolver.resolve(ref, Parameter)
+            if parameter.default is not None:
+                self.defaults[name] = parameter.default
+            if parameter.enum is not None:
+                self.enums[name] = frozenset(parameter.enum)
+        self._enum_items = tuple(self.enums.items())
+
+    @classmethod
+    def for_channel(
+        cls, channel: Channel, resolver: Optional[RefResolver] = None
+    ) -> "ChannelParameters":
+        """Return the compiled parameters of a channel, cached per resolver.
+
+        Raises RefResolutionError if a parameter is a ``$ref`` and no
+        resolver is given.
+        """
+        cache = _cache(_channel_parameters, "channel_parameters", resolver)
+        compiled = cache.get(channel)
+        if compiled is None:
+            compiled = cache[channel] = cls(channel, resolver)
+        return compiled
+
+    @property
+    def constrained(self) -> bool:
+        """Whether any parameter restricts its values."""
+        return bool(self._enum_items)
+
+    def is_valid(self, values: Mapping[str, str]) -> bool:
+        """Return whether every given value is allowed by its parameter's enum."""
+        for name, allowed in self._enum_items:
+            value = values.get(name)
+            if value is not None and value not in allowed:
+                return False
+        return True
+
+    def error(self, values: Mapping[str, str]) -> Optional[ParameterError]:
+        """Return the error for the first disallowed value, or None."""
+        for name, allowed in self._enum_items:
+            value = values.get(name)
+            if value is not None and value not in allowed:
+                return ParameterError(
+                    f"Value {value!r} for parameter {name!r} is not one of "
+                    f"{sorted(allowed)!r}"
+                )
+        return None
+
+    def validate_many(self, values_list: Iterable[Mapping[str, str]]) -> List[bool]:
+        """Check many sets of parameter values, returning one flag per set."""
+        if not self._enum_items:
+            return [True for _ in values_list]
+        is_valid = self.is_valid
+        return [is_valid(values) for values in values_list]
+
+    def fill(self, values: Mapping[str, Any], names: Iterable[str]) -> Dict[str, str]:
+        """Return values for ``names``, using defaults and checking enums."""
+        filled: Dict[str, str] = {}
+        for name in names:
+            value = values.get(name)
+            if value is None:
+                value = self.defaults.get(name)
+                if value is None:
+                    raise ParameterError(f"Missing value for parameter {name!r}")
+            filled[name] = str(value)
+        error = self.error(filled)
+        if error is not None:
+            raise error
+        return filled
+
+
+class ChannelRouter:
+    """Routes concrete addresses to channels through a segment trie.
+
+    Address templates are compiled into a trie keyed by segment, so matching
+    an address costs time proportional to its depth rather than to the
+    number of channels. Literal segments take precedence over segments with
+    parameters; among identical templates the first channel added wins.
+
+    With ``check_parameters`` enabled, addresses whose parameter values are
+    not allowed by the channel's Parameter Objects do not match.
+    """
+
+    def __init__(
+        self,
+        channels: Optional[Mapping[str, Channel]] = None,
+        separator: str = "/",
+        check_parameters: bool = False,
+        resolver: Optional[RefResolver] = None,
+    ) -> None:
+        self.separator = separator
+        self.check_parameters = check_parameters
+        self.resolver = resolver
+        self._root = _TrieNode()
+        self._size = 0
+        for channel_id, channel in (channels or {}).items():
+            self.add(channel_id, channel)
+
+    @classmethod
+    def from_document(
+        cls, document: Any, separator: str = "/", check_parameters: bool = False
+    ) -> "ChannelRouter":
+        """Build a router for every channel with an address in a document."""
+        return cls(
+            document.channels or {},
+            separator=separator,
+            check_parameters=check_parameters,
+            resolver=document.resolver,
+        )
+
+    def __len__(self) -> int:
+        return self._size
+
+    def add(self, channel_id: str, channel: Channel) -> None:
+        """Add a channel; channels without an address are skipped."""
+        if channel.address is None:
+            return
+        node = self._root
+        params: List[Tuple[int, str]] = []
+        patterns: List[Tuple[int, "re.Pattern[str]", Tuple[str, ...]]] = []
+        for index, segment in enumerate(parse_address(channel.address, self.separator)):
+            if isinstance(segment, str):
+                node = node.literals.setdefault(segment, _TrieNode())
+            elif len(segment) == 1:
+                params.append((index, segment[0]))  # type: ignore[misc]
+                if node.wildcard is None:
+                    node.wildcard = _TrieNode()
+                node = node.wildcard
+            else:
+                pattern, names = segment  # type: ignore[misc]
+                patterns.append((index, pattern, names))
+                entry = node.patterns.get(pattern.pattern)
+                if entry is None:
+                    entry = node.patterns[pattern.pattern] = (pattern, _TrieNode())
+                node = entry[1]
+        if node.route is None:
+            parameters = None
+            if self.check_parameters:
+                parameters = ChannelParameters(channel, self.resolver)
+                if not parameters.constrained:
+                    parameters = None
+            node.route = _Route(
+                channel_id, channel, parameters, tuple(params), tuple(patterns)
+            )
+            self._size += 1
+
+    @staticmethod
+    def _params(route: _Route, segments: List[str]) -> Dict[str, str]:
+        params = {name: segments[index] for index, name in route.params}
+        for index, pattern, names in route.patterns:
+            groups = pattern.fullmatch(segments[index]).groups()  # type: ignore[union-attr]
+            params.update(zip(names, groups))
+        return params
+
+    def _find(
+        self, node: _TrieNode, segments: List[str], index: int
+    ) -> Optional[RouteMatch]:
+        if index == len(segments):
+            route = node.route
+            if route is None:
+                return None
+            params = self._params(route, segments)
+            if route.parameters is not None and not route.parameters.is_valid(params):
+                return None
+            return RouteMatch(route.channel_id, route.channel, params)
+        segment = segments[index]
+        child = node.literals.get(segment)
+        if child is not None:
+            found = self._find(child, segments, index + 1)
+            if found is not None:
+                return found
+        for pattern, child in node.patterns.values():
+            if pattern.fullmatch(segment):
+                found = self._find(child, segments, index + 1)
+                if found is not None:
+                    return found
+        if node.wildcard is not None and segment:
+            return self._find(node.wildcard, segments, index + 1)
+        return None
+
+    def match(self, address: str) -> Optional[RouteMatch]:
+        """Return the channel matching a concrete address, or None."""
+        return self._find(self._root, address.split(self.separator), 0)
+
+    def match_many(self, addresses: Iterable[str]) -> List[Optional[RouteMatch]]:
+        """Match many addresses, returning None for those that do not match."""
+        find = self._find
+        root = self._root
+        separator = self.separator
+        return [find(root, address.split(separator), 0) for address in addresses]
+
+
+_formatters: IdentityCache["AddressFormatter"] = IdentityCache()
+
+
+class AddressFormatter:
+    """Builds concrete addresses for a channel from parameter values.
+
+    The address template is split once into literal parts and parameter
+    slots. Values are checked against the ``enum`` of the channel's Parameter
+    Objects, and a parameter's ``default`` is used when no value is given.
+    """
+
+    __slots__ = ("channel_id", "parameters", "_parts", "_slots")
+
+    def __init__(
+        self,
+        channel: Channel,
+        channel_id: Optional[str] = None,
+        resolver: Optional[RefResolver] = None,
+    ) -> None:
+        if channel.address is None:
+            raise ValueError(f"Channel {channel_id or ''!r} has no address")
+        self.channel_id = channel_id
+        self.parameters = ChannelParameters(channel, resolver)
+        self._parts: List[str] = []
+        self._slots: List[Tuple[int, str]] = []
+        position = 0
+        for match in _PARAMETER.finditer(channel.address):
+            self._parts.append(channel.address[position : match.start()])
+            self._slots.append((len(self._parts), match.group(1)))
+            self._parts.append("")
+            position = match.end()
+        self._parts.append(channel.address[position:])
+
+    @classmethod
+    def for_channel(
+        cls, channel: Channel, resolver: Optional[RefResolver] = None
+    ) -> "AddressFormatter":
+        """Return the formatter for a channel, compiled once per resolver.
+
+        Raises RefResolutionError if a parameter is a ``$ref`` and no
+        resolver is given.
+        """
+        formatters = _cache(_formatters, "address_formatters", resolver)
+        formatter = formatters.get(channel)
+        if formatter is None:
+            formatter = formatters[channel] = cls(channel, resolver=resolver)
+        return formatter
+
+    @property
+    def parameter_names(self) -> Tuple[str, ...]:
+        """The parameter names in the order they appear in the address."""
+        return tuple(name for _, name in self._slots)
+
+    def format(self, params: Optional[Mapping[str, Any]] = None, **kwargs: Any) -> str:
+        """Build the address from parameter values given as a mapping or kwargs."""
+        if kwargs:
+            params = {**params, **kwargs} if params else kwargs
+        elif params is None:
+            params = {}
+        if not self._slots:
+            return self._parts[0]
+        parts = self._parts[:]
+        defaults = self.parameters.defaults
+        enums = self.parameters.enums
+        for index, name in self._slots:
+            value = params.get(name)
+            if value is None:
+                value = defaults.get(name)
+                if value is None:
+                    raise ParameterError(f"Missing value for parameter {name!r}")
+            elif not isinstance(value, str):
+                value = str(value)
+            allowed = enums.get(name)
+            if allowed is not None and value not in allowed:
+                raise ParameterError(
+                    f"Value {value!r} for parameter {name!r} is not one of "
+                    f"{sorted(allowed)!r}"
+                )
+            parts[index] = value
+        return "".join(parts)
+
+    def format_many(self, params_list: Iterable[Mapping[str, Any]]) -> List[str]:
+        """Build one address per mapping of parameter values."""
+        format = self.format
+        return [format(params) for params in params_list]
@@ -28,6 +28,7 @@ class MultiFormatSchema(BaseModel):
 
         populate_by_name = True
         extra = "allow"
+        defer_build = True
 
 
 class Schema(BaseModel):
@@ -159,7 +160,4 @@ class Schema(BaseModel):
 
         populate_by_name = True
         extra = "allow"
-
-
-# Update forward references
-Schema.model_rebuild()
+        defer_build = True
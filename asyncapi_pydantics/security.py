@@ -40,6 +40,7 @@ class OAuthFlow(BaseModel):
 
         populate_by_name = True
         extra = "allow"
+        defer_build = True
 
 
 class OAuthFlows(BaseModel):
@@ -74,6 +75,7 @@ class OAuthFlows(BaseModel):
 
         populate_by_name = True
         extra = "allow"
+        defer_build = True
 
 
 class SecurityScheme(BaseModel):
@@ -142,3 +144,4 @@ class SecurityScheme(BaseModel):
 
         populate_by_name = True
         extra = "allow"
+        defer_build = True
@@ -0,0 +1,215 @@
+"""Fast JSON and YAML output of AsyncAPI documents.
+
+``dump_json`` serializes a document straight to bytes with pydantic-core,
+without building an intermediate dict. ``iter_json`` and ``write_spec``
+stream a document instead: the entries of ``servers``, ``channels``,
+``operations`` and each ``components`` section are serialized one at a
+time, so memory use beyond the model tree stays at the size of one entry.
+
+Output uses the specification's field names and, by default, leaves out
+fields that are None; specification extensions and other extra fields are
+kept. Values inside raw data (such as schemas) are written as they are.
+"""
+
+import io
+import json
+import os
+from typing import IO, Any, Dict, Iterator, Optional, Tuple
+
+from pydantic import BaseModel
+from pydantic_core import to_json, to_jsonable_python
+
+from .lazy import LazyModelDict
+from .resolver import _field_keys
+from .streaming import Source, _detect_format
+
+# Top-level sections whose entries are serialized one at a time; the
+# sections of ``components`` are streamed the same way.
+STREAMED = ("servers", "channels", "operations")
+
+# Keeps long strings on one line.
+_YAML_WIDTH = 2**31 - 1
+
+
+def _fields(model: BaseModel, exclude_none: bool) -> Iterator[Tuple[str, Any]]:
+    """Yield a model's fields by alias, followed by its extra fields."""
+    for name, key in _field_keys(type(model)):
+        value = getattr(model, name)
+        if value is None and exclude_none:
+            continue
+        yield key, value
+    if model.__pydantic_extra__:
+        for key, value in model.__pydantic_extra__.items():
+            if value is None and exclude_none:
+                continue
+            yield key, value
+
+
+def _entries(mapping: Dict[str, Any]) -> Iterator[Tuple[str, Any]]:
+    """Yield the entries of a section without keeping deferred ones validated."""
+    if isinstance(mapping, LazyModelDict):
+        for key, value in dict.items(mapping):
+            if not isinstance(value, mapping.model):
+                value = mapping.model.model_validate(value, context=mapping.context)
+            yield key, value
+    else:
+        yield from mapping.items()
+
+
+def _sections(
+    document: BaseModel, exclude_none: bool
+) -> Iterator[Tuple[str, Any, Optional[Iterator[Any]]]]:
+    """Yield a document's top-level fields with the entries of streamed ones.
+
+    Each item is ``(key, value, entries)``; ``entries`` is None for fields
+    serialized in one piece. ``components`` yields its sections as entries,
+    which are in turn ``(key, value, entries)`` items.
+    """
+    for key, value in _fields(document, exclude_none):
+        if key in STREAMED and isinstance(value, dict) and value:
+            yield key, value, _entries(value)
+        elif key == "components" and isinstance(value, BaseModel):
+            yield key, value, _components(value, exclude_none)
+        else:
+            yield key, value, None
+
+
+def _components(components: BaseModel, exclude_none: bool) -> Iterator[Any]:
+    for key, value in _fields(components, exclude_none):
+        if isinstance(value, dict) and value:
+            yield key, value, _entries(value)
+        else:
+            yield key, value, None
+
+
+def dump_json(
+    document: BaseModel, *, indent: Optional[int] = None, exclude_none: bool = True
+) -> bytes:
+    """Serialize a document to JSON bytes in one call to pydantic-core."""
+    return document.__pydantic_serializer__.to_json(
+        document, indent=indent, by_alias=True, exclude_none=exclude_none
+    )
+
+
+def iter_json(
+    document: BaseModel, *, indent: Optional[int] = None, exclude_none: bool = True
+) -> Iterator[bytes]:
+    """Serialize a document to JSON, yielding it in chunks of about one entry.
+
+    The concatenated chunks are identical to ``dump_json`` output.
+    """
+    separator = b":" if indent is None else b": "
+
+    def newline(depth: int) -> bytes:
+        return b"" if indent is None else b"\n" + b" " * (indent * depth)
+
+    def value_json(value: Any, depth: int) -> bytes:
+        data = to_json(value, indent=indent, by_alias=True, exclude_none=exclude_none)
+        if indent is not None and depth:
+            # JSON strings cannot contain raw newlines, so this only
+            # re-indents structure.
+            data = data.replace(b"\n", newline(depth))
+        return data
+
+    def mapping(items: Iterator[Any], depth: int) -> Iterator[bytes]:
+        opened = False
+        for key, value, *entries in items:
+            head = b"{" if not opened else b","
+            opened = True
+            prefix = head + newline(depth + 1) + json.dumps(key).encode() + separator
+            if entries and entries[0] is not None:
+                yield prefix
+                yield from mapping(entries[0], depth + 1)
+            else:
+                yield prefix + value_json(value, depth + 1)
+        yield (newline(depth) + b"}") if opened else b"{}"
+
+    yield from mapping(_sections(document, exclude_none), 0)
+
+
+def _yaml_dumper() -> Any:
+    try:
+        import yaml
+    except ImportError as exc:  # pragma: no cover - depends on environment
+        raise ImportError(
+            "PyYAML is required to write YAML documents; "
+            "install asyncapi-pydantics[yaml]"
+        ) from exc
+    return yaml, getattr(yaml, "CSafeDumper", yaml.SafeDumper)
+
+
+def iter_yaml(document: BaseModel, *, exclude_none: bool = True) -> Iterator[str]:
+    """Serialize a document to block-style YAML, yielding about one entry at a time."""
+    yaml, dumper = _yaml_dumper()
+
+    def dump(key: str, value: Any, depth: int) -> str:
+        data = to_jsonable_python(value, by_alias=True, exclude_none=exclude_none)
+        text: str = yaml.dump(
+            {key: data},
+            Dumper=dumper,
+            sort_keys=False,
+            default_flow_style=False,
+            allow_unicode=True,
+            width=_YAML_WIDTH,
+        )
+        if depth:
+            pad = "  " * depth
+            text = "".join(pad + line for line in text.splitlines(keepends=True))
+        return text
+
+    def header(key: str, depth: int) -> str:
+        # "key: {}" with the empty mapping dropped, so the key is quoted the
+        # same way as in a full dump.
+        return dump(key, {}, depth).replace(" {}\n", "\n", 1)
+
+    def mapping(items: Iterator[Any], depth: int) -> Iterator[str]:
+        for key, value, *entries in items:
+            if entries and entries[0] is not None:
+                nested = mapping(entries[0], depth + 1)
+                first = next(nested, None)
+                if first is not None:
+                    yield header(key, depth)
+                    yield first
+                    yield from nested
+                    continue
+            yield dump(key, value, depth)
+
+    yield from mapping(_sections(document, exclude_none), 0)
+
+
+def write_spec(
+    document: BaseModel,
+    target: Source,
+    *,
+    format: Optional[str] = None,
+    indent: Optional[int] = None,
+    exclude_none: bool = True,
+) -> None:
+    """Write a document to a JSON or YAML file, streaming it entry by entry.
+
+    ``target`` is a path or a binary or text file object. ``format`` is
+    ``"json"`` or ``"yaml"`` and is inferred from the file name when omitted;
+    ``indent`` applies to JSON only.
+    """
+    fmt = _detect_format(target, format)
+    if isinstance(target, (str, os.PathLike)):
+        with open(target, "wb") as fp:
+            _write(document, fp, fmt, indent, exclude_none)
+    else:
+        _write(document, target, fmt, indent, exclude_none)
+
+
+def _write(
+    document: BaseModel,
+    fp: IO[Any],
+    fmt: str,
+    indent: Optional[int],
+    exclude_none: bool,
+) -> None:
+    binary = not isinstance(fp, io.TextIOBase)
+    if fmt == "json":
+        for chunk in iter_json(document, indent=indent, exclude_none=exclude_none):
+            fp.write(chunk if binary else chunk.decode("utf-8"))
+    else:
+        for text in iter_yaml(document, exclude_none=exclude_none):
+            fp.write(text.encode("utf-8") if binary else text)
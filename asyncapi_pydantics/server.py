@@ -37,6 +37,7 @@ class ServerVariable(BaseModel):
         """Pydantic configuration."""
 
         extra = "allow"
+        defer_build = True
 
 
 class Server(BaseModel):
@@ -102,3 +103,4 @@ class Server(BaseModel):
 
         populate_by_name = True
         extra = "allow"
+        defer_build = True
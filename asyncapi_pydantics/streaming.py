@@ -0,0 +1,474 @@
+"""Streaming loader for large AsyncAPI documents.
+
+This module contains an incremental JSON and YAML reader that validates the
+entries of ``servers``, ``channels``, ``operations`` and ``components`` one at
+a time, without ever holding the whole raw document in memory. The YAML reader
+can also record the source location of every value (see ``locations``).
+"""
+
+import codecs
+import json
+import os
+from typing import (
+    IO,
+    Any,
+    Callable,
+    Dict,
+    Iterator,
+    List,
+    NamedTuple,
+    Optional,
+    Tuple,
+    Type,
+    Union,
+)
+
+from pydantic import BaseModel, ValidationError
+from pydantic_core import InitErrorDetails, PydanticCustomError
+
+from .asyncapi import AsyncAPI
+from .channel import Channel
+from .locations import SourceMap, annotate_error
+from .operation import Operation
+from .resolver import escape_token
+from .server import Server
+
+Source = Union[str, "os.PathLike[str]", IO[Any]]
+
+_SECTION_MODELS: Dict[str, Type[BaseModel]] = {
+    "servers": Server,
+    "channels": Channel,
+    "operations": Operation,
+}
+
+_WHITESPACE = " \t\n\r"
+
+
+class SpecEntry(NamedTuple):
+    """A single entry read from a streamed document.
+
+    ``section`` is the JSON pointer of the map holding the entry (for example
+    ``/channels`` or ``/components/schemas``), or ``""`` for top-level fields.
+    Empty maps are yielded as a raw ``{}`` value of their parent section.
+    """
+
+    section: str
+    key: str
+    value: Any
+
+
+class _JSONStream:
+    """Incremental reader over a JSON text, decoding one value at a time."""
+
+    def __init__(self, fp: IO[Any], chunk_size: int = 1 << 16) -> None:
+        self._fp = fp
+        self._chunk_size = chunk_size
+        self._decoder = json.JSONDecoder()
+        self._text_decoder = codecs.getincrementaldecoder("utf-8-sig")()
+        self._buf = ""
+        self._pos = 0
+        self._eof = False
+
+    def _fill(self) -> bool:
+        """Append the next chunk to the buffer, returning False at end of input."""
+        if self._eof:
+            return False
+        # Grow reads with the pending buffer so a single large value is read in
+        # a logarithmic number of attempts.
+        chunk = self._fp.read(max(self._chunk_size, len(self._buf) - self._pos))
+        if isinstance(chunk, bytes):
+            chunk = self._text_decoder.decode(chunk, final=not chunk)
+        if not chunk:
+            self._eof = True
+            return False
+        self._buf = self._buf[self._pos :] + chunk
+        self._pos = 0
+        return True
+
+    def peek(self) -> str:
+        """Return the next non-whitespace character, or ``""`` at end of input."""
+        while True:
+            buf, pos = self._buf, self._pos
+            while pos < len(buf) and buf[pos] in _WHITESPACE:
+                pos += 1
+            self._pos = pos
+            if pos < len(buf) or not self._fill():
+                return buf[pos] if pos < len(buf) else ""
+
+    def expect(self, char: str) -> None:
+        """Consume ``char`` as the next non-whitespace character."""
+        if self.peek() != char:
+            raise json.JSONDecodeError(f"Expecting {char!r}", self._buf, self._pos)
+        self._pos += 1
+
+    def value(self) -> Any:
+        """Decode the next complete JSON value."""
+        self.peek()
+        while True:
+            try:
+                value, end = self._decoder.raw_decode(self._buf, self._pos)
+            except json.JSONDecodeError:
+                if self._fill():
+                    continue
+                raise
+            if end == len(self._buf) and self._fill():
+                # A number at the end of the buffer may continue in the next chunk.
+                continue
+            self._pos = end
+            return value
+
+    def members(self) -> Iterator[str]:
+        """Iterate over the keys of the next object.
+
+        The caller must consume exactly one value after each key.
+        """
+        self.expect("{")
+        if self.peek() == "}":
+            self._pos += 1
+            return
+        while True:
+            key = self.value()
+            if not isinstance(key, str):
+                raise json.JSONDecodeError("Expecting property name", self._buf, 0)
+            self.expect(":")
+            yield key
+            if self.peek() == ",":
+                self._pos += 1
+                continue
+            self.expect("}")
+            return
+
+
+def _iter_json(
+    fp: IO[Any], build: Callable[[str, str, Any], Any]
+) -> Iterator[SpecEntry]:
+    stream = _JSONStream(fp)
+    for key in stream.members():
+        if key in _SECTION_MODELS and stream.peek() == "{":
+            section = "/" + key
+            empty = True
+            for name in stream.members():
+                empty = False
+                yield SpecEntry(section, name, build(key, name, stream.value()))
+            if empty:
+                yield SpecEntry("", key, {})
+        elif key == "components" and stream.peek() == "{":
+            empty = True
+            for kind in stream.members():
+                empty = False
+                if stream.peek() != "{":
+                    yield SpecEntry("/components", kind, stream.value())
+                    continue
+                section = "/components/" + kind
+                kind_empty = True
+                for name in stream.members():
+                    kind_empty = False
+                    yield SpecEntry(section, name, stream.value())
+                if kind_empty:
+                    yield SpecEntry("/components", kind, {})
+            if empty:
+                yield SpecEntry("", key, {})
+        else:
+            yield SpecEntry("", key, stream.value())
+
+
+def _yaml_loader(fp: IO[Any]) -> Any:
+    try:
+        import yaml
+    except ImportError as exc:  # pragma: no cover - depends on environment
+        raise ImportError(
+            "PyYAML is required to load YAML documents; "
+            "install asyncapi-pydantics[yaml]"
+        ) from exc
+    loader_cls = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+    return loader_cls(fp)
+
+
+def _compose_yaml(
+    loader: Any,
+    anchors: Dict[str, Any],
+    source_map: Optional[SourceMap] = None,
+    pointer: str = "#",
+) -> Any:
+    """Compose the next YAML node from the event stream.
+
+    With a source map, the positions of the node's descendants are recorded
+    under ``pointer``.
+    """
+    import yaml
+
+    event = loader.get_event()
+    if isinstance(event, yaml.AliasEvent):
+        if event.anchor not in anchors:
+            raise yaml.composer.ComposerError(
+                None, None, f"found undefined alias {event.anchor!r}", event.start_mark
+            )
+        return anchors[event.anchor]
+    if isinstance(event, yaml.ScalarEvent):
+        tag = event.tag
+        if tag is None or tag == "!":
+            tag = loader.resolve(yaml.ScalarNode, event.value, event.implicit)
+        node: Any = yaml.ScalarNode(
+            tag, event.value, event.start_mark, event.end_mark, style=event.style
+        )
+        if event.anchor is not None:
+            anchors[event.anchor] = node
+        return node
+    if isinstance(event, yaml.SequenceStartEvent):
+        tag = event.tag
+        if tag is None or tag == "!":
+            tag = loader.resolve(yaml.SequenceNode, None, event.implicit)
+        node = yaml.SequenceNode(
+            tag, [], event.start_mark, None, flow_style=event.flow_style
+        )
+        if event.anchor is not None:
+            anchors[event.anchor] = node
+        while not loader.check_event(yaml.SequenceEndEvent):
+            if source_map is None:
+                node.value.append(_compose_yaml(loader, anchors))
+                continue
+            child = f"{pointer}/{len(node.value)}"
+            mark = loader.peek_event().start_mark
+            source_map.add(child, mark.line, mark.column)
+            node.value.append(_compose_yaml(loader, anchors, source_map, child))
+        node.end_mark = loader.get_event().end_mark
+        return node
+    if isinstance(event, yaml.MappingStartEvent):
+        tag = event.tag
+        if tag is None or tag == "!":
+            tag = loader.resolve(yaml.MappingNode, None, event.implicit)
+        node = yaml.MappingNode(
+            tag, [], event.start_mark, None, flow_style=event.flow_style
+        )
+        if event.anchor is not None:
+            anchors[event.anchor] = node
+        while not loader.check_event(yaml.MappingEndEvent):
+            key_node = _compose_yaml(loader, anchors)
+            if source_map is None or not isinstance(key_node.value, str):
+                node.value.append((key_node, _compose_yaml(loader, anchors)))
+                continue
+            child = f"{pointer}/{escape_token(key_node.value)}"
+            mark = key_node.start_mark
+            source_map.add(child, mark.line, mark.column)
+            value_node = _compose_yaml(loader, anchors, source_map, child)
+            node.value.append((key_node, value_node))
+        node.end_mark = loader.get_event().end_mark
+        return node
+    raise yaml.composer.ComposerError(
+        None, None, f"unexpected event {event!r}", event.start_mark
+    )
+
+
+def _iter_yaml(
+    fp: IO[Any],
+    build: Callable[[str, str, Any], Any],
+    source_map: Optional[SourceMap] = None,
+) -> Iterator[SpecEntry]:
+    import yaml
+
+    loader = _yaml_loader(fp)
+    anchors: Dict[str, Any] = {}
+    pointers = ["#"]
+
+    def value() -> Any:
+        node = _compose_yaml(loader, anchors, source_map, pointers[-1])
+        return loader.construct_document(node)
+
+    def members() -> Iterator[str]:
+        loader.get_event()
+        while not loader.check_event(yaml.MappingEndEvent):
+            if source_map is None:
+                yield value()
+                continue
+            key_node = _compose_yaml(loader, anchors)
+            key = loader.construct_document(key_node)
+            pointer = f"{pointers[-1]}/{escape_token(str(key))}"
+            mark = key_node.start_mark
+            source_map.add(pointer, mark.line, mark.column)
+            pointers.append(pointer)
+            try:
+                yield key
+            finally:
+                pointers.pop()
+        loader.get_event()
+
+    def is_mapping() -> bool:
+        return bool(loader.check_event(yaml.MappingStartEvent))
+
+    try:
+        loader.get_event()  # StreamStart
+        if loader.check_event(yaml.StreamEndEvent):
+            raise ValueError("Empty YAML document")
+        loader.get_event()  # DocumentStart
+        if not is_mapping():
+            raise ValueError("An AsyncAPI document must be a mapping")
+        for key in members():
+            if key in _SECTION_MODELS and is_mapping():
+                section = "/" + key
+                empty = True
+                for name in members():
+                    empty = False
+                    yield SpecEntry(section, name, build(key, name, value()))
+                if empty:
+                    yield SpecEntry("", key, {})
+            elif key == "components" and is_mapping():
+                empty = True
+                for kind in members():
+                    empty = False
+                    if not is_mapping():
+                        yield SpecEntry("/components", kind, value())
+                        continue
+                    section = "/components/" + kind
+                    kind_empty = True
+                    for name in members():
+                        kind_empty = False
+                        yield SpecEntry(section, name, value())
+                    if kind_empty:
+                        yield SpecEntry("/components", kind, {})
+                if empty:
+                    yield SpecEntry("", key, {})
+            else:
+                yield SpecEntry("", key, value())
+    finally:
+        loader.dispose()
+
+
+# Returned by ``build`` in place of an entry that failed validation.
+_INVALID = object()
+
+
+def _line_errors(error: ValidationError, prefix: Tuple[str, ...] = ()) -> List[Any]:
+    """Return the errors of a validation error, located within the document."""
+    return [
+        InitErrorDetails(
+            type=PydanticCustomError(item["type"], item["msg"]),
+            loc=(*prefix, *item["loc"]),
+            input=item["input"],
+        )
+        for item in error.errors(include_url=False)
+    ]
+
+
+def _entry_error(errors: List[Any], source_map: Optional[SourceMap]) -> ValidationError:
+    """Combine the errors of a document's entries into one ValidationError."""
+    error = ValidationError.from_exception_data(AsyncAPI.__name__, errors)
+    if source_map is not None:
+        annotate_error(error, source_map)
+    return error
+
+
+def _source_name(source: Source) -> Optional[str]:
+    name = (
+        source
+        if isinstance(source, (str, os.PathLike))
+        else getattr(source, "name", None)
+    )
+    return os.fspath(name) if isinstance(name, (str, os.PathLike)) else None
+
+
+def _detect_format(source: Source, format: Optional[str]) -> str:
+    if format is not None:
+        if format not in ("json", "yaml"):
+            raise ValueError(f"Unsupported format: {format!r}")
+        return format
+    name = _source_name(source)
+    suffix = os.path.splitext(name or "")[1].lower()
+    return "yaml" if suffix in (".yaml", ".yml") else "json"
+
+
+def iter_spec(
+    source: Source,
+    *,
+    format: Optional[str] = None,
+    context: Optional[Dict[str, Any]] = None,
+    source_map: Optional[SourceMap] = None,
+) -> Iterator[SpecEntry]:
+    """Stream the entries of an AsyncAPI document from a file.
+
+    Entries of ``servers``, ``channels`` and ``operations`` are validated into
+    their models one at a time as they are read; ``components`` entries and
+    other top-level fields are yielded as raw data. ``format`` is ``"json"``
+    or ``"yaml"`` and is inferred from the file name when omitted.
+
+    Entries that fail validation are skipped, and their errors are raised
+    together as one ``pydantic.ValidationError`` after the last entry, with
+    each location starting at the section and name of its entry.
+
+    For YAML sources, a given ``source_map`` is filled with the position of
+    every value read, and the validation error is annotated with source
+    locations (see ``annotate_error``).
+    """
+    fmt = _detect_format(source, format)
+    errors: List[Any] = []
+
+    def build(section: str, name: str, raw: Any) -> Any:
+        try:
+            return _SECTION_MODELS[section].model_validate(raw, context=context)
+        except ValidationError as exc:
+            errors.extend(_line_errors(exc, (section, name)))
+            return _INVALID
+
+    def read(fp: IO[Any]) -> Iterator[SpecEntry]:
+        if fmt == "yaml":
+            return _iter_yaml(fp, build, source_map)
+        return _iter_json(fp, build)
+
+    def entries(fp: IO[Any]) -> Iterator[SpecEntry]:
+        for entry in read(fp):
+            if entry.value is not _INVALID:
+                yield entry
+        if errors:
+            raise _entry_error(errors, source_map)
+
+    if isinstance(source, (str, os.PathLike)):
+        with open(source, "rb") as fp:
+            yield from entries(fp)
+    else:
+        yield from entries(source)
+
+
+def load_spec(
+    source: Source, *, format: Optional[str] = None, locations: bool = False
+) -> AsyncAPI:
+    """Load an AsyncAPI document from a file, validating entries as they stream.
+
+    The root is assembled from already validated entries, so peak memory stays
+    close to the size of the final model tree.
+
+    With ``locations=True``, YAML sources record the line and column of each
+    value while they are parsed, and a ``pydantic.ValidationError`` raised
+    for the document carries them in its ``locations`` attribute. Positions
+    are not tracked for JSON sources. The error lists the problems of every
+    entry and of the rest of the document.
+    """
+    source_map = SourceMap(_source_name(source)) if locations else None
+    root: Dict[str, Any] = {}
+    components: Dict[str, Any] = {}
+    errors: List[Any] = []
+    try:
+        for section, key, value in iter_spec(
+            source, format=format, source_map=source_map
+        ):
+            if not section:
+                root[key] = value
+            elif section.startswith("/components"):
+                if section == "/components":
+                    components[key] = value
+                else:
+                    section = section[len("/components/") :]
+                    components.setdefault(section, {})[key] = value
+            else:
+                root.setdefault(section[1:], {})[key] = value
+    except ValidationError as exc:
+        # Invalid entries were left out of the root; validate the rest of
+        # the document so the error reports every problem at once.
+        errors.extend(_line_errors(exc))
+    if components:
+        root["components"] = components
+    try:
+        document = AsyncAPI.model_validate(root)
+    except ValidationError as exc:
+        errors.extend(_line_errors(exc))
+    if errors:
+        raise _entry_error(errors, source_map)
+    return document
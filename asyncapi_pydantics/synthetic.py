@@ -0,0 +1,158 @@
+"""Synthetic AsyncAPI documents for benchmarks and scaling tests.
+
+This module generates raw AsyncAPI 3.0.0 documents of configurable size,
+so parse, serialization and reference resolution costs can be measured on
+documents much larger than the bundled examples. Output is deterministic
+for a given seed.
+"""
+
+import random
+from typing import Any, Dict, Optional
+
+_LEAF_TYPES = (
+    {"type": "string", "maxLength": 64},
+    {"type": "integer", "minimum": 0},
+    {"type": "number"},
+    {"type": "boolean"},
+    {"type": "string", "format": "date-time"},
+    {"type": "string", "enum": ["on", "off", "dim"]},
+)
+
+
+class _Generator:
+    def __init__(
+        self,
+        schema_depth: int,
+        schema_width: int,
+        ref_density: float,
+        seed: int,
+    ) -> None:
+        self.schema_depth = schema_depth
+        self.schema_width = schema_width
+        self.ref_density = ref_density
+        self.random = random.Random(seed)
+        self.schemas: Dict[str, Any] = {}
+
+    def use_ref(self) -> bool:
+        return self.random.random() < self.ref_density
+
+    def leaf(self) -> Dict[str, Any]:
+        return dict(self.random.choice(_LEAF_TYPES))
+
+    def schema(self, name: str, depth: int) -> Dict[str, Any]:
+        """Return an object schema nested ``depth`` levels deep."""
+        properties: Dict[str, Any] = {}
+        for index in range(self.schema_width):
+            key = f"field{index}"
+            if depth > 0 and index == 0:
+                properties[key] = self.nested(f"{name}Field{index}", depth - 1)
+            elif depth > 0 and index == 1:
+                properties[key] = {
+                    "type": "array",
+                    "items": self.nested(f"{name}Item", depth - 1),
+                }
+            else:
+                properties[key] = self.leaf()
+        return {
+            "type": "object",
+            "description": f"Synthetic schema {name}.",
+            "required": ["field0"],
+            "properties": properties,
+        }
+
+    def nested(self, name: str, depth: int) -> Dict[str, Any]:
+        """Return a nested schema, placed in components when using a ref."""
+        if self.use_ref():
+            if name not in self.schemas:
+                self.schemas[name] = {}
+                self.schemas[name] = self.schema(name, depth)
+            return {"$ref": f"#/components/schemas/{name}"}
+        return self.schema(name, depth)
+
+
+def generate_spec(
+    *,
+    servers: int = 1,
+    channels: int = 10,
+    operations: Optional[int] = None,
+    messages: int = 1,
+    schema_depth: int = 2,
+    schema_width: int = 4,
+    ref_density: float = 0.5,
+    seed: int = 0,
+) -> Dict[str, Any]:
+    """Return a raw AsyncAPI document of the requested size.
+
+    Args:
+        servers: Number of Server Objects.
+        channels: Number of Channel Objects.
+        operations: Number of Operation Objects; defaults to one per channel.
+        messages: Number of messages per channel.
+        schema_depth: Nesting depth of every message payload.
+        schema_width: Number of properties per object schema.
+        ref_density: Probability, between 0 and 1, that a message, payload or
+            nested schema is a ``$ref`` to components rather than inline.
+        seed: Seed for the deterministic random choices.
+    """
+    generator = _Generator(schema_depth, schema_width, ref_density, seed)
+    component_messages: Dict[str, Any] = {}
+    document_channels: Dict[str, Any] = {}
+    document_operations: Dict[str, Any] = {}
+
+    for index in range(channels):
+        channel_messages: Dict[str, Any] = {}
+        for number in range(messages):
+            name = f"channel{index}Message{number}"
+            message: Dict[str, Any] = {
+                "name": name,
+                "title": f"Message {number} of channel {index}",
+                "contentType": "application/json",
+                "payload": generator.nested(f"{name}Payload", schema_depth),
+            }
+            if generator.use_ref():
+                component_messages[name] = message
+                message = {"$ref": f"#/components/messages/{name}"}
+            channel_messages[f"message{number}"] = message
+        document_channels[f"channel{index}"] = {
+            "address": f"devices/{{deviceId}}/channel{index}",
+            "description": f"Synthetic channel {index}.",
+            "parameters": {"deviceId": {"description": "Device identifier."}},
+            "messages": channel_messages,
+        }
+
+    for index in range(channels if operations is None else operations):
+        channel_id = f"channel{index % channels}" if channels else None
+        operation: Dict[str, Any] = {
+            "action": "send" if index % 2 else "receive",
+            "summary": f"Synthetic operation {index}.",
+        }
+        if channel_id is not None:
+            operation["channel"] = {"$ref": f"#/channels/{channel_id}"}
+            operation["messages"] = [
+                {"$ref": f"#/channels/{channel_id}/messages/message{number}"}
+                for number in range(messages)
+            ]
+        document_operations[f"operation{index}"] = operation
+
+    return {
+        "asyncapi": "3.0.0",
+        "info": {
+            "title": "Synthetic API",
+            "version": "1.0.0",
+            "description": "Generated for benchmarks.",
+        },
+        "servers": {
+            f"server{index}": {
+                "host": f"broker{index}.example.com:1883",
+                "protocol": "mqtt",
+                "description": f"Synthetic server {index}.",
+            }
+            for index in range(servers)
+        },
+        "channels": document_channels,
+        "operations": document_operations,
+        "components": {
+            "schemas": generator.schemas,
+            "messages": component_messages,
+        },
+    }
@@ -32,3 +32,4 @@ class Tag(BaseModel):
 
         populate_by_name = True
         extra = "allow"
+        defer_build = True
@@ -0,0 +1,88 @@
+"""Application of message and operation traits.
+
+Messages and operations may list traits, inline or as references into
+``components.messageTraits`` and ``components.operationTraits``. TraitMerger
+computes the effective object with the traits applied: traits are merged in
+the order they are listed using JSON Merge Patch (RFC 7386), and the object's
+own properties are merged last so that a trait never overrides them. The
+result has no ``traits`` and is memoized per definition.
+"""
+
+from typing import Any, Dict, List, Type, Union
+
+from pydantic import BaseModel
+
+from ._memo import IdentityCache
+from .channel import Message
+from .operation import Operation
+from .patch import _raw
+from .resolver import ModelT, RefResolver, get_ref
+
+
+def merge_patch(target: Any, patch: Any) -> Any:
+    """Apply a JSON Merge Patch to plain data, returning a new value.
+
+    Mappings are merged recursively and a None in the patch removes the key;
+    any other patch value replaces the target.
+    """
+    if not isinstance(patch, dict):
+        return patch
+    merged: Dict[str, Any] = dict(target) if isinstance(target, dict) else {}
+    for key, value in patch.items():
+        if value is None:
+            merged.pop(key, None)
+        else:
+            merged[key] = merge_patch(merged.get(key), value)
+    return merged
+
+
+class TraitMerger:
+    """Computes and memoizes the effective messages and operations of a document.
+
+    Results are cached per definition instance; create a new merger after
+    modifying the document.
+    """
+
+    def __init__(self, document: Any) -> None:
+        self.document = document
+        self.resolver: RefResolver = document.resolver
+        self._effective: IdentityCache[BaseModel] = IdentityCache()
+
+    def _traits(self, traits: List[Any]) -> List[Any]:
+        resolved = []
+        for trait in traits:
+            ref = get_ref(trait)
+            resolved.append(_raw(self.resolver.resolve(ref) if ref else trait))
+        return resolved
+
+    def apply(self, definition: ModelT) -> ModelT:
+        """Return a definition with its traits applied."""
+        effective = self._effective.get(definition)
+        if effective is None:
+            traits = getattr(definition, "traits", None)
+            if not traits:
+                effective = definition
+            else:
+                merged: Any = {}
+                for trait in self._traits(traits):
+                    merged = merge_patch(merged, trait)
+                own = _raw(definition)
+                own.pop("traits", None)
+                merged = merge_patch(merged, own)
+                merged.pop("traits", None)
+                effective = type(definition).model_validate(merged)
+            self._effective[definition] = effective
+        return effective  # type: ignore[return-value]
+
+    def _definition(self, node: Union[str, Any], model: Type[ModelT]) -> ModelT:
+        if isinstance(node, str):
+            return self.resolver.resolve(node, model)  # type: ignore[no-any-return]
+        return self.resolver.deref(node, model)  # type: ignore[no-any-return]
+
+    def message(self, message: Union[str, Message, Dict[str, Any]]) -> Message:
+        """Return the effective Message for a message, reference or pointer."""
+        return self.apply(self._definition(message, Message))
+
+    def operation(self, operation: Union[str, Operation, Dict[str, Any]]) -> Operation:
+        """Return the effective Operation for an operation, reference or pointer."""
+        return self.apply(self._definition(operation, Operation))
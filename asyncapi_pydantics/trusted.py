@@ -0,0 +1,195 @@
+"""Construction of model trees from trusted data without validation.
+
+Documents that were already validated (in CI, for example) do not need to be
+validated again at runtime. ``construct_trusted`` builds the same typed tree
+that validation would produce, honouring field aliases, defaults and extra
+fields, but performs no type checks: the result for invalid data is
+undefined.
+"""
+
+import copy
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    ForwardRef,
+    List,
+    Optional,
+    Tuple,
+    Type,
+    Union,
+)
+
+from pydantic import AnyUrl, BaseModel
+from pydantic_core import Url
+from typing_extensions import Annotated, get_args, get_origin
+
+from .resolver import ModelT
+
+Converter = Callable[[Any], Any]
+
+_IMMUTABLE = (type(None), str, int, float, bool, tuple, frozenset)
+
+
+class _Plan:
+    """How to turn a raw mapping into an instance of one model class."""
+
+    __slots__ = (
+        "keys",
+        "template",
+        "required",
+        "copied",
+        "factories",
+        "extra",
+        "post_init",
+    )
+
+    def __init__(self, cls: Type[BaseModel]) -> None:
+        config = cls.model_config
+        by_name = bool(config.get("populate_by_name"))
+        # Input key -> (field name, converter)
+        self.keys: Dict[str, Tuple[str, Optional[Converter]]] = {}
+        # Every field in definition order, holding its default where it is
+        # immutable; copying it fixes the order of the instance __dict__.
+        self.template: Dict[str, Any] = {}
+        self.required: List[str] = []
+        self.copied: Dict[str, Any] = {}
+        self.factories: Dict[str, Callable[[], Any]] = {}
+        for name, field in cls.model_fields.items():
+            entry = (name, _converter(field.annotation))
+            self.keys[field.alias or name] = entry
+            if by_name or field.alias is None:
+                self.keys.setdefault(name, entry)
+            self.template[name] = field.default
+            if field.default_factory is not None:
+                self.factories[name] = field.default_factory  # type: ignore[assignment]
+            elif field.is_required():
+                self.required.append(name)
+            elif not isinstance(field.default, _IMMUTABLE):
+                self.copied[name] = field.default
+        self.extra = config.get("extra")
+        self.post_init = bool(cls.__pydantic_post_init__)
+
+
+_plans: Dict[type, _Plan] = {}
+
+
+def _plan(cls: Type[BaseModel]) -> _Plan:
+    plan = _plans.get(cls)
+    if plan is None:
+        plan = _plans[cls] = _Plan(cls)
+    return plan
+
+
+def _is_model(annotation: Any) -> bool:
+    return isinstance(annotation, type) and issubclass(annotation, BaseModel)
+
+
+def _union_converter(members: Tuple[Any, ...]) -> Optional[Converter]:
+    """Mirror how smart-mode unions pick a member for valid mapping input.
+
+    A mapping of strings matches a ``Dict[str, str]`` member exactly and is
+    kept as is; any other mapping becomes the first model member.
+    """
+    models = [member for member in members if _is_model(member)]
+    if not models:
+        return None
+    model = models[0]
+    str_dict = any(
+        get_origin(member) is dict and get_args(member) == (str, str)
+        for member in members
+    )
+
+    def convert(value: Any) -> Any:
+        if type(value) is not dict:
+            return value
+        if str_dict and all(type(item) is str for item in value.values()):
+            return value
+        return construct_trusted(model, value)
+
+    return convert
+
+
+def _converter(annotation: Any) -> Optional[Converter]:
+    """Return the conversion validation applies for an annotation, if any."""
+    if annotation is Any or isinstance(annotation, (str, ForwardRef)):
+        return None
+    if _is_model(annotation):
+        return lambda value: (
+            construct_trusted(annotation, value) if type(value) is dict else value
+        )
+    if annotation is float:
+        return lambda value: float(value) if type(value) is int else value
+    if isinstance(annotation, type) and issubclass(annotation, (AnyUrl, Url)):
+        return lambda value: annotation(value) if type(value) is str else value
+
+    origin = get_origin(annotation)
+    args = get_args(annotation)
+    if origin is Annotated:
+        return _converter(args[0])
+    if origin is Union:
+        members = tuple(arg for arg in args if arg is not type(None))
+        if len(members) == 1:
+            return _converter(members[0])
+        return _union_converter(members)
+    if origin is list and args:
+        item = _converter(args[0])
+        if item is None:
+            return None
+        return lambda value: (
+            [item(entry) for entry in value] if type(value) is list else value
+        )
+    if origin is dict and len(args) == 2:
+        item = _converter(args[1])
+        if item is None:
+            return None
+        return lambda value: (
+            {key: item(entry) for key, entry in value.items()}
+            if type(value) is dict
+            else value
+        )
+    return None
+
+
+def construct_trusted(model: Type[ModelT], data: Dict[str, Any]) -> ModelT:
+    """Build a model tree from trusted raw data without validating it.
+
+    Nested mappings become the models validation would create, keyed by
+    alias (and by field name where the model allows it). Fields left out get
+    their defaults and unknown keys become extra fields or are dropped
+    according to the model's ``extra`` setting.
+    """
+    plan = _plan(model)
+    keys = plan.keys
+    values = plan.template.copy()
+    fields_set = set()
+    extra: Optional[Dict[str, Any]] = {} if plan.extra == "allow" else None
+    for key, value in data.items():
+        entry = keys.get(key)
+        if entry is None:
+            if extra is not None:
+                extra[key] = value
+                fields_set.add(key)
+            continue
+        name, convert = entry
+        values[name] = value if convert is None else convert(value)
+        fields_set.add(name)
+    for name in plan.required:
+        if name not in fields_set:
+            del values[name]
+    for name, default in plan.copied.items():
+        if name not in fields_set:
+            values[name] = copy.deepcopy(default)
+    for name, factory in plan.factories.items():
+        if name not in fields_set:
+            values[name] = factory()
+
+    instance = model.__new__(model)
+    object.__setattr__(instance, "__dict__", values)
+    object.__setattr__(instance, "__pydantic_fields_set__", fields_set)
+    object.__setattr__(instance, "__pydantic_extra__", extra)
+    if plan.post_init:
+        instance.model_post_init(None)
+    else:
+        object.__setattr__(instance, "__pydantic_private__", None)
+    return instance
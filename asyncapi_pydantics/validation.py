@@ -0,0 +1,828 @@
+"""Runtime payload validation.
+
+This module compiles Schema Objects into reusable validators for checking
+message payloads at runtime. Compilation happens once per schema; the
+resulting validator is a tree of closures with no per-call keyword lookups.
+Error reporting is a separate, slower path that only runs on failures.
+"""
+
+import json
+import math
+import re
+from functools import lru_cache
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    NamedTuple,
+    Optional,
+    Set,
+    Tuple,
+    Union,
+)
+
+from pydantic import BaseModel
+
+from ._memo import IdentityCache
+from .channel import Message
+from .resolver import RefResolver, get_ref, normalize_pointer
+from .schema import MultiFormatSchema, Schema
+
+Path = Tuple[Union[str, int], ...]
+Check = Callable[[Any], bool]
+Explain = Callable[[Any, Path], Iterator["PayloadError"]]
+
+_MISSING = object()
+
+_JSON_SCHEMA_FORMATS = (
+    "application/schema+json",
+    "application/vnd.aai.asyncapi",
+    "application/vnd.aai.asyncapi+json",
+    "application/vnd.aai.asyncapi+yaml",
+)
+
+
+class PayloadError(NamedTuple):
+    """A single payload validation failure."""
+
+    path: Path
+    keyword: str
+    message: str
+
+    def __str__(self) -> str:
+        location = "/".join(str(part) for part in self.path)
+        return f"{location or '<root>'}: {self.message}"
+
+
+class PayloadValidationError(ValueError):
+    """Raised when a payload does not match its schema."""
+
+    def __init__(self, errors: List[PayloadError]) -> None:
+        self.errors = errors
+        super().__init__(
+            f"{len(errors)} payload validation error(s):\n"
+            + "\n".join(f"  {error}" for error in errors)
+        )
+
+
+class SchemaCompileError(ValueError):
+    """Raised when a schema cannot be compiled into a validator."""
+
+
+def _always(value: Any) -> bool:
+    return True
+
+
+def _never(value: Any) -> bool:
+    return False
+
+
+def _is_number(value: Any) -> bool:
+    return isinstance(value, (int, float)) and not isinstance(value, bool)
+
+
+def _is_integer(value: Any) -> bool:
+    if isinstance(value, bool):
+        return False
+    return isinstance(value, int) or (isinstance(value, float) and value.is_integer())
+
+
+_TYPE_CHECKS: Dict[str, Check] = {
+    "string": lambda value: isinstance(value, str),
+    "integer": _is_integer,
+    "number": _is_number,
+    "boolean": lambda value: isinstance(value, bool),
+    "null": lambda value: value is None,
+    "object": lambda value: isinstance(value, dict),
+    "array": lambda value: isinstance(value, (list, tuple)),
+}
+
+
+def _freeze(value: Any) -> Any:
+    """Return a hashable form of a JSON value that keeps booleans distinct."""
+    if isinstance(value, bool):
+        return (bool, value)
+    if isinstance(value, dict):
+        return (dict, frozenset((key, _freeze(item)) for key, item in value.items()))
+    if isinstance(value, (list, tuple)):
+        return (list, tuple(_freeze(item) for item in value))
+    return value
+
+
+def _all_of(checks: List[Check]) -> Check:
+    """Fuse a list of checks into a single short-circuiting check."""
+    if not checks:
+        return _always
+    if len(checks) == 1:
+        return checks[0]
+    if len(checks) == 2:
+        first, second = checks
+        return lambda value: first(value) and second(value)
+    fused = tuple(checks)
+
+    def check(value: Any) -> bool:
+        for item in fused:
+            if not item(value):
+                return False
+        return True
+
+    return check
+
+
+def _members_check(members: List[Any]) -> Check:
+    """Build a JSON-equality membership check (used by ``enum`` and ``const``)."""
+    frozen = frozenset(_freeze(member) for member in members)
+    if all(isinstance(member, str) for member in members):
+        strings = frozenset(members)
+        return lambda value: isinstance(value, str) and value in strings
+
+    def check(value: Any) -> bool:
+        try:
+            return _freeze(value) in frozen
+        except TypeError:
+            return False
+
+    return check
+
+
+class _Node:
+    """A compiled schema: a fused check plus an error explainer."""
+
+    __slots__ = ("check", "keywords")
+
+    def __init__(self) -> None:
+        self.check: Check = _always
+        self.keywords: List[Tuple[str, Check, Explain]] = []
+
+    def explain(self, value: Any, path: Path) -> Iterator[PayloadError]:
+        for _, check, explain in self.keywords:
+            if not check(value):
+                yield from explain(value, path)
+
+
+def _simple(keyword: str, message: Callable[[Any], str]) -> Explain:
+    def explain(value: Any, path: Path) -> Iterator[PayloadError]:
+        yield PayloadError(path, keyword, message(value))
+
+    return explain
+
+
+class _Compiler:
+    """Compiles schema dicts into ``_Node`` trees, sharing nodes for ``$ref``."""
+
+    def __init__(self, resolver: Optional[RefResolver]) -> None:
+        self.resolver = resolver
+        self.refs: Dict[str, _Node] = {}
+        self.pending: Set[str] = set()
+        self.recursive: Set[str] = set()
+
+    def compile(self, schema: Any) -> _Node:
+        if schema is True or schema is None:
+            return _Node()
+        if schema is False:
+            node = _Node()
+            node.check = _never
+            node.keywords.append(
+                ("false", _never, _simple("false", lambda v: "no value is allowed"))
+            )
+            return node
+        if isinstance(schema, BaseModel):
+            schema = _schema_dict(schema)
+        if not isinstance(schema, dict):
+            raise SchemaCompileError(f"Invalid schema: {schema!r}")
+
+        ref = get_ref(schema)
+        if ref is not None:
+            return self._compile_ref(ref)
+
+        node = _Node()
+        for keyword, handler in _KEYWORDS:
+            if keyword in schema and (
+                schema[keyword] is not None or keyword == "const"
+            ):
+                entry = handler(self, schema[keyword], schema)
+                if entry is not None:
+                    node.keywords.append((keyword,) + entry)
+        node.check = _all_of([check for _, check, _ in node.keywords])
+        return node
+
+    def _compile_ref(self, ref: str) -> _Node:
+        pointer = normalize_pointer(ref)
+        node = self.refs.get(pointer)
+        if node is not None:
+            if pointer in self.pending:
+                self.recursive.add(pointer)
+            return node
+        if self.resolver is None:
+            raise SchemaCompileError(f"Cannot resolve {ref!r} without a resolver")
+        # Register a placeholder first so recursive schemas terminate. Only
+        # schemas that actually refer back to themselves keep the indirection.
+        target: List[_Node] = []
+        placeholder = _Node()
+        placeholder.check = lambda value: target[0].check(value)
+        self.refs[pointer] = placeholder
+        self.pending.add(pointer)
+        try:
+            compiled = self.compile(self.resolver.resolve(ref))
+        finally:
+            self.pending.discard(pointer)
+        target.append(compiled)
+        if pointer not in self.recursive:
+            self.refs[pointer] = compiled
+            return compiled
+        placeholder.keywords = compiled.keywords
+        return placeholder
+
+
+def _kw_type(compiler: _Compiler, value: Any, schema: Dict[str, Any]) -> Any:
+    names = [value] if isinstance(value, str) else list(value)
+    try:
+        checks = [_TYPE_CHECKS[name] for name in names]
+    except KeyError as exc:
+        raise SchemaCompileError(f"Unknown type: {exc.args[0]!r}") from None
+    if len(checks) == 1:
+        check = checks[0]
+    else:
+        check = lambda v: any(c(v) for c in checks)  # noqa: E731
+    expected = " or ".join(names)
+    return check, _simple("type", lambda v: f"expected {expected}")
+
+
+def _kw_enum(compiler: _Compiler, value: Any, schema: Dict[str, Any]) -> Any:
+    members = list(value)
+    return _members_check(members), _simple(
+        "enum", lambda v: f"{v!r} is not one of {members!r}"
+    )
+
+
+def _kw_const(compiler: _Compiler, value: Any, schema: Dict[str, Any]) -> Any:
+    return _members_check([value]), _simple(
+        "const", lambda v: f"{v!r} is not equal to {value!r}"
+    )
+
+
+def _numeric(keyword: str, compare: Callable[[Any, Any], bool], text: str) -> Any:
+    def handler(compiler: _Compiler, limit: Any, schema: Dict[str, Any]) -> Any:
+        def check(v: Any) -> bool:
+            return not _is_number(v) or compare(v, limit)
+
+        return check, _simple(keyword, lambda v: f"{v!r} is not {text} {limit!r}")
+
+    return handler
+
+
+def _kw_multiple_of(compiler: _Compiler, divisor: Any, schema: Dict[str, Any]) -> Any:
+    if isinstance(divisor, float) and divisor.is_integer():
+        divisor = int(divisor)
+
+    def check(v: Any) -> bool:
+        if not _is_number(v):
+            return True
+        if isinstance(v, int) and isinstance(divisor, int):
+            return v % divisor == 0
+        quotient = v / divisor
+        return math.isfinite(quotient) and abs(quotient - round(quotient)) < 1e-9
+
+    return check, _simple(
+        "multipleOf", lambda v: f"{v!r} is not a multiple of {divisor!r}"
+    )
+
+
+def _sized(
+    keyword: str, types: Any, compare: Callable[[int, int], bool], text: str
+) -> Any:
+    def handler(compiler: _Compiler, limit: Any, schema: Dict[str, Any]) -> Any:
+        def check(v: Any) -> bool:
+            return not isinstance(v, types) or compare(len(v), limit)
+
+        return check, _simple(
+            keyword, lambda v: f"length {len(v)} is not {text} {limit}"
+        )
+
+    return handler
+
+
+def _kw_pattern(compiler: _Compiler, pattern: str, schema: Dict[str, Any]) -> Any:
+    try:
+        search = re.compile(pattern).search
+    except re.error as exc:
+        raise SchemaCompileError(f"Invalid pattern {pattern!r}: {exc}") from None
+
+    def check(v: Any) -> bool:
+        return not isinstance(v, str) or search(v) is not None
+
+    return check, _simple("pattern", lambda v: f"{v!r} does not match {pattern!r}")
+
+
+def _kw_unique_items(compiler: _Compiler, unique: Any, schema: Dict[str, Any]) -> Any:
+    if not unique:
+        return None
+
+    def check(v: Any) -> bool:
+        if not isinstance(v, (list, tuple)):
+            return True
+        try:
+            return len({_freeze(item) for item in v}) == len(v)
+        except TypeError:
+            return True
+
+    return check, _simple("uniqueItems", lambda v: "array items are not unique")
+
+
+def _kw_items(compiler: _Compiler, items: Any, schema: Dict[str, Any]) -> Any:
+    if isinstance(items, list):
+        nodes = [compiler.compile(item) for item in items]
+        additional = schema.get("additionalItems")
+        extra = compiler.compile(additional) if additional is not None else None
+
+        def check(v: Any) -> bool:
+            if not isinstance(v, (list, tuple)):
+                return True
+            for node, item in zip(nodes, v):
+                if not node.check(item):
+                    return False
+            if extra is not None:
+                for item in v[len(nodes) :]:
+                    if not extra.check(item):
+                        return False
+            return True
+
+        def explain(v: Any, path: Path) -> Iterator[PayloadError]:
+            for index, item in enumerate(v):
+                node = nodes[index] if index < len(nodes) else extra
+                if node is not None and not node.check(item):
+                    yield from node.explain(item, path + (index,))
+
+        return check, explain
+
+    node = compiler.compile(items)
+    item_check = node.check
+
+    def check_all(v: Any) -> bool:
+        if not isinstance(v, (list, tuple)):
+            return True
+        for item in v:
+            if not item_check(item):
+                return False
+        return True
+
+    def explain_all(v: Any, path: Path) -> Iterator[PayloadError]:
+        for index, item in enumerate(v):
+            if not item_check(item):
+                yield from node.explain(item, path + (index,))
+
+    return check_all, explain_all
+
+
+def _kw_contains(compiler: _Compiler, contains: Any, schema: Dict[str, Any]) -> Any:
+    item_check = compiler.compile(contains).check
+
+    def check(v: Any) -> bool:
+        return not isinstance(v, (list, tuple)) or any(item_check(i) for i in v)
+
+    return check, _simple("contains", lambda v: "no array item matches 'contains'")
+
+
+def _kw_properties(compiler: _Compiler, properties: Any, schema: Dict[str, Any]) -> Any:
+    nodes = [(name, compiler.compile(sub)) for name, sub in properties.items()]
+    checks = [(name, node.check) for name, node in nodes]
+
+    def check(v: Any) -> bool:
+        if not isinstance(v, dict):
+            return True
+        get = v.get
+        for name, prop_check in checks:
+            item = get(name, _MISSING)
+            if item is not _MISSING and not prop_check(item):
+                return False
+        return True
+
+    def explain(v: Any, path: Path) -> Iterator[PayloadError]:
+        for name, node in nodes:
+            if name in v and not node.check(v[name]):
+                yield from node.explain(v[name], path + (name,))
+
+    return check, explain
+
+
+def _kw_required(compiler: _Compiler, required: Any, schema: Dict[str, Any]) -> Any:
+    names = frozenset(required)
+    if not names:
+        return None
+
+    def check(v: Any) -> bool:
+        return not isinstance(v, dict) or names.issubset(v.keys())
+
+    def explain(v: Any, path: Path) -> Iterator[PayloadError]:
+        for name in sorted(names - v.keys()):
+            yield PayloadError(path, "required", f"missing required property {name!r}")
+
+    return check, explain
+
+
+def _kw_pattern_properties(
+    compiler: _Compiler, patterns: Any, schema: Dict[str, Any]
+) -> Any:
+    nodes = [
+        (re.compile(pattern).search, compiler.compile(sub))
+        for pattern, sub in patterns.items()
+    ]
+
+    def failures(v: Any) -> Iterator[Tuple[str, _Node]]:
+        for key, item in v.items():
+            for search, node in nodes:
+                if search(key) and not node.check(item):
+                    yield key, node
+
+    def check(v: Any) -> bool:
+        return not isinstance(v, dict) or next(failures(v), None) is None
+
+    def explain(v: Any, path: Path) -> Iterator[PayloadError]:
+        for key, node in failures(v):
+            yield from node.explain(v[key], path + (key,))
+
+    return check, explain
+
+
+def _kw_additional_properties(
+    compiler: _Compiler, additional: Any, schema: Dict[str, Any]
+) -> Any:
+    if additional is True:
+        return None
+    known = frozenset(schema.get("properties") or ())
+    patterns = [re.compile(p).search for p in schema.get("patternProperties") or ()]
+    node = compiler.compile(additional)
+
+    def extra_keys(v: Any) -> Iterator[str]:
+        for key in v:
+            if key not in known and not any(search(key) for search in patterns):
+                yield key
+
+    def check(v: Any) -> bool:
+        if not isinstance(v, dict):
+            return True
+        if additional is False:
+            return next(extra_keys(v), None) is None
+        return all(node.check(v[key]) for key in extra_keys(v))
+
+    def explain(v: Any, path: Path) -> Iterator[PayloadError]:
+        for key in extra_keys(v):
+            if additional is False:
+                yield PayloadError(
+                    path, "additionalProperties", f"unexpected property {key!r}"
+                )
+            elif not node.check(v[key]):
+                yield from node.explain(v[key], path + (key,))
+
+    return check, explain
+
+
+def _kw_property_names(compiler: _Compiler, names: Any, schema: Dict[str, Any]) -> Any:
+    node = compiler.compile(names)
+
+    def check(v: Any) -> bool:
+        return not isinstance(v, dict) or all(node.check(key) for key in v)
+
+    def explain(v: Any, path: Path) -> Iterator[PayloadError]:
+        for key in v:
+            if not node.check(key):
+                yield from node.explain(key, path + (key,))
+
+    return check, explain
+
+
+def _kw_all_of(compiler: _Compiler, schemas: Any, schema: Dict[str, Any]) -> Any:
+    nodes = [compiler.compile(sub) for sub in schemas]
+    check = _all_of([node.check for node in nodes])
+
+    def explain(v: Any, path: Path) -> Iterator[PayloadError]:
+        for node in nodes:
+            yield from node.explain(v, path)
+
+    return check, explain
+
+
+def _kw_any_of(compiler: _Compiler, schemas: Any, schema: Dict[str, Any]) -> Any:
+    checks = [compiler.compile(sub).check for sub in schemas]
+
+    def check(v: Any) -> bool:
+        for item in checks:
+            if item(v):
+                return True
+        return False
+
+    return check, _simple("anyOf", lambda v: "value does not match any schema in anyOf")
+
+
+def _kw_one_of(compiler: _Compiler, schemas: Any, schema: Dict[str, Any]) -> Any:
+    checks = [compiler.compile(sub).check for sub in schemas]
+
+    def matches(v: Any) -> int:
+        count = 0
+        for item in checks:
+            if item(v):
+                count += 1
+                if count > 1:
+                    break
+        return count
+
+    def check(v: Any) -> bool:
+        return matches(v) == 1
+
+    return check, _simple(
+        "oneOf", lambda v: f"value matches {matches(v)} schemas in oneOf, expected 1"
+    )
+
+
+def _kw_not(compiler: _Compiler, negated: Any, schema: Dict[str, Any]) -> Any:
+    inner = compiler.compile(negated).check
+    return (lambda v: not inner(v)), _simple("not", lambda v: "value matches 'not'")
+
+
+def _kw_if(compiler: _Compiler, condition: Any, schema: Dict[str, Any]) -> Any:
+    if_node = compiler.compile(condition)
+    then_node = compiler.compile(schema.get("then"))
+    else_node = compiler.compile(schema.get("else"))
+
+    def check(v: Any) -> bool:
+        return (then_node if if_node.check(v) else else_node).check(v)
+
+    def explain(v: Any, path: Path) -> Iterator[PayloadError]:
+        yield from (then_node if if_node.check(v) else else_node).explain(v, path)
+
+    return check, explain
+
+
+_KEYWORDS: List[Tuple[str, Callable[[_Compiler, Any, Dict[str, Any]], Any]]] = [
+    ("type", _kw_type),
+    ("enum", _kw_enum),
+    ("const", _kw_const),
+    ("minimum", _numeric("minimum", lambda v, n: v >= n, ">=")),
+    ("maximum", _numeric("maximum", lambda v, n: v <= n, "<=")),
+    ("exclusiveMinimum", _numeric("exclusiveMinimum", lambda v, n: v > n, ">")),
+    ("exclusiveMaximum", _numeric("exclusiveMaximum", lambda v, n: v < n, "<")),
+    ("multipleOf", _kw_multiple_of),
+    ("minLength", _sized("minLength", str, lambda n, m: n >= m, ">=")),
+    ("maxLength", _sized("maxLength", str, lambda n, m: n <= m, "<=")),
+    ("pattern", _kw_pattern),
+    ("minItems", _sized("minItems", (list, tuple), lambda n, m: n >= m, ">=")),
+    ("maxItems", _sized("maxItems", (list, tuple), lambda n, m: n <= m, "<=")),
+    ("uniqueItems", _kw_unique_items),
+    ("items", _kw_items),
+    ("contains", _kw_contains),
+    ("required", _kw_required),
+    ("minProperties", _sized("minProperties", dict, lambda n, m: n >= m, ">=")),
+    ("maxProperties", _sized("maxProperties", dict, lambda n, m: n <= m, "<=")),
+    ("properties", _kw_properties),
+    ("patternProperties", _kw_pattern_properties),
+    ("additionalProperties", _kw_additional_properties),
+    ("propertyNames", _kw_property_names),
+    ("allOf", _kw_all_of),
+    ("anyOf", _kw_any_of),
+    ("oneOf", _kw_one_of),
+    ("not", _kw_not),
+    ("if", _kw_if),
+]
+
+
+def _schema_dict(schema: BaseModel) -> Dict[str, Any]:
+    """Return a Schema model as a JSON Schema dict keyed by alias."""
+    return schema.model_dump(by_alias=True, exclude_unset=True)
+
+
+def _unwrap_multi_format(schema: Any) -> Any:
+    """Return the JSON Schema inside a Multi Format Schema Object, if any."""
+    if isinstance(schema, MultiFormatSchema):
+        schema_format, inner = schema.schema_format, schema.schema
+    elif isinstance(schema, dict) and "schemaFormat" in schema and "schema" in schema:
+        schema_format, inner = schema["schemaFormat"], schema["schema"]
+    else:
+        return schema
+    if schema_format and not schema_format.split(";")[0].strip().startswith(
+        _JSON_SCHEMA_FORMATS
+    ):
+        raise SchemaCompileError(f"Unsupported schema format: {schema_format!r}")
+    return inner
+
+
+class BatchResult:
+    """The outcome of validating a batch of payloads.
+
+    Validity is stored as a bitmap with one bit per payload (bit ``i`` is set
+    when payload ``i`` is valid). Errors are only kept for invalid payloads.
+    """
+
+    __slots__ = ("size", "bitmap", "errors")
+
+    def __init__(
+        self, size: int, bitmap: bytearray, errors: Dict[int, List[PayloadError]]
+    ) -> None:
+        self.size = size
+        self.bitmap = bitmap
+        self.errors = errors
+
+    def __len__(self) -> int:
+        return self.size
+
+    def is_valid(self, index: int) -> bool:
+        """Return whether the payload at ``index`` is valid."""
+        if not 0 <= index < self.size:
+            raise IndexError(index)
+        return bool(self.bitmap[index >> 3] & (1 << (index & 7)))
+
+    @property
+    def valid_count(self) -> int:
+        """The number of valid payloads."""
+        return sum(bin(byte).count("1") for byte in self.bitmap)
+
+    @property
+    def all_valid(self) -> bool:
+        """Whether every payload in the batch is valid."""
+        return self.valid_count == self.size
+
+    def invalid_indices(self) -> List[int]:
+        """Return the indices of invalid payloads in ascending order."""
+        return [index for index in range(self.size) if not self.is_valid(index)]
+
+    def __repr__(self) -> str:
+        return f"BatchResult(size={self.size}, valid={self.valid_count})"
+
+
+_RAW_TYPES = (bytes, bytearray, memoryview)
+
+
+class PayloadValidator:
+    """A validator compiled from a schema.
+
+    Calling the validator returns whether a payload is valid. ``errors`` and
+    ``validate`` report why a payload is invalid.
+    """
+
+    __slots__ = ("_node", "is_valid", "resolver")
+
+    def __init__(self, node: _Node, resolver: Optional[RefResolver] = None) -> None:
+        self._node = node
+        self.is_valid: Check = node.check
+        self.resolver = resolver
+
+    def __call__(self, payload: Any) -> bool:
+        return self.is_valid(payload)
+
+    def iter_errors(self, payload: Any) -> Iterator[PayloadError]:
+        """Iterate over the validation errors of a payload."""
+        if not self.is_valid(payload):
+            yield from self._node.explain(payload, ())
+
+    def errors(self, payload: Any) -> List[PayloadError]:
+        """Return the validation errors of a payload."""
+        return list(self.iter_errors(payload))
+
+    def validate(self, payload: Any) -> Any:
+        """Return the payload, raising PayloadValidationError if it is invalid."""
+        if not self.is_valid(payload):
+            raise PayloadValidationError(self.errors(payload))
+        return payload
+
+    def validate_batch(
+        self,
+        payloads: Iterable[Any],
+        *,
+        decode: Optional[Callable[[Any], Any]] = None,
+        raw: bool = False,
+        collect_errors: bool = True,
+    ) -> BatchResult:
+        """Validate many payloads at once.
+
+        Raw ``bytes`` buffers are decoded with ``json.loads`` before
+        validation; a buffer that fails to decode is reported as invalid with
+        a ``decode`` error. Strings are payloads like any other value unless
+        ``raw`` is set, in which case they are decoded as JSON text too. A
+        ``decode`` function is applied to every payload instead. With
+        ``collect_errors`` disabled only the bitmap is computed.
+        """
+        check = self.is_valid
+        loads = decode or json.loads
+        raw_types = (*_RAW_TYPES, str) if raw else _RAW_TYPES
+        bitmap = bytearray()
+        invalid: List[Tuple[int, Any]] = []
+        decode_errors: Dict[int, str] = {}
+        byte = 0
+        index = -1
+        for index, payload in enumerate(payloads):
+            if decode is not None or isinstance(payload, raw_types):
+                try:
+                    payload = loads(payload)
+                except Exception as exc:
+                    decode_errors[index] = str(exc)
+                    payload = _MISSING
+            if payload is not _MISSING and check(payload):
+                byte |= 1 << (index & 7)
+            elif payload is not _MISSING:
+                invalid.append((index, payload))
+            if index & 7 == 7:
+                bitmap.append(byte)
+                byte = 0
+        size = index + 1
+        if size & 7:
+            bitmap.append(byte)
+
+        errors: Dict[int, List[PayloadError]] = {}
+        if collect_errors:
+            for index, message in decode_errors.items():
+                errors[index] = [PayloadError((), "decode", message)]
+            for index, payload in invalid:
+                errors[index] = self.errors(payload)
+            errors = dict(sorted(errors.items()))
+        return BatchResult(size, bitmap, errors)
+
+
+# Validators compiled without a resolver; the others are kept on the resolver
+# they refer to, so that they do not keep its document alive.
+_model_validators: IdentityCache[PayloadValidator] = IdentityCache()
+_message_validators: IdentityCache[PayloadValidator] = IdentityCache()
+
+
+def _compile(schema: Any, resolver: Optional[RefResolver]) -> PayloadValidator:
+    return PayloadValidator(_Compiler(resolver).compile(schema), resolver)
+
+
+@lru_cache(maxsize=1024)
+def _compile_json(canonical: str) -> PayloadValidator:
+    return _compile(json.loads(canonical), None)
+
+
+def compile_schema(
+    schema: Union[Schema, MultiFormatSchema, Dict[str, Any], bool],
+    resolver: Optional[RefResolver] = None,
+) -> PayloadValidator:
+    """Compile a schema into a reusable payload validator.
+
+    Validators are cached: per instance for Schema models, and by content for
+    plain dicts without references. Pass the document's resolver (for example
+    ``doc.resolver``) to support ``$ref`` pointers into the document.
+    """
+    schema = _unwrap_multi_format(schema)
+    if isinstance(schema, BaseModel):
+        validators = (
+            _model_validators
+            if resolver is None
+            else resolver.derived("schema_validators", IdentityCache)
+        )
+        cached = validators.get(schema)
+        if cached is None:
+            cached = validators[schema] = _compile(schema, resolver)
+        return cached
+    if resolver is None and isinstance(schema, dict):
+        try:
+            canonical = json.dumps(schema, sort_keys=True)
+        except (TypeError, ValueError):
+            return _compile(schema, None)
+        return _compile_json(canonical)
+    return _compile(schema, resolver)
+
+
+def message_validator(
+    message: Message, resolver: Optional[RefResolver] = None
+) -> PayloadValidator:
+    """Return the compiled payload validator for a Message Object.
+
+    The validator is cached on the message, so repeated calls are cheap.
+    A message without a payload accepts any value.
+    """
+    validators = (
+        _message_validators
+        if resolver is None
+        else resolver.derived("message_validators", IdentityCache)
+    )
+    cached = validators.get(message)
+    if cached is None:
+        payload = message.payload
+        if resolver is not None and get_ref(payload) is not None:
+            payload = resolver.resolve(get_ref(payload))  # type: ignore[arg-type]
+        cached = _compile(_unwrap_multi_format(payload), resolver)
+        validators[message] = cached
+    return cached
+
+
+def validate_batch(
+    target: Union[Message, Schema, Dict[str, Any], PayloadValidator],
+    payloads: Iterable[Any],
+    *,
+    resolver: Optional[RefResolver] = None,
+    decode: Optional[Callable[[Any], Any]] = None,
+    raw: bool = False,
+    collect_errors: bool = True,
+) -> BatchResult:
+    """Validate a batch of payloads against one message or schema definition."""
+    if isinstance(target, PayloadValidator):
+        validator = target
+    elif isinstance(target, Message):
+        validator = message_validator(target, resolver)
+    else:
+        validator = compile_schema(target, resolver)
+    return validator.validate_batch(
+        payloads, decode=decode, raw=raw, collect_errors=collect_errors
+    )
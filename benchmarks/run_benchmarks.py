@@ -0,0 +1,150 @@
+"""Benchmarks for parsing, serializing and resolving AsyncAPI documents.
+
+Synthetic documents of increasing size are generated with
+``asyncapi_pydantics.synthetic`` and each operation is timed on every size,
+so scaling regressions show up as a growing time per channel.
+
+Usage:
+    python benchmarks/run_benchmarks.py
+    python benchmarks/run_benchmarks.py --sizes 10 100 1000 --depth 3 --json
+"""
+
+import argparse
+import gc
+import io
+import json
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+from typing import Any, Callable, Dict, Iterator, List
+
+# Add the package to the path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from asyncapi_pydantics import AsyncAPI, RefResolver  # noqa: E402
+from asyncapi_pydantics.cache import ParseCache  # noqa: E402
+from asyncapi_pydantics.serialize import write_spec  # noqa: E402
+from asyncapi_pydantics.synthetic import generate_spec  # noqa: E402
+
+
+def iter_refs(node: Any) -> Iterator[str]:
+    """Yield every ``$ref`` string in a raw document."""
+    if isinstance(node, dict):
+        ref = node.get("$ref")
+        if isinstance(ref, str):
+            yield ref
+        for value in node.values():
+            yield from iter_refs(value)
+    elif isinstance(node, list):
+        for value in node:
+            yield from iter_refs(value)
+
+
+def best_time(func: Callable[[], Any], repeat: int) -> float:
+    """Return the fastest of ``repeat`` runs of ``func`` in seconds."""
+    best = float("inf")
+    for _ in range(repeat):
+        gc.collect()
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def peak_memory(func: Callable[[], Any]) -> int:
+    """Return the peak traced memory in bytes while running ``func``."""
+    gc.collect()
+    tracemalloc.start()
+    try:
+        result = func()
+        peak = tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+    del result
+    return peak
+
+
+def run_case(data: Dict[str, Any], repeat: int) -> Dict[str, float]:
+    """Measure every benchmark on one raw document."""
+    document = AsyncAPI.model_validate(data)
+    refs = list(iter_refs(data))
+
+    def resolve_all() -> None:
+        resolver = RefResolver(document)
+        for ref in refs:
+            resolver.resolve(ref)
+
+    text = json.dumps(data)
+
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "spec.json")
+        with open(path, "w") as fp:
+            fp.write(text)
+        cache = ParseCache(os.path.join(directory, "cache"))
+        cache.load(path)
+        cached_load = best_time(lambda: cache.load(path), repeat)
+
+    return {
+        "refs": len(refs),
+        "parse_s": best_time(lambda: AsyncAPI.model_validate(data), repeat),
+        "parse_json_s": best_time(lambda: AsyncAPI.model_validate_json(text), repeat),
+        "trusted_s": best_time(lambda: AsyncAPI.load(data, trusted=True), repeat),
+        "cached_load_s": cached_load,
+        "parse_peak_mb": peak_memory(lambda: AsyncAPI.model_validate(data)) / 1e6,
+        "dump_s": best_time(
+            lambda: document.model_dump(by_alias=True, exclude_unset=True), repeat
+        ),
+        "dump_json_s": best_time(
+            lambda: document.model_dump_json(by_alias=True, exclude_unset=True),
+            repeat,
+        ),
+        "write_s": best_time(lambda: write_spec(document, io.BytesIO()), repeat),
+        "resolve_s": best_time(resolve_all, repeat),
+    }
+
+
+def main(argv: List[str]) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10, 100, 1000])
+    parser.add_argument("--servers", type=int, default=3)
+    parser.add_argument("--messages", type=int, default=2)
+    parser.add_argument("--depth", type=int, default=2)
+    parser.add_argument("--ref-density", type=float, default=0.5)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--json", action="store_true", help="print JSON results")
+    args = parser.parse_args(argv)
+
+    results = []
+    for size in args.sizes:
+        data = generate_spec(
+            servers=args.servers,
+            channels=size,
+            messages=args.messages,
+            schema_depth=args.depth,
+            ref_density=args.ref_density,
+        )
+        results.append({"channels": size, **run_case(data, args.repeat)})
+
+    if args.json:
+        print(json.dumps(results, indent=2))
+        return 0
+    columns = list(results[0])
+    print("  ".join(f"{column:>13}" for column in columns))
+    for row in results:
+        print(
+            "  ".join(
+                (
+                    f"{row[column]:>13.6f}"
+                    if isinstance(row[column], float)
+                    else f"{row[column]:>13}"
+                )
+                for column in columns
+            )
+        )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
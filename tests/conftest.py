@@ -0,0 +1,191 @@
+"""Shared fixtures for the test suite."""
+
+import copy
+
+import pytest
+
+from asyncapi_pydantics import AsyncAPI
+
+# A document using every kind of reference, tags, bindings, extensions,
+# traits and component schemas, shared by the tests of the tools built on
+# loaded documents.
+DOCUMENT = {
+    "asyncapi": "3.0.0",
+    "info": {"title": "Lights", "version": "1.0.0"},
+    "defaultContentType": "application/json",
+    "servers": {
+        "public": {
+            "host": "broker.example.com",
+            "protocol": "mqtt",
+            "security": [{"$ref": "#/components/securitySchemes/user"}],
+        },
+        "internal": {"host": "10.0.0.1", "protocol": "mqtt"},
+        "kafka": {"host": "kafka.example.com", "protocol": "kafka"},
+    },
+    "channels": {
+        "lights": {
+            "address": "lights",
+            "servers": [{"$ref": "#/servers/internal"}],
+            "tags": [{"name": "lighting"}],
+            "bindings": {"mqtt": {"qos": 1}},
+            "messages": {
+                "measured": {"$ref": "#/components/messages/measured"},
+                "dimmed": {
+                    "payload": {
+                        "type": "object",
+                        "required": ["lumens"],
+                        "properties": {
+                            "lumens": {"type": "integer", "minimum": 0},
+                            "mode": {"enum": ["auto", "manual"]},
+                        },
+                        "additionalProperties": False,
+                    }
+                },
+                "traced": {
+                    "payload": {"type": "object"},
+                    "contentType": "application/json",
+                    "traits": [
+                        {"$ref": "#/components/messageTraits/common"},
+                        {
+                            "contentType": "text/plain",
+                            "headers": {"properties": {"trace": {"type": "string"}}},
+                        },
+                    ],
+                },
+            },
+        },
+        # No servers: the channel is available on all of them.
+        "alerts": {
+            "address": "alerts",
+            "messages": {"alert": {"$ref": "#/components/messages/alert"}},
+        },
+        "audit": {
+            "address": "audit",
+            "servers": [{"$ref": "#/servers/kafka"}],
+            "x-retention": "7d",
+            "messages": {"entry": {"contentType": "text/plain", "payload": {}}},
+        },
+    },
+    "operations": {
+        "receiveLights": {
+            "action": "receive",
+            "channel": {"$ref": "#/channels/lights"},
+            "messages": [{"$ref": "#/channels/lights/messages/measured"}],
+            "security": [{"$ref": "#/components/securitySchemes/user"}],
+            "tags": [{"name": "lighting"}, {"name": "metrics"}],
+            "summary": "Receive readings.",
+            "traits": [
+                {"$ref": "#/components/operationTraits/kafka"},
+                {"summary": "Overridden.", "description": "From a trait."},
+            ],
+        },
+        "sendLights": {
+            "action": "send",
+            "channel": {"$ref": "#/channels/lights"},
+            "tags": [{"name": "lighting"}],
+        },
+        "sendAlerts": {"action": "send", "channel": {"$ref": "#/channels/alerts"}},
+        "sendAudit": {
+            "action": "send",
+            "channel": {"$ref": "#/channels/audit"},
+            "x-owner": "security",
+        },
+    },
+    "components": {
+        "messages": {
+            "measured": {
+                "tags": [{"name": "metrics"}],
+                "payload": {"$ref": "#/components/schemas/reading"},
+            },
+            "alert": {
+                "payload": {
+                    "type": "object",
+                    "properties": {"unit": {"$ref": "#/components/schemas/unit"}},
+                }
+            },
+            "tree": {
+                "name": "tree",
+                "payload": {
+                    "type": "object",
+                    "properties": {
+                        "root": {"$ref": "#/components/schemas/Node"},
+                        "meta": {"$ref": "#/components/schemas/Meta"},
+                    },
+                },
+            },
+            "ping": {
+                "name": "ping",
+                "payload": {
+                    "type": "object",
+                    "properties": {"meta": {"$ref": "#/components/schemas/Meta"}},
+                },
+            },
+        },
+        "schemas": {
+            "reading": {
+                "type": "object",
+                "properties": {
+                    "unit": {"$ref": "#/components/schemas/unit"},
+                    "previous": {"$ref": "#/components/schemas/reading"},
+                },
+            },
+            "unit": {"type": "string"},
+            "Node": {
+                "type": "object",
+                "description": "A tree node.",
+                "required": ["value"],
+                "properties": {
+                    "value": {"type": "integer", "minimum": 0},
+                    "children": {
+                        "type": "array",
+                        "items": {"$ref": "#/components/schemas/Node"},
+                    },
+                },
+            },
+            "Meta": {
+                "type": "object",
+                "properties": {
+                    "sentAt": {"type": "string", "format": "date-time"},
+                    "trace-id": {"type": "string"},
+                },
+            },
+            "Readings": {
+                "type": "array",
+                "items": {"$ref": "#/components/schemas/Node"},
+            },
+        },
+        "securitySchemes": {"user": {"type": "userPassword"}},
+        "messageTraits": {
+            "common": {
+                "name": "measurement",
+                "headers": {
+                    "type": "object",
+                    "properties": {"id": {"type": "integer"}},
+                },
+            }
+        },
+        "operationTraits": {"kafka": {"bindings": {"kafka": {"groupId": "lights"}}}},
+    },
+}
+
+
+@pytest.fixture
+def document_data():
+    """Return a fresh copy of the shared document's raw data."""
+    return copy.deepcopy(DOCUMENT)
+
+
+@pytest.fixture
+def make_document():
+    """Return a factory loading the shared document, or the given data.
+
+    Keyword arguments are passed on to ``AsyncAPI.load``. The data is
+    copied on every call, so tests may change loaded documents freely.
+    """
+
+    def make(data=None, **options):
+        return AsyncAPI.load(
+            copy.deepcopy(DOCUMENT if data is None else data), **options
+        )
+
+    return make
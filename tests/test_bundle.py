@@ -0,0 +1,136 @@
+"""Test bundling of documents that reference other files."""
+
+import json
+
+import pytest
+
+from asyncapi_pydantics import AsyncAPI
+from asyncapi_pydantics.bundle import BundleError, bundle
+from asyncapi_pydantics.streaming import load_spec
+from examples.streetlights_example import create_streetlights_example
+
+SCHEMAS = """\
+Reading:
+  type: object
+  properties:
+    lumens: {type: integer}
+    unit: {$ref: '#/Unit'}
+    next: {$ref: '#/Reading'}
+Unit:
+  type: string
+  enum: [lx, fc]
+"""
+
+API = """\
+asyncapi: 3.0.0
+info: {title: Lights, version: '1.0.0'}
+channels:
+  lights:
+    address: lights
+    messages:
+      measured: {$ref: 'common/message.json'}
+      again: {$ref: './common/message.json#'}
+      unit:
+        payload: {$ref: 'common/schemas.yaml#/Unit'}
+operations:
+  receiveLights:
+    action: receive
+    channel: {$ref: '#/channels/lights'}
+    messages: [{$ref: '#/channels/lights/messages/measured'}]
+components:
+  schemas:
+    Unit2: {type: string, enum: [lx, fc]}
+"""
+
+
+@pytest.fixture
+def api_path(tmp_path):
+    """Write a document split over three files and return the main one."""
+    pytest.importorskip("yaml")
+    (tmp_path / "common").mkdir()
+    (tmp_path / "common" / "schemas.yaml").write_text(SCHEMAS)
+    (tmp_path / "common" / "message.json").write_text(
+        json.dumps(
+            {
+                "contentType": "application/json",
+                "payload": {"$ref": "schemas.yaml#/Reading"},
+            }
+        )
+    )
+    (tmp_path / "api.yaml").write_text(API)
+    return tmp_path / "api.yaml"
+
+
+def dump(document):
+    """Return the raw data of a document."""
+    return document.model_dump(mode="json", by_alias=True, exclude_unset=True)
+
+
+def external_refs(node):
+    """Yield every reference that does not point into the document."""
+    if isinstance(node, dict):
+        ref = node.get("$ref")
+        if isinstance(ref, str) and not ref.startswith("#"):
+            yield ref
+        for value in node.values():
+            yield from external_refs(value)
+    elif isinstance(node, list):
+        for item in node:
+            yield from external_refs(item)
+
+
+def test_bundle_into_components(api_path):
+    """Test that external targets are imported once and deduplicated."""
+    bundled = bundle(load_spec(api_path), base_path=api_path)
+    data = dump(bundled)
+
+    assert not list(external_refs(data))
+    messages = data["channels"]["lights"]["messages"]
+    assert messages["measured"] == {"$ref": "#/components/messages/message"}
+    assert messages["again"] == messages["measured"]
+    # Identical to an existing component, so no copy is added.
+    assert messages["unit"]["payload"] == {"$ref": "#/components/schemas/Unit2"}
+    schemas = data["components"]["schemas"]
+    assert sorted(schemas) == ["Reading", "Unit2"]
+    assert schemas["Reading"]["properties"]["next"] == {
+        "$ref": "#/components/schemas/Reading"
+    }
+    message = bundled.resolver.resolve_message("#/channels/lights/messages/measured")
+    assert message.content_type == "application/json"
+
+
+def test_bundle_inline(api_path):
+    """Test that inlining keeps only cyclic and required references."""
+    bundled = bundle(load_spec(api_path), base_path=api_path, inline=True)
+    data = dump(bundled)
+
+    assert not list(external_refs(data))
+    measured = data["channels"]["lights"]["messages"]["measured"]
+    assert measured["contentType"] == "application/json"
+    reading = measured["payload"]
+    assert reading["properties"]["unit"] == {"type": "string", "enum": ["lx", "fc"]}
+    assert reading["properties"]["next"] == {"$ref": "#/components/schemas/Reading"}
+    assert data["components"]["schemas"]["Reading"]["type"] == "object"
+    operation = data["operations"]["receiveLights"]
+    assert operation["channel"] == {"$ref": "#/channels/lights"}
+    assert operation["messages"] == [{"$ref": "#/channels/lights/messages/measured"}]
+
+
+def test_bundle_local_document_is_unchanged():
+    """Test that a document with only local references bundles to itself."""
+    document = AsyncAPI.load(create_streetlights_example())
+    assert dump(bundle(document)) == dump(document)
+
+
+def test_bundle_errors(tmp_path):
+    """Test missing files, missing targets and remote references."""
+    base = {"asyncapi": "3.0.0", "info": {"title": "API", "version": "1.0.0"}}
+    (tmp_path / "schema.json").write_text(json.dumps({"type": "string"}))
+    for ref, match in (
+        ("missing.json", "Cannot read"),
+        ("schema.json#/nothing", "Unresolvable"),
+        ("https://example.com/schema.json", "Remote"),
+    ):
+        spec = dict(base, components={"schemas": {"s": {"$ref": ref}}})
+        with pytest.raises(BundleError, match=match):
+            bundle(AsyncAPI.load(spec), base_path=tmp_path)
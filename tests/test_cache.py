@@ -0,0 +1,110 @@
+"""Test the content-hash parse cache."""
+
+import json
+import os
+
+import pytest
+
+from asyncapi_pydantics import AsyncAPI
+from asyncapi_pydantics.cache import ParseCache
+from asyncapi_pydantics.synthetic import generate_spec
+
+
+def write_spec(path, data):
+    """Write a document as JSON and return its path."""
+    path.write_text(json.dumps(data))
+    return path
+
+
+def test_hit_rehydrates_equal_document(tmp_path):
+    """Test that a cache hit skips validation and returns an equal tree."""
+    data = generate_spec(channels=3, messages=2)
+    data["info"]["contact"] = {"url": "https://example.com/", "email": "a@b.co"}
+    data["x-owner"] = "team"
+    spec = write_spec(tmp_path / "spec.json", data)
+    cache = ParseCache(tmp_path / "cache")
+
+    first = cache.load(spec)
+    second = cache.load(spec)
+
+    assert (cache.misses, cache.hits) == (1, 1)
+    assert second is not first
+    assert second == first == AsyncAPI.model_validate(data)
+    assert second.model_fields_set == first.model_fields_set
+    assert second.info.contact.url == first.info.contact.url
+    assert second.model_dump(by_alias=True, exclude_unset=True) == first.model_dump(
+        by_alias=True, exclude_unset=True
+    )
+    assert second.resolver.resolve_channel("#/channels/channel0").address
+
+
+def test_changed_content_misses(tmp_path):
+    """Test that different content, or parsed data, get separate entries."""
+    cache = ParseCache(tmp_path / "cache")
+    spec = write_spec(tmp_path / "spec.json", generate_spec(channels=1))
+    cache.load(spec)
+    write_spec(spec, generate_spec(channels=2))
+
+    assert len(cache.load(spec).channels) == 2
+    assert cache.misses == 2
+
+    data = generate_spec(channels=1)
+    assert cache.validate(data) == cache.validate(data)
+    assert (cache.misses, cache.hits) == (3, 1)
+
+
+def test_corrupt_entry_is_a_miss(tmp_path):
+    """Test that an unreadable entry is discarded and revalidated."""
+    cache = ParseCache(tmp_path / "cache")
+    spec = write_spec(tmp_path / "spec.json", generate_spec(channels=1))
+    cache.load(spec)
+    (entry,) = os.listdir(cache.directory)
+    (tmp_path / "cache" / entry).write_bytes(b"garbage")
+
+    assert cache.load(spec).channels
+    assert cache.misses == 2
+
+
+def test_eviction_keeps_directory_under_budget(tmp_path):
+    """Test that least recently used entries are evicted over the budget."""
+    cache = ParseCache(tmp_path / "cache")
+    sizes = []
+    for count in range(1, 4):
+        cache.validate(generate_spec(channels=count, seed=count))
+        sizes.append(sum(entry.stat().st_size for entry in os.scandir(cache.directory)))
+    cache.clear()
+
+    cache.max_bytes = sizes[-1] - 1
+    for count in range(1, 4):
+        cache.validate(generate_spec(channels=count, seed=count))
+    assert len(os.listdir(cache.directory)) == 2
+    assert cache.validate(generate_spec(channels=3, seed=3))
+    assert cache.hits == 1
+
+
+def test_failed_writes_leave_no_temporary_files(tmp_path, monkeypatch):
+    """Test that a failed write is cleaned up and stale ones are swept."""
+    cache = ParseCache(tmp_path / "cache")
+    stale = tmp_path / "cache" / "abc.123.tmp"
+    stale.write_bytes(b"partial")
+    os.utime(stale, (0, 0))
+    fresh = tmp_path / "cache" / "def.456.tmp"
+    fresh.write_bytes(b"in progress")
+
+    def fail(src, dst):
+        raise OSError("disk full")
+
+    monkeypatch.setattr(os, "replace", fail)
+    with pytest.raises(OSError):
+        cache.validate(generate_spec(channels=1))
+    assert sorted(os.listdir(cache.directory)) == ["abc.123.tmp", "def.456.tmp"]
+
+    monkeypatch.undo()
+    cache.validate(generate_spec(channels=1))
+    names = os.listdir(cache.directory)
+    assert "abc.123.tmp" not in names and "def.456.tmp" in names
+    assert sum(name.endswith(".cache") for name in names) == 1
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
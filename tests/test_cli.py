@@ -0,0 +1,102 @@
+"""Test the command-line interface."""
+
+import io
+import json
+
+import pytest
+
+from asyncapi_pydantics.cli import iter_spec_files, main
+
+VALID = {"asyncapi": "3.0.0", "info": {"title": "API", "version": "1.0.0"}}
+
+
+def make_tree(tmp_path):
+    """Create a directory of valid, invalid and ignored files."""
+    (tmp_path / "services" / "a").mkdir(parents=True)
+    (tmp_path / ".git").mkdir()
+    (tmp_path / "services" / "a" / "one.json").write_text(json.dumps(VALID))
+    (tmp_path / "services" / "two.yaml").write_text(
+        "asyncapi: 3.0.0\ninfo:\n  title: API\n  version: 1.0.0\n"
+    )
+    (tmp_path / "services" / "bad.json").write_text(json.dumps({"asyncapi": "3.0.0"}))
+    (tmp_path / "services" / "broken.json").write_text("{")
+    (tmp_path / "services" / "README.md").write_text("not a spec")
+    (tmp_path / ".git" / "skip.json").write_text("{")
+    return tmp_path
+
+
+def run(argv):
+    """Run the CLI and return its exit status and output."""
+    out = io.StringIO()
+    status = main(argv, out=out)
+    return status, out.getvalue()
+
+
+def test_directories_are_walked_for_spec_files(tmp_path):
+    """Test that only spec files outside hidden directories are found."""
+    files = list(iter_spec_files([str(make_tree(tmp_path))]))
+    names = sorted(path.rsplit("/", 1)[-1] for path in files)
+    assert names == ["bad.json", "broken.json", "one.json", "two.yaml"]
+
+
+@pytest.mark.parametrize("jobs", ["1", "2"])
+def test_validate_reports_each_file_and_fails(tmp_path, jobs):
+    """Test per-file results, the summary and the exit status."""
+    pytest.importorskip("yaml")
+    status, output = run(["validate", str(make_tree(tmp_path)), "--jobs", jobs])
+
+    assert status == 1
+    lines = output.splitlines()
+    assert sum(line.startswith("ok ") for line in lines) == 2
+    assert sum(line.startswith("FAIL") for line in lines) == 2
+    assert any("info: Field required" in line for line in lines)
+    assert lines[-1].startswith("4 files, 2 failed in ")
+
+
+def test_validate_json_output_and_success(tmp_path):
+    """Test JSON lines output and a zero exit status when all files pass."""
+    spec = tmp_path / "one.json"
+    spec.write_text(json.dumps(VALID))
+    status, output = run(["validate", str(spec), "--format", "json"])
+
+    assert status == 0
+    (record,) = [json.loads(line) for line in output.splitlines()]
+    assert record["ok"] is True and record["errors"] == []
+
+    status, output = run(["validate", str(spec), "--quiet"])
+    assert status == 0 and output.startswith("1 files, 0 failed")
+
+
+def test_validate_reports_full_error_paths(tmp_path):
+    """Test that entry errors name their section and entry, all of them."""
+    pytest.importorskip("yaml")
+    spec = tmp_path / "entries.yaml"
+    spec.write_text(
+        "asyncapi: 3.0.0\n"
+        "info:\n"
+        "  title: API\n"
+        "  version: 1.0.0\n"
+        "channels:\n"
+        "  lights:\n"
+        "    address: [lights]\n"
+        "operations:\n"
+        "  onLights:\n"
+        "    channel: {$ref: '#/channels/lights'}\n"
+    )
+    status, output = run(["validate", str(spec), "--format", "json"])
+
+    assert status == 1
+    (record,) = [json.loads(line) for line in output.splitlines()]
+    assert record["errors"] == [
+        "channels.lights.address: Input should be a valid string " "(line 7, column 5)",
+        "operations.onLights.action: Field required (line 9, column 3)",
+    ]
+
+
+def test_validate_without_files(tmp_path):
+    """Test that an empty directory is a usage error."""
+    assert run(["validate", str(tmp_path)])[0] == 2
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,153 @@
+"""Test ahead-of-time generation of payload model modules."""
+
+import importlib.util
+from datetime import datetime
+
+import pytest
+from pydantic import BaseModel, ValidationError
+
+from asyncapi_pydantics import AsyncAPI
+from asyncapi_pydantics.codegen import CodegenError, generate_models, write_models
+
+
+def load_module(path):
+    """Import a generated module from a file path."""
+    spec = importlib.util.spec_from_file_location("generated_models", path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def test_generated_module_validates_payloads(tmp_path, make_document):
+    """Test that the generated module defines working models and registries."""
+    path = tmp_path / "models.py"
+    write_models(make_document(), path)
+    module = load_module(path)
+
+    assert issubclass(module.Node, BaseModel)
+    assert module.Node.__doc__ == "A tree node."
+    assert module.SCHEMAS["#/components/schemas/Meta"] is module.Meta
+    tree = module.MESSAGE_PAYLOADS["#/components/messages/tree"]
+    payload = tree.model_validate(
+        {
+            "root": {"value": 1, "children": [{"value": 2}]},
+            "meta": {"sentAt": "2024-01-01T00:00:00Z", "trace-id": "abc"},
+        }
+    )
+    assert payload.root.children[0].value == 2
+    assert isinstance(payload.meta.sentAt, datetime)
+    assert payload.model_dump(by_alias=True, exclude_unset=True)["meta"] == {
+        "sentAt": datetime.fromisoformat("2024-01-01T00:00:00+00:00"),
+        "trace-id": "abc",
+    }
+    with pytest.raises(ValidationError):
+        tree.model_validate({"root": {"value": -1}})
+
+    dimmed = module.MESSAGE_PAYLOADS["#/channels/lights/messages/dimmed"]
+    assert dimmed.model_validate({"lumens": 3, "mode": "auto"}).lumens == 3
+    for invalid in ({"lumens": 1, "mode": "off"}, {"lumens": 1, "other": 1}):
+        with pytest.raises(ValidationError):
+            dimmed.model_validate(invalid)
+    assert "#/channels/lights/messages/measured" not in module.MESSAGE_PAYLOADS
+
+
+def test_generated_source_is_deterministic(make_document):
+    """Test that generation is stable and emits aliases for non-object schemas."""
+    source = generate_models(make_document())
+
+    assert source == generate_models(make_document())
+    assert "Readings = List['Node']" in source
+    assert "trace_id: Optional[str] = Field(None, alias='trace-id')" in source
+
+
+def test_reference_aliases_follow_their_targets(tmp_path):
+    """Test that schemas aliasing later schemas import in order."""
+    doc = AsyncAPI(
+        **{
+            "asyncapi": "3.0.0",
+            "info": {"title": "Codegen API", "version": "1.0.0"},
+            "components": {
+                "schemas": {
+                    "A": {"$ref": "#/components/schemas/B"},
+                    "B": {"$ref": "#/components/schemas/C"},
+                    "C": {"type": "string"},
+                    "Holder": {
+                        "type": "object",
+                        "properties": {"a": {"$ref": "#/components/schemas/A"}},
+                    },
+                },
+            },
+        }
+    )
+    path = tmp_path / "aliases.py"
+    write_models(doc, path)
+    module = load_module(path)
+
+    assert module.A is module.B is module.C is str
+    assert module.SCHEMAS["#/components/schemas/A"] is str
+    assert module.Holder.model_validate({"a": "x"}).a == "x"
+
+    doc.components.schemas["C"] = {"$ref": "#/components/schemas/A"}
+    with pytest.raises(CodegenError):
+        generate_models(doc)
+
+
+def test_all_of_schemas_become_named_models(tmp_path):
+    """Test that top-level allOf schemas get classes under their own names."""
+    doc = AsyncAPI(
+        **{
+            "asyncapi": "3.0.0",
+            "info": {"title": "Codegen API", "version": "1.0.0"},
+            "components": {
+                "schemas": {
+                    "Base": {
+                        "type": "object",
+                        "required": ["id"],
+                        "properties": {"id": {"type": "string"}},
+                    },
+                    "Ext": {
+                        "allOf": [
+                            {"$ref": "#/components/schemas/Base"},
+                            {"properties": {"size": {"type": "integer"}}},
+                        ]
+                    },
+                    "Typed": {
+                        "type": "object",
+                        "allOf": [{"$ref": "#/components/schemas/Ext"}],
+                        "properties": {"note": {"type": "string"}},
+                    },
+                },
+            },
+        }
+    )
+    path = tmp_path / "all_of.py"
+    write_models(doc, path)
+    module = load_module(path)
+
+    for pointer, model in module.SCHEMAS.items():
+        assert isinstance(model, type) and issubclass(model, BaseModel), pointer
+    assert module.SCHEMAS["#/components/schemas/Ext"] is module.Ext
+    assert set(module.Ext.model_fields) == {"id", "size"}
+    assert set(module.Typed.model_fields) == {"id", "size", "note"}
+    assert module.Ext.model_validate({"id": "a", "size": 2}).size == 2
+    with pytest.raises(ValidationError):
+        module.Ext.model_validate({"size": 2})
+
+
+def test_external_references_are_rejected():
+    """Test that references outside components.schemas raise CodegenError."""
+    doc = AsyncAPI(
+        **{
+            "asyncapi": "3.0.0",
+            "info": {"title": "Codegen API", "version": "1.0.0"},
+            "components": {
+                "schemas": {"Remote": {"$ref": "other.yaml#/Remote"}},
+            },
+        }
+    )
+    with pytest.raises(CodegenError):
+        generate_models(doc)
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,162 @@
+"""Test structural diffs and breaking-change detection."""
+
+import copy
+import io
+import json
+
+from asyncapi_pydantics import AsyncAPI
+from asyncapi_pydantics.cli import main
+from asyncapi_pydantics.diff import diff_documents, subtree_hash
+from asyncapi_pydantics.patch import apply_patch
+from asyncapi_pydantics.synthetic import generate_spec
+
+SPEC = {
+    "asyncapi": "3.0.0",
+    "info": {"title": "Lights", "version": "1.0.0"},
+    "channels": {
+        "lights": {
+            "address": "lights/{id}",
+            "parameters": {"id": {"enum": ["a", "b"]}},
+            "messages": {"measured": {"$ref": "#/components/messages/measured"}},
+        }
+    },
+    "operations": {
+        "receiveLights": {
+            "action": "receive",
+            "channel": {"$ref": "#/channels/lights"},
+            "messages": [{"$ref": "#/channels/lights/messages/measured"}],
+        }
+    },
+    "components": {
+        "messages": {
+            "measured": {
+                "contentType": "application/json",
+                "payload": {"$ref": "#/components/schemas/reading"},
+            }
+        },
+        "schemas": {
+            "reading": {
+                "type": "object",
+                "required": ["lumens"],
+                "properties": {
+                    "lumens": {"type": "integer", "minimum": 0},
+                    "unit": {"type": "string", "enum": ["lx", "fc"]},
+                },
+            }
+        },
+    },
+}
+
+
+def changed(edit):
+    """Diff the sample spec against an edited copy of it."""
+    new = copy.deepcopy(SPEC)
+    edit(new)
+    return diff_documents(AsyncAPI.load(SPEC), AsyncAPI.load(new))
+
+
+def summary(diff):
+    """Return (path, kind, breaking) for each change."""
+    return sorted((change.path, change.kind, change.breaking) for change in diff)
+
+
+def test_identical_documents_have_no_changes():
+    """Test that equal documents, shared or not, produce an empty diff."""
+    doc = AsyncAPI.load(SPEC)
+    assert not diff_documents(doc, doc)
+    assert not diff_documents(doc, AsyncAPI.load(copy.deepcopy(SPEC)))
+    assert subtree_hash(doc) == subtree_hash(AsyncAPI.load(copy.deepcopy(SPEC)))
+
+
+def test_schema_changes_are_classified():
+    """Test breaking and compatible payload schema changes."""
+    schemas = "/components/schemas/reading"
+
+    def edit(spec):
+        reading = spec["components"]["schemas"]["reading"]
+        reading["required"].append("unit")
+        reading["properties"]["unit"]["enum"].append("cd")
+        reading["properties"]["lumens"]["minimum"] = 10
+        reading["properties"]["lumens"]["description"] = "Brightness."
+        reading["properties"]["color"] = {"type": "string"}
+
+    assert summary(changed(edit)) == [
+        (f"{schemas}/properties/color", "added", False),
+        (f"{schemas}/properties/lumens", "changed", False),
+        (f"{schemas}/properties/lumens/minimum", "changed", True),
+        (f"{schemas}/properties/unit/enum", "added", False),
+        (f"{schemas}/required", "added", True),
+    ]
+
+    def widen(spec):
+        lumens = spec["components"]["schemas"]["reading"]["properties"]["lumens"]
+        lumens["type"] = "number"
+        del lumens["minimum"]
+        spec["components"]["schemas"]["reading"]["required"] = []
+
+    diff = changed(widen)
+    assert diff and not diff.has_breaking
+
+
+def test_entity_changes_are_classified():
+    """Test added, removed and changed channels, operations and messages."""
+
+    def edit(spec):
+        spec["channels"]["lights"]["address"] = "lamps/{id}"
+        spec["channels"]["lights"]["parameters"]["id"]["enum"] = ["a"]
+        spec["channels"]["status"] = {"address": "status"}
+        spec["operations"]["receiveLights"]["action"] = "send"
+        spec["components"]["messages"]["measured"]["contentType"] = "text/plain"
+        spec["info"]["description"] = "Smart lights."
+
+    diff = changed(edit)
+    assert summary(diff) == [
+        ("/channels/lights/address", "changed", True),
+        ("/channels/lights/parameters/id/enum", "removed", True),
+        ("/channels/status", "added", False),
+        ("/components/messages/measured/contentType", "changed", True),
+        ("/info", "changed", False),
+        ("/operations/receiveLights/action", "changed", True),
+    ]
+    assert len(diff.breaking) == 4
+
+    removed = changed(lambda spec: spec["operations"].clear())
+    assert summary(removed) == [("/operations/receiveLights", "removed", True)]
+
+
+def test_patched_documents_diff_only_the_change():
+    """Test that a diff against a patched copy reports just the patch."""
+    doc = AsyncAPI.load(generate_spec(channels=50, messages=2))
+    patched = apply_patch(
+        doc,
+        [
+            {"op": "remove", "path": "/channels/channel7"},
+            {"op": "replace", "path": "/channels/channel3/address", "value": "x/y"},
+        ],
+    )
+    assert summary(diff_documents(doc, patched)) == [
+        ("/channels/channel3/address", "changed", True),
+        ("/channels/channel7", "removed", True),
+    ]
+
+
+def test_diff_command(tmp_path):
+    """Test that the CLI fails on breaking changes only."""
+    new = copy.deepcopy(SPEC)
+    new["info"]["description"] = "Smart lights."
+    paths = []
+    for name, spec in (("old", SPEC), ("new", new)):
+        path = tmp_path / f"{name}.json"
+        path.write_text(json.dumps(spec))
+        paths.append(str(path))
+
+    out = io.StringIO()
+    assert main(["diff", *paths], out=out) == 0
+    assert out.getvalue().endswith("1 changes, 0 breaking\n")
+
+    new["channels"].clear()
+    out = io.StringIO()
+    (tmp_path / "new.json").write_text(json.dumps(new))
+    assert main(["diff", "--format", "json", *paths], out=out) == 1
+    lines = [json.loads(line) for line in out.getvalue().splitlines()]
+    assert {"path": "/channels/lights", "kind": "removed"}.items() <= lines[0].items()
@@ -0,0 +1,163 @@
+"""Test Pydantic models generated from Schema Objects."""
+
+import gc
+import weakref
+from datetime import datetime
+
+import pytest
+from pydantic import BaseModel, RootModel, ValidationError
+
+from asyncapi_pydantics import Schema
+from asyncapi_pydantics.dynamic import message_model, model_factory, schema_model
+from asyncapi_pydantics.patch import apply_patch
+
+
+def test_schema_model_parses_payloads():
+    """Test a model generated from an inline Schema model."""
+    schema = Schema(
+        type="object",
+        required=["lumens"],
+        properties={
+            "lumens": {"type": "integer", "minimum": 0},
+            "mode": {"enum": ["auto", "manual"]},
+            "tags": {"type": "array", "items": {"type": "string"}},
+        },
+        additionalProperties=False,
+    )
+    model = schema_model(schema, "LightMeasured")
+
+    assert issubclass(model, BaseModel)
+    payload = model.model_validate({"lumens": 3, "mode": "auto", "tags": ["a"]})
+    assert payload.lumens == 3 and payload.tags == ["a"]
+    for invalid in ({"lumens": -1}, {"mode": "auto"}, {"lumens": 1, "other": 1}):
+        with pytest.raises(ValidationError):
+            model.model_validate(invalid)
+    assert schema_model(schema) is model
+
+
+def test_message_models_share_component_models(make_document):
+    """Test that $ref targets become shared, named nested models."""
+    doc = make_document()
+    tree = message_model(
+        doc.resolver.resolve_message("#/components/messages/tree"), doc.resolver
+    )
+    ping = message_model(
+        doc.resolver.resolve_message("#/components/messages/ping"), doc.resolver
+    )
+
+    meta = tree.model_fields["meta"].annotation.__args__[0]
+    assert meta.__name__ == "Meta"
+    assert ping.model_fields["meta"].annotation.__args__[0] is meta
+
+    payload = tree.model_validate(
+        {
+            "root": {"value": 1, "children": [{"value": 2}]},
+            "meta": {"sentAt": "2024-01-01T00:00:00Z", "trace-id": "abc"},
+        }
+    )
+    assert payload.root.children[0].value == 2
+    assert isinstance(payload.meta.sentAt, datetime)
+    assert payload.meta.trace_id == "abc"
+    assert payload.model_dump(by_alias=True)["meta"]["trace-id"] == "abc"
+    with pytest.raises(ValidationError):
+        tree.model_validate({"root": {"value": 1, "children": [{"value": -2}]}})
+
+
+def test_models_do_not_keep_documents_alive(make_document):
+    """Test that a document is freed once only its generated models remain."""
+    doc = make_document()
+    resolver = doc.resolver
+    model = message_model(
+        resolver.resolve_message("#/components/messages/tree"), resolver
+    )
+    assert model_factory(resolver) is model_factory(resolver)
+    assert model_factory() is not model_factory()
+    ref = weakref.ref(doc)
+
+    del doc, resolver
+    gc.collect()
+    assert ref() is None
+    assert model.model_validate({"root": {"value": 1}}).root.value == 1
+
+
+def test_models_follow_the_resolver_of_patched_documents(make_document):
+    """Test that a message shared by a patched document gets a fresh model."""
+    doc = make_document(
+        {
+            "asyncapi": "3.0.0",
+            "info": {"title": "Units", "version": "1.0.0"},
+            "channels": {
+                "lights": {
+                    "address": "lights",
+                    "messages": {
+                        "measured": {
+                            "payload": {
+                                "type": "object",
+                                "properties": {
+                                    "unit": {"$ref": "#/components/schemas/unit"}
+                                },
+                            }
+                        }
+                    },
+                }
+            },
+            "components": {"schemas": {"unit": {"type": "string"}}},
+        }
+    )
+    patched = apply_patch(
+        doc,
+        [
+            {
+                "op": "replace",
+                "path": "/components/schemas/unit",
+                "value": {"type": "integer"},
+            }
+        ],
+    )
+    message = doc.channels["lights"].messages["measured"]
+    assert patched.channels["lights"].messages["measured"] is message
+
+    old = message_model(message, doc.resolver)
+    new = message_model(message, patched.resolver)
+    assert message_model(message, patched.resolver) is new
+    assert old.model_validate({"unit": "lux"}).unit == "lux"
+    assert new.model_validate({"unit": 3}).unit == 3
+    with pytest.raises(ValidationError):
+        new.model_validate({"unit": "lux"})
+
+    schema = Schema(
+        type="object", properties={"unit": {"$ref": "#/components/schemas/unit"}}
+    )
+    assert schema_model(schema, resolver=doc.resolver) is not schema_model(
+        schema, resolver=patched.resolver
+    )
+
+
+def test_non_object_schemas_become_root_models():
+    """Test that scalar and array schemas become RootModels."""
+    model = schema_model({"type": "array", "items": {"type": "number"}}, "Readings")
+
+    assert issubclass(model, RootModel)
+    assert model.model_validate([1, 2.5]).root == [1, 2.5]
+    with pytest.raises(ValidationError):
+        model.model_validate(["x"])
+
+
+def test_dict_schemas_are_cached_by_content(make_document):
+    """Test that equal dict schemas share a model, with or without a resolver."""
+    resolver = make_document().resolver
+    for schema in (
+        {"type": "string"},
+        {"type": "object", "properties": {"id": {"type": "integer"}}},
+        {"$ref": "#/components/schemas/Readings"},
+    ):
+        model = schema_model(dict(schema), resolver=resolver)
+        assert schema_model(dict(schema), resolver=resolver) is model
+    assert schema_model({"type": "string"}) is schema_model({"type": "string"})
+    assert schema_model({"type": "string"}) is not schema_model(
+        {"type": "string"}, resolver=resolver
+    )
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
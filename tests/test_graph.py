@@ -0,0 +1,71 @@
+"""Test the cross-reference graph of a document."""
+
+from asyncapi_pydantics import AsyncAPI
+from asyncapi_pydantics.graph import DocumentGraph
+from asyncapi_pydantics.synthetic import generate_spec
+
+
+def test_forward_and_reverse_lookups(make_document):
+    """Test relations between operations, channels, messages and servers."""
+    graph = DocumentGraph(make_document())
+    measured = "#/components/messages/measured"
+
+    assert graph.channel_of("#/operations/receiveLights") == "#/channels/lights"
+    assert graph.operations_on_channel("#/channels/alerts") == {
+        "#/operations/sendAlerts"
+    }
+    assert graph.messages_of("#/channels/lights") == {
+        measured,
+        "#/channels/lights/messages/dimmed",
+        "#/channels/lights/messages/traced",
+    }
+    assert graph.messages_of("#/operations/receiveLights") == {measured}
+    # Operations without a message list handle every message of the channel.
+    assert graph.messages_of("#/operations/sendAlerts") == {
+        "#/components/messages/alert"
+    }
+    assert graph.servers_of("#/channels/lights") == {"#/servers/internal"}
+    assert graph.channels_on_server("#/servers/public") == {"#/channels/alerts"}
+    assert graph.channels_on_server("#/servers/internal") == {
+        "#/channels/lights",
+        "#/channels/alerts",
+    }
+    assert graph.channel_of("#/operations/missing") is None
+
+
+def test_schema_and_security_lookups(make_document):
+    """Test transitive schema use and security scheme requirements."""
+    graph = DocumentGraph(make_document())
+    unit = "#/components/schemas/unit"
+    scheme = "#/components/securitySchemes/user"
+
+    assert graph.schemas_of("#/components/messages/measured") == {
+        "#/components/schemas/reading",
+        unit,
+    }
+    assert graph.messages_using_schema(unit) == {
+        "#/components/messages/measured",
+        "#/components/messages/alert",
+    }
+    assert graph.operations_using_schema(unit) == {
+        "#/operations/receiveLights",
+        "#/operations/sendLights",
+        "#/operations/sendAlerts",
+    }
+    assert graph.operations_using_schema("#/components/schemas/reading") == {
+        "#/operations/receiveLights",
+        "#/operations/sendLights",
+    }
+    assert graph.operations_using_security(scheme) == {"#/operations/receiveLights"}
+    assert graph.servers_using_security(scheme) == {"#/servers/public"}
+
+
+def test_graph_is_built_once_per_document():
+    """Test lookups on a large generated document."""
+    doc = AsyncAPI.load(generate_spec(channels=200, messages=2, ref_density=0.5))
+    graph = DocumentGraph(doc)
+    operations = graph.operations_on_channel("#/channels/channel7")
+    assert operations == {"#/operations/operation7"}
+    for message in graph.messages_of("#/channels/channel7"):
+        for schema in graph.schemas_of(message):
+            assert operations <= graph.operations_using_schema(schema)
@@ -0,0 +1,66 @@
+"""Test that importing the package stays cheap."""
+
+import subprocess
+import sys
+import textwrap
+
+import pytest
+
+# Generous upper bound for importing the package once pydantic is loaded; a
+# regression to eager imports and model building takes several times longer.
+IMPORT_BUDGET = 0.5
+
+
+def run_python(code):
+    """Run code in a fresh interpreter and return its stripped stdout."""
+    result = subprocess.run(
+        [sys.executable, "-c", textwrap.dedent(code)],
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    return result.stdout.strip()
+
+
+def test_package_import_loads_no_submodules():
+    """Test that submodules are only imported when their names are used."""
+    output = run_python(
+        """
+        import sys
+        import asyncapi_pydantics
+        print(sorted(m for m in sys.modules if m.startswith("asyncapi_pydantics.")))
+        from asyncapi_pydantics import Info
+        print("asyncapi_pydantics.schema" in sys.modules)
+        print(Info.__pydantic_complete__)
+        Info(title="API", version="1.0.0")
+        print(Info.__pydantic_complete__)
+        """
+    )
+    assert output.splitlines() == ["[]", "False", "False", "True"]
+
+
+def test_unknown_attribute_raises():
+    """Test that missing package attributes raise AttributeError."""
+    import asyncapi_pydantics
+
+    with pytest.raises(AttributeError):
+        asyncapi_pydantics.NotAModel
+    assert "AsyncAPI" in dir(asyncapi_pydantics)
+
+
+def test_import_time_budget():
+    """Test that importing the root model stays within the time budget."""
+    output = run_python(
+        """
+        import time
+        import pydantic
+        start = time.perf_counter()
+        from asyncapi_pydantics import AsyncAPI
+        print(time.perf_counter() - start)
+        """
+    )
+    assert float(output) < IMPORT_BUDGET
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,115 @@
+"""Test sharing of identical subtrees of loaded documents."""
+
+import copy
+import gc
+import weakref
+
+from asyncapi_pydantics import AsyncAPI, Schema
+from asyncapi_pydantics.interning import Interner, intern_document
+
+ENVELOPE = {
+    "type": "object",
+    "properties": {
+        "id": {"type": "string", "format": "uuid"},
+        "sentAt": {"type": "string", "format": "date-time"},
+    },
+    "required": ["id", "sentAt"],
+}
+
+
+def make_data():
+    """Build a document repeating the same fragments in every channel."""
+    tag = {"name": "fleet", "externalDocs": {"url": "https://example.com/fleet"}}
+    return {
+        "asyncapi": "3.0.0",
+        "info": {"title": "Fleet", "version": "1.0.0"},
+        "channels": {
+            name: {
+                "address": name,
+                "tags": [copy.deepcopy(tag)],
+                "messages": {
+                    "event": {
+                        "payload": copy.deepcopy(ENVELOPE),
+                        "headers": {"type": "object", "x-zero": -0.0},
+                    }
+                },
+            }
+            for name in ("trucks", "vans", "bikes")
+        },
+    }
+
+
+def test_intern_document_shares_identical_subtrees():
+    """Test that repeated fragments become one instance without changing data."""
+    doc = AsyncAPI.load(make_data())
+    assert intern_document(doc) > 0
+    assert doc == AsyncAPI.load(make_data())
+
+    messages = [channel.messages["event"] for channel in doc.channels.values()]
+    tags = [channel.tags[0] for channel in doc.channels.values()]
+    assert all(message.payload is messages[0].payload for message in messages)
+    assert messages[0].payload["properties"]["id"] == {
+        "type": "string",
+        "format": "uuid",
+    }
+    assert all(tag is tags[0] for tag in tags)
+    assert tags[0].external_docs.url == "https://example.com/fleet"
+    assert str(messages[0].headers["x-zero"]) == "-0.0"
+
+    plain = AsyncAPI.load(make_data())
+    assert plain.channels["trucks"].tags[0] is not plain.channels["vans"].tags[0]
+
+
+def test_intern_document_does_not_keep_the_interner():
+    """Test that nothing in the document refers to the interner afterwards."""
+    doc = AsyncAPI.load(make_data(), lazy=True)
+    interner = Interner()
+    ref = weakref.ref(interner)
+    interner.data(doc)
+    del interner
+    gc.collect()
+    assert ref() is None
+    assert doc.channels["trucks"].tags[0].name == "fleet"
+
+
+def test_intern_document_keeps_lazy_entries_deferred():
+    """Test that interning a lazy document shares raw entries without validating."""
+    doc = AsyncAPI.load(make_data(), lazy=True)
+    intern_document(doc)
+    raw = [dict.__getitem__(doc.channels, name) for name in doc.channels]
+    assert all(isinstance(entry, dict) for entry in raw)
+    assert (
+        raw[0]["messages"]["event"]["payload"] is raw[1]["messages"]["event"]["payload"]
+    )
+    assert doc.channels["vans"].messages["event"].payload == ENVELOPE
+
+
+def test_intern_lazy_document_matches_eager_load(make_document):
+    """Test that a lazy document loads the same entries after interning."""
+    doc = make_document(lazy=True)
+    intern_document(doc)
+    assert not any(doc.channels.is_loaded(key) for key in dict.keys(doc.channels))
+
+    eager = make_document()
+    assert intern_document(eager) > 0
+    assert doc.channels["lights"] == eager.channels["lights"]
+    assert doc.operations == eager.operations
+    assert doc == eager
+
+
+def test_interner_canonicalizes_data_and_schemas():
+    """Test raw data and Schema objects through one interner."""
+    interner = Interner()
+    first = interner.data({"a": [1, {"b": 1.0}], "c": True})
+    second = interner.data({"a": [1, {"b": 1.0}], "c": True})
+    assert second is first
+    assert interner.data({"a": [1, {"b": 1}], "c": 1}) is not first
+    assert interner.data({"b": 1.0}) is first["a"][1]
+    assert interner.hits == 4
+
+    schemas = [
+        interner.data(Schema.model_validate(copy.deepcopy(ENVELOPE))) for _ in range(3)
+    ]
+    assert all(schema is schemas[0] for schema in schemas)
+    assert schemas[0].properties["id"].format == "uuid"
+    assert Schema.model_validate(ENVELOPE) is not schemas[0]
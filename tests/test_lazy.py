@@ -0,0 +1,119 @@
+"""Test the lazy load mode of AsyncAPI documents."""
+
+import copy
+import pickle
+
+import pytest
+from pydantic import ValidationError
+
+from asyncapi_pydantics import AsyncAPI, Channel, Message, Operation
+from asyncapi_pydantics.lazy import LazyModelDict
+
+
+def make_document_data():
+    """Build raw document data with a few channels and operations."""
+    return {
+        "asyncapi": "3.0.0",
+        "info": {"title": "Lazy API", "version": "1.0.0"},
+        "channels": {
+            f"channel{i}": {
+                "address": f"devices/{i}/events",
+                "messages": {"event": {"$ref": "#/components/messages/event"}},
+            }
+            for i in range(3)
+        },
+        "operations": {
+            "onEvent": {"action": "receive", "channel": {"$ref": "#/channels/channel1"}}
+        },
+        "components": {"messages": {"event": {"name": "event"}}},
+    }
+
+
+def test_lazy_entries_validate_on_access():
+    """Test that entries stay raw until they are accessed."""
+    doc = AsyncAPI.load(make_document_data(), lazy=True)
+
+    assert isinstance(doc.channels, LazyModelDict)
+    assert not doc.channels.is_loaded("channel0")
+
+    channel = doc.channels["channel0"]
+    assert isinstance(channel, Channel)
+    assert doc.channels.is_loaded("channel0")
+    assert not doc.channels.is_loaded("channel1")
+    assert doc.channels["channel0"] is channel
+    assert isinstance(doc.operations.get("onEvent"), Operation)
+
+
+def test_lazy_document_matches_eager_document():
+    """Test that a lazy document is equal to and dumps like an eager one."""
+    data = make_document_data()
+    eager = AsyncAPI(**data)
+    lazy = AsyncAPI.load(data, lazy=True)
+
+    assert lazy.model_dump(by_alias=True) == eager.model_dump(by_alias=True)
+    assert lazy == eager
+    assert all(isinstance(c, Channel) for c in lazy.channels.values())
+
+
+def test_lazy_resolution_only_loads_target():
+    """Test that resolving a reference only validates the entries it reaches."""
+    doc = AsyncAPI.load(make_document_data(), lazy=True)
+
+    channel = doc.resolver.resolve_channel("#/channels/channel1")
+    assert channel is doc.channels["channel1"]
+    assert not doc.channels.is_loaded("channel2")
+    message = doc.resolver.deref(channel.messages["event"], Message)
+    assert message.name == "event"
+
+
+def test_lazy_validation_errors_surface_on_access():
+    """Test that invalid entries raise when they are accessed."""
+    data = make_document_data()
+    data["operations"]["broken"] = {"action": "publish", "channel": {}}
+    doc = AsyncAPI.load(data, lazy=True)
+
+    assert doc.operations["onEvent"].action == "receive"
+    with pytest.raises(ValidationError):
+        doc.operations["broken"]
+
+
+@pytest.mark.parametrize(
+    "convert",
+    [
+        dict,
+        lambda d: {**d},
+        lambda d: dict(**d),
+        lambda d: d | {},
+        lambda d: {} | d,
+        copy.copy,
+        copy.deepcopy,
+        lambda d: pickle.loads(pickle.dumps(d)),
+    ],
+    ids=["dict", "unpack", "kwargs", "or", "ror", "copy", "deepcopy", "pickle"],
+)
+def test_lazy_copies_hold_models(convert):
+    """Test that copying a lazy section yields models, never raw entries."""
+    doc = AsyncAPI.load(make_document_data(), lazy=True)
+
+    copied = convert(doc.channels)
+
+    assert list(copied) == ["channel0", "channel1", "channel2"]
+    assert all(isinstance(copied[name], Channel) for name in copied)
+    assert all(isinstance(value, Channel) for value in dict.values(copied))
+
+
+def test_lazy_copy_stays_deferred():
+    """Test that a shallow copy keeps unvalidated entries deferred."""
+    doc = AsyncAPI.load(make_document_data(), lazy=True)
+    first = doc.channels["channel1"]
+
+    copied = doc.channels.copy()
+
+    assert isinstance(copied, LazyModelDict)
+    assert copied["channel1"] is first
+    assert not copied.is_loaded("channel2")
+    assert isinstance(copied["channel2"], Channel)
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,121 @@
+"""Test lean documents."""
+
+from asyncapi_pydantics import AsyncAPI
+from asyncapi_pydantics.lean import LeanProfile, strip_document, strip_schema
+
+
+def make_data():
+    """Build a document with documentation and extensions on every level."""
+    return {
+        "asyncapi": "3.0.0",
+        "info": {
+            "title": "Lights",
+            "version": "1.0.0",
+            "description": "# Lights\n\nLong prose.",
+            "tags": [{"name": "iot", "description": "Devices"}],
+            "x-audience": "internal",
+        },
+        "channels": {
+            "lights": {
+                "address": "lights",
+                "title": "Lights",
+                "description": "Readings.",
+                "externalDocs": {"url": "https://example.com/lights"},
+                "x-retention": "7d",
+                "messages": {
+                    "measured": {
+                        "summary": "A reading.",
+                        "examples": [{"payload": {"lumens": 3}}],
+                        "payload": {
+                            "type": "object",
+                            "title": "Reading",
+                            "properties": {
+                                "title": {"type": "string", "description": "Name"},
+                                "lumens": {"type": "integer", "examples": [3]},
+                            },
+                            "items": [{"description": "First"}],
+                            "default": {"description": "kept"},
+                        },
+                    }
+                },
+            }
+        },
+        "operations": {
+            "onLights": {
+                "action": "receive",
+                "channel": {"$ref": "#/channels/lights"},
+                "summary": "Receive readings.",
+                "x-owner": "team",
+            }
+        },
+        "components": {
+            "schemas": {"reading": {"title": "Reading", "type": "object"}},
+            "messages": {"raw": {"description": "Raw", "payload": {"title": "T"}}},
+            "securitySchemes": {"key": {"type": "apiKey", "description": "Kept"}},
+        },
+    }
+
+
+def test_strip_document_drops_documentation():
+    """Test that prose is dropped at every level while data is kept."""
+    data = make_data()
+    doc = AsyncAPI.load(strip_document(data))
+    assert data == make_data()
+
+    assert doc.info.title == "Lights"
+    assert doc.info.description is None
+    assert doc.info.tags[0].name == "iot" and doc.info.tags[0].description is None
+    assert doc.info.model_extra == {"x-audience": "internal"}
+
+    channel = doc.channels["lights"]
+    assert channel.title is None and channel.external_docs is None
+    message = channel.messages["measured"]
+    assert message.summary is None and message.examples is None
+    assert message.payload == {
+        "type": "object",
+        "properties": {"title": {"type": "string"}, "lumens": {"type": "integer"}},
+        "items": [{}],
+        "default": {"description": "kept"},
+    }
+    assert doc.operations["onLights"].summary is None
+
+    components = doc.components
+    assert components.schemas == {"reading": {"type": "object"}}
+    assert components.messages == {"raw": {"payload": {}}}
+    assert components.security_schemes["key"]["description"] == "Kept"
+
+    full = AsyncAPI.load(make_data())
+    assert full.channels["lights"].messages["measured"].summary == "A reading."
+
+
+def test_strip_extensions():
+    """Test dropping extensions with and without documentation."""
+    doc = AsyncAPI.load(
+        strip_document(make_data(), documentation=False, extensions=True)
+    )
+    assert doc.info.model_extra == {}
+    assert doc.channels["lights"].model_extra == {}
+    assert doc.operations["onLights"].model_extra == {}
+    assert doc.channels["lights"].description == "Readings."
+
+    lean = AsyncAPI.load(strip_document(make_data(), extensions=True), lazy=True)
+    assert lean.channels["lights"].model_extra == {}
+    assert lean.channels["lights"].description is None
+
+    schema = strip_schema(
+        {"type": "string", "title": "Name", "x-kind": "id"},
+        LeanProfile(extensions=True),
+    )
+    assert schema == {"type": "string"}
+
+
+def test_strip_document_keeps_extensions_by_default(document_data, make_document):
+    """Test that only prose is dropped unless extensions are asked for."""
+    doc = make_document(strip_document(document_data))
+    assert doc.channels["audit"].model_extra == {"x-retention": "7d"}
+    assert doc.operations["sendAudit"].model_extra == {"x-owner": "security"}
+    assert doc.operations["receiveLights"].summary is None
+    node = doc.components.schemas["Node"]
+    assert "description" not in node and node["required"] == ["value"]
+    # The input is left alone.
+    assert "summary" in document_data["operations"]["receiveLights"]
@@ -0,0 +1,125 @@
+"""Test incremental re-validation from JSON Patch operations."""
+
+import pytest
+from pydantic import ValidationError
+
+from asyncapi_pydantics import AsyncAPI
+from asyncapi_pydantics.lazy import LazyModelDict
+from asyncapi_pydantics.patch import PatchError, apply_patch
+from asyncapi_pydantics.synthetic import generate_spec
+
+# A generated document with a few channels.
+SPEC = generate_spec(channels=3, messages=2, ref_density=0.5)
+
+
+def test_patch_shares_untouched_submodels(make_document):
+    """Test that only models on the patched path are rebuilt."""
+    doc = make_document(SPEC)
+    patched = apply_patch(
+        doc,
+        [
+            {"op": "replace", "path": "/channels/channel1/description", "value": "New"},
+            {"op": "add", "path": "/info/x-team", "value": "lighting"},
+        ],
+    )
+
+    assert patched.channels["channel1"].description == "New"
+    assert doc.channels["channel1"].description == "Synthetic channel 1."
+    assert patched.channels["channel1"] is not doc.channels["channel1"]
+    assert patched.channels["channel0"] is doc.channels["channel0"]
+    assert patched.operations is not doc.operations
+    assert patched.operations["operation0"] is doc.operations["operation0"]
+    assert patched.servers["server0"] is doc.servers["server0"]
+    assert patched.channels["channel1"].parameters["deviceId"] is (
+        doc.channels["channel1"].parameters["deviceId"]
+    )
+    assert patched.info.model_extra == {"x-team": "lighting"}
+    assert patched.model_dump(by_alias=True, exclude_unset=True) == AsyncAPI.load(
+        patched.model_dump(by_alias=True, exclude_unset=True)
+    ).model_dump(by_alias=True, exclude_unset=True)
+
+
+def test_patch_operations(make_document):
+    """Test add, remove, move, copy and test operations on arrays and maps."""
+    doc = make_document(SPEC)
+    patched = apply_patch(
+        doc,
+        [
+            {"op": "test", "path": "/operations/operation0/action", "value": "receive"},
+            {
+                "op": "add",
+                "path": "/operations/operation0/messages/0",
+                "value": {"$ref": "#/channels/channel0/messages/message1"},
+            },
+            {"op": "remove", "path": "/operations/operation0/messages/2"},
+            {"op": "copy", "from": "/channels/channel0", "path": "/channels/copy"},
+            {"op": "move", "from": "/servers/server0", "path": "/servers/primary"},
+            {"op": "remove", "path": "/channels/channel2"},
+        ],
+    )
+
+    assert [ref["$ref"] for ref in patched.operations["operation0"].messages] == [
+        "#/channels/channel0/messages/message1",
+        "#/channels/channel0/messages/message0",
+    ]
+    assert patched.channels["copy"] == doc.channels["channel0"]
+    assert patched.channels["copy"] is not doc.channels["channel0"]
+    assert list(patched.servers) == ["primary"]
+    assert "channel2" not in patched.channels and "channel2" in doc.channels
+
+
+@pytest.mark.parametrize(
+    "operation",
+    [
+        {"op": "test", "path": "/info/title", "value": "Other"},
+        {"op": "remove", "path": "/channels/missing"},
+        {"op": "replace", "path": "/channels/channel0/messages/x/payload", "value": 1},
+        {"op": "add", "path": "/operations/operation0/messages/9", "value": {}},
+        {"op": "move", "from": "/channels", "path": "/channels/inner"},
+        {"op": "frobnicate", "path": "/info"},
+        {"op": "add", "path": "info", "value": {}},
+    ],
+)
+def test_invalid_operations_raise(operation, make_document):
+    """Test that operations which cannot be applied raise PatchError."""
+    with pytest.raises(PatchError):
+        apply_patch(make_document(SPEC), [operation])
+
+
+def test_invalid_result_raises_validation_error(make_document):
+    """Test that the patched subtree is validated."""
+    doc = make_document(SPEC)
+    with pytest.raises(ValidationError):
+        apply_patch(doc, [{"op": "remove", "path": "/info/title"}])
+    with pytest.raises(ValidationError):
+        apply_patch(
+            doc, [{"op": "replace", "path": "/channels/channel0/address", "value": 5}]
+        )
+
+
+def test_patch_keeps_lazy_sections_lazy(make_document):
+    """Test that patching a lazy document only validates the patched entries."""
+    doc = make_document(SPEC, lazy=True)
+    patched = apply_patch(
+        doc,
+        [
+            {"op": "replace", "path": "/channels/channel1/description", "value": "New"},
+            {"op": "add", "path": "/channels/extra", "value": {"address": "extra"}},
+        ],
+    )
+
+    assert isinstance(patched.channels, LazyModelDict)
+    assert not doc.channels.is_loaded("channel0")
+    assert not patched.channels.is_loaded("channel0")
+    assert patched.channels.is_loaded("channel1")
+    assert patched.channels.is_loaded("extra")
+    assert patched.channels["channel1"].description == "New"
+    assert patched.channels["channel0"] == doc.channels["channel0"]
+    assert "extra" not in doc.channels
+
+    with pytest.raises(ValidationError):
+        apply_patch(doc, [{"op": "add", "path": "/channels/bad", "value": []}])
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,92 @@
+"""Test indexed queries over documents."""
+
+from asyncapi_pydantics.query import DocumentIndex
+from asyncapi_pydantics.tag import Tag
+
+
+def test_queries_combine_criteria(make_document):
+    """Test own and related criteria for each kind of object."""
+    query = DocumentIndex(make_document())
+
+    assert list(query.operations(tag="lighting")) == [
+        "#/operations/receiveLights",
+        "#/operations/sendLights",
+    ]
+    assert list(query.operations(tag="lighting", action="send")) == [
+        "#/operations/sendLights"
+    ]
+    # Channels without servers are available on every protocol.
+    assert list(query.operations(protocol="kafka")) == [
+        "#/operations/sendAlerts",
+        "#/operations/sendAudit",
+    ]
+    assert list(query.operations(extension="x-owner")) == ["#/operations/sendAudit"]
+    assert list(query.channels(action="send")) == [
+        "#/channels/lights",
+        "#/channels/alerts",
+        "#/channels/audit",
+    ]
+    assert list(query.channels(binding="mqtt")) == ["#/channels/lights"]
+    assert list(query.channels(content_type="text/plain")) == ["#/channels/audit"]
+    assert list(query.channels(extension="x-retention")) == ["#/channels/audit"]
+
+    messages = query.messages(protocol="mqtt", content_type="application/json")
+    assert list(messages) == [
+        "#/components/messages/measured",
+        "#/channels/lights/messages/dimmed",
+        "#/channels/lights/messages/traced",
+        "#/components/messages/alert",
+    ]
+    assert messages["#/components/messages/measured"].tags[0].name == "metrics"
+    assert list(query.messages(tag="metrics")) == ["#/components/messages/measured"]
+    assert list(query.messages(content_type="text/plain")) == [
+        "#/channels/audit/messages/entry"
+    ]
+    assert query.operations(tag="lighting", protocol="kafka") == {}
+    assert len(query.operations()) == 4
+
+
+def test_indexes_are_lazy_and_invalidated(make_document):
+    """Test that indexes are built on demand and only dropped on request."""
+    doc = make_document()
+    query = DocumentIndex(doc)
+    assert not query._indexes
+    query.operations(action="send")
+    assert list(query._indexes) == ["action:operations"]
+
+    # Replacing an entry keeps the section's identity and size.
+    doc.operations["sendAudit"] = doc.operations["sendAudit"].model_copy(
+        update={"action": "receive"}
+    )
+    assert list(query.channels(action="receive")) == ["#/channels/lights"]
+    query.invalidate()
+    assert not query._indexes
+    assert list(query.channels(action="receive")) == [
+        "#/channels/lights",
+        "#/channels/audit",
+    ]
+
+    doc.operations["receiveAudit"] = doc.operations["sendAudit"]
+    assert len(query.operations(action="receive")) == 2
+    query.invalidate()
+    assert len(query.operations(action="receive")) == 3
+
+
+def test_queries_after_mutating_a_lazy_document(make_document):
+    """Test queries on a lazy document changed in place and then invalidated."""
+    doc = make_document(lazy=True)
+    query = DocumentIndex(doc)
+    assert list(query.channels(tag="lighting")) == ["#/channels/lights"]
+
+    doc.channels["audit"].tags = [Tag(name="lighting")]
+    del doc.operations["sendAudit"]
+    query.invalidate()
+    assert list(query.channels(tag="lighting")) == [
+        "#/channels/lights",
+        "#/channels/audit",
+    ]
+    assert query.operations(extension="x-owner") == {}
+    assert list(query.channels(action="send")) == [
+        "#/channels/lights",
+        "#/channels/alerts",
+    ]
@@ -0,0 +1,103 @@
+"""Test $ref resolution over AsyncAPI documents."""
+
+import pytest
+from asyncapi_pydantics import (
+    Channel,
+    Message,
+    Schema,
+    RefResolutionError,
+    RefCycleError,
+)
+
+# A small document that uses references throughout.
+REFS = {
+    "asyncapi": "3.0.0",
+    "info": {"title": "Ref API", "version": "1.0.0"},
+    "channels": {
+        "user/events": {
+            "address": "user/events",
+            "messages": {"signedUp": {"$ref": "#/components/messages/signedUp"}},
+        }
+    },
+    "operations": {
+        "onSignup": {
+            "action": "receive",
+            "channel": {"$ref": "#/channels/user~1events"},
+            "messages": [{"$ref": "#/channels/user~1events/messages/signedUp"}],
+        }
+    },
+    "components": {
+        "messages": {
+            "signedUp": {
+                "name": "signedUp",
+                "payload": {"$ref": "#/components/schemas/User"},
+            },
+            "alias": {"$ref": "#/components/messages/signedUp"},
+            "loopA": {"$ref": "#/components/messages/loopB"},
+            "loopB": {"$ref": "#/components/messages/loopA"},
+        },
+        "schemas": {
+            "User": {
+                "type": "object",
+                "properties": {"id": {"type": "string"}},
+            }
+        },
+    },
+}
+
+
+def test_resolve_typed_objects(make_document):
+    """Test that references resolve to typed models."""
+    doc = make_document(REFS)
+
+    channel = doc.resolver.resolve_channel("#/channels/user~1events")
+    assert isinstance(channel, Channel)
+    assert channel.address == "user/events"
+
+    message = doc.resolver.resolve_message("#/components/messages/signedUp")
+    assert isinstance(message, Message)
+    assert message.name == "signedUp"
+
+    schema = doc.resolve(message.payload["$ref"], Schema)
+    assert isinstance(schema, Schema)
+    assert schema.type == "object"
+
+
+def test_resolve_follows_chains_and_memoizes(make_document):
+    """Test that chained references are followed and results cached."""
+    doc = make_document(REFS)
+
+    ref = doc.operations["onSignup"].messages[0]["$ref"]
+    first = doc.resolver.resolve_message(ref)
+    assert first.name == "signedUp"
+    assert doc.resolver.resolve_message(ref) is first
+    assert doc.resolver.resolve_message("#/components/messages/alias").name == (
+        "signedUp"
+    )
+
+
+def test_deref_inline_and_reference(make_document):
+    """Test deref on inline objects and references."""
+    doc = make_document(REFS)
+    operation = doc.operations["onSignup"]
+
+    channel = doc.resolver.deref(operation.channel, Channel)
+    assert channel is doc.channels["user/events"]
+    inline = Message(name="inline")
+    assert doc.resolver.deref(inline, Message) is inline
+
+
+def test_resolve_errors(make_document):
+    """Test unresolvable and cyclic references."""
+    doc = make_document(REFS)
+
+    with pytest.raises(RefResolutionError):
+        doc.resolve("#/components/messages/missing")
+    with pytest.raises(RefResolutionError):
+        doc.resolve("other.yaml#/components/messages/signedUp")
+    with pytest.raises(RefCycleError):
+        doc.resolve("#/components/messages/loopA")
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,212 @@
+"""Test routing concrete addresses to channels."""
+
+import pytest
+
+from asyncapi_pydantics import AsyncAPI, Channel
+from asyncapi_pydantics.channel import Parameter
+from asyncapi_pydantics.routing import (
+    AddressFormatter,
+    ChannelParameters,
+    ChannelRouter,
+    ParameterError,
+)
+from asyncapi_pydantics.resolver import RefResolutionError
+
+# A document with overlapping channel address templates.
+ROUTES = {
+    "asyncapi": "3.0.0",
+    "info": {"title": "Streetlights API", "version": "1.0.0"},
+    "channels": {
+        "lightingMeasured": {
+            "address": "smartylighting/streetlights/1/0/event/"
+            "{streetlightId}/lighting/measured"
+        },
+        "turnOn": {
+            "address": "smartylighting/streetlights/1/0/action/"
+            "{streetlightId}/turn/on"
+        },
+        "broadcast": {"address": "smartylighting/streetlights/1/0/action/all/turn/on"},
+        "zone": {"address": "zones/zone-{zoneId}.{floor}/status"},
+        "dynamic": {"address": None},
+    },
+}
+
+
+def test_match_extracts_parameters(make_document):
+    """Test matching an address and extracting parameter values."""
+    router = ChannelRouter.from_document(make_document(ROUTES))
+
+    match = router.match(
+        "smartylighting/streetlights/1/0/event/lamp-7/lighting/measured"
+    )
+    assert match.channel_id == "lightingMeasured"
+    assert match.params == {"streetlightId": "lamp-7"}
+    assert match.channel.address.endswith("/lighting/measured")
+    assert len(router) == 4
+
+
+def test_literal_segments_take_precedence(make_document):
+    """Test that literal segments win over parameters."""
+    router = ChannelRouter.from_document(make_document(ROUTES))
+
+    match = router.match("smartylighting/streetlights/1/0/action/all/turn/on")
+    assert (match.channel_id, match.params) == ("broadcast", {})
+    match = router.match("smartylighting/streetlights/1/0/action/12/turn/on")
+    assert (match.channel_id, match.params) == ("turnOn", {"streetlightId": "12"})
+
+
+def test_mixed_segments_and_misses(make_document):
+    """Test segments that mix literal text and parameters, and non-matches."""
+    router = ChannelRouter.from_document(make_document(ROUTES))
+
+    match = router.match("zones/zone-north.3/status")
+    assert match.channel_id == "zone"
+    assert match.params == {"zoneId": "north", "floor": "3"}
+    assert router.match("zones/area-north/status") is None
+    assert (
+        router.match("smartylighting/streetlights/1/0/event//lighting/measured") is None
+    )
+    assert router.match("smartylighting/streetlights/1/0/event/7/lighting") is None
+
+
+def test_custom_separator():
+    """Test routing dot-separated (Kafka style) addresses."""
+    channel = Channel(address="streetlights.{streetlightId}.lighting")
+    router = ChannelRouter({"kafka": channel}, separator=".")
+
+    assert router.match("streetlights.5.lighting").params == {"streetlightId": "5"}
+
+
+def test_address_formatter():
+    """Test building addresses with defaults and enum checks."""
+    channel = Channel(
+        address="zones/zone-{zoneId}.{floor}/status",
+        parameters={
+            "zoneId": {"enum": ["north", "south"]},
+            "floor": {"default": "0"},
+        },
+    )
+    formatter = AddressFormatter.for_channel(channel)
+
+    assert formatter.parameter_names == ("zoneId", "floor")
+    assert (
+        formatter.format({"zoneId": "north", "floor": 3}) == "zones/zone-north.3/status"
+    )
+    assert formatter.format(zoneId="south") == "zones/zone-south.0/status"
+    assert formatter.format_many([{"zoneId": "north"}, {"zoneId": "south"}]) == [
+        "zones/zone-north.0/status",
+        "zones/zone-south.0/status",
+    ]
+    with pytest.raises(ParameterError):
+        formatter.format(zoneId="east")
+    with pytest.raises(ParameterError):
+        AddressFormatter(Channel(address="a/{b}")).format()
+    assert AddressFormatter.for_channel(channel) is formatter
+
+
+def test_formatter_resolves_parameter_refs():
+    """Test that referenced parameters are checked, given the resolver."""
+    document = AsyncAPI(
+        **{
+            "asyncapi": "3.0.0",
+            "info": {"title": "Devices API", "version": "1.0.0"},
+            "channels": {
+                "device": {
+                    "address": "devices/{id}",
+                    "parameters": {"id": {"$ref": "#/components/parameters/id"}},
+                }
+            },
+            "components": {"parameters": {"id": {"enum": ["x"]}}},
+        }
+    )
+    channel = document.channels["device"]
+
+    with pytest.raises(RefResolutionError):
+        AddressFormatter.for_channel(channel)
+    formatter = AddressFormatter.for_channel(channel, document.resolver)
+    assert formatter.format(id="x") == "devices/x"
+    with pytest.raises(ParameterError):
+        formatter.format(id="zzz")
+    assert AddressFormatter.for_channel(channel, document.resolver) is formatter
+
+
+def test_formatter_round_trips_with_router(make_document):
+    """Test that formatted addresses route back to their channel."""
+    document = make_document(ROUTES)
+    router = ChannelRouter.from_document(document)
+    formatter = AddressFormatter(document.channels["zone"], "zone")
+
+    address = formatter.format(zoneId="west", floor="2")
+    assert router.match(address).params == {"zoneId": "west", "floor": "2"}
+
+
+def test_channel_parameters():
+    """Test compiled parameter constraints, individually and in bulk."""
+    channel = Channel(
+        address="rooms/{room}/{sensor}",
+        parameters={
+            "room": {"enum": ["kitchen", "hall"], "default": "hall"},
+            "sensor": {"description": "Any sensor"},
+        },
+    )
+    parameters = ChannelParameters.for_channel(channel)
+
+    assert parameters.enums == {"room": frozenset({"kitchen", "hall"})}
+    assert parameters.is_valid({"room": "kitchen", "sensor": "t1"})
+    assert not parameters.is_valid({"room": "garage"})
+    assert isinstance(parameters.error({"room": "garage"}), ParameterError)
+    assert parameters.validate_many(
+        [{"room": "hall"}, {"room": "attic"}, {"sensor": "x"}]
+    ) == [True, False, True]
+    assert parameters.fill({"sensor": 4}, ["room", "sensor"]) == {
+        "room": "hall",
+        "sensor": "4",
+    }
+    with pytest.raises(ParameterError):
+        parameters.fill({}, ["sensor"])
+    assert ChannelParameters.for_channel(channel) is parameters
+
+
+def test_channel_parameters_resolve_refs():
+    """Test that referenced parameters are compiled through the resolver."""
+    document = AsyncAPI(
+        **{
+            "asyncapi": "3.0.0",
+            "info": {"title": "Rooms API", "version": "1.0.0"},
+            "channels": {
+                "room": {
+                    "address": "rooms/{room}",
+                    "parameters": {"room": {"$ref": "#/components/parameters/room"}},
+                }
+            },
+            "components": {
+                "parameters": {"room": {"enum": ["kitchen", "hall"], "default": "hall"}}
+            },
+        }
+    )
+    channel = document.channels["room"]
+
+    with pytest.raises(RefResolutionError):
+        ChannelParameters.for_channel(channel)
+    parameters = ChannelParameters.for_channel(channel, document.resolver)
+    assert parameters.enums == {"room": frozenset({"kitchen", "hall"})}
+    assert parameters.fill({}, ["room"]) == {"room": "hall"}
+    assert not parameters.is_valid({"room": "attic"})
+    assert ChannelParameters.for_channel(channel, document.resolver) is parameters
+
+
+def test_router_rejects_disallowed_parameters(make_document):
+    """Test that routers checking parameters reject disallowed values."""
+    document = make_document(ROUTES)
+    document.channels["zone"].parameters = {"zoneId": Parameter(enum=["north"])}
+
+    checking = ChannelRouter.from_document(document, check_parameters=True)
+    lenient = ChannelRouter.from_document(document)
+    addresses = ["zones/zone-north.1/status", "zones/zone-east.1/status"]
+
+    assert [m is not None for m in checking.match_many(addresses)] == [True, False]
+    assert [m is not None for m in lenient.match_many(addresses)] == [True, True]
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
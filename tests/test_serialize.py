@@ -0,0 +1,54 @@
+"""Test JSON and YAML output of documents."""
+
+import io
+import json
+
+import pytest
+
+from asyncapi_pydantics.serialize import dump_json, iter_json, write_spec
+from asyncapi_pydantics.streaming import load_spec
+
+
+def test_json_output_matches_pydantic(make_document):
+    """Test that streamed and direct output match model_dump_json."""
+    doc = make_document()
+    expected = doc.model_dump_json(by_alias=True, exclude_none=True).encode()
+    assert dump_json(doc) == expected
+    assert b"".join(iter_json(doc)) == expected
+    for indent in (2, 4):
+        assert b"".join(iter_json(doc, indent=indent)) == dump_json(doc, indent=indent)
+    assert (
+        b"".join(iter_json(doc, exclude_none=False))
+        == doc.model_dump_json(by_alias=True).encode()
+    )
+
+    data = json.loads(expected)
+    assert data["operations"]["sendAudit"]["x-owner"] == "security"
+    assert data["channels"]["audit"]["x-retention"] == "7d"
+    assert "defaultContentType" in data and "default_content_type" not in data
+
+
+def test_streaming_leaves_lazy_entries_deferred(make_document):
+    """Test that writing a lazy document does not keep its entries validated."""
+    doc = make_document(lazy=True)
+    expected = make_document().model_dump_json(by_alias=True, exclude_none=True)
+
+    chunks = list(iter_json(doc))
+    assert len(chunks) > len(doc.channels) + len(doc.operations)
+    assert b"".join(chunks) == expected.encode()
+    assert not any(doc.channels.is_loaded(key) for key in dict.keys(doc.channels))
+
+
+@pytest.mark.parametrize("format", ["json", "yaml"])
+def test_write_spec_round_trip(tmp_path, format, make_document):
+    """Test that written files load back to the same document."""
+    if format == "yaml":
+        pytest.importorskip("yaml")
+    doc = make_document()
+    path = tmp_path / f"asyncapi.{format}"
+    write_spec(doc, path)
+    assert load_spec(path) == doc
+
+    text = io.StringIO()
+    write_spec(doc, text, format=format)
+    assert text.getvalue().encode() == path.read_bytes()
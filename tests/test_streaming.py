@@ -0,0 +1,154 @@
+"""Test the streaming document loader."""
+
+import io
+import json
+
+import pytest
+
+from pydantic import ValidationError
+
+from asyncapi_pydantics import AsyncAPI, Channel, Operation
+from asyncapi_pydantics.locations import SourceMap
+from asyncapi_pydantics.streaming import iter_spec, load_spec
+
+
+def make_document_data(channels=5):
+    """Build raw document data with a configurable number of channels."""
+    return {
+        "asyncapi": "3.0.0",
+        "info": {"title": "Streaming API", "version": "1.0.0"},
+        "servers": {"broker": {"host": "broker.example.com", "protocol": "mqtt"}},
+        "channels": {
+            f"channel{i}": {
+                "address": f"devices/{i}/events",
+                "description": "é" * 50,
+                "messages": {"event": {"$ref": "#/components/messages/event"}},
+            }
+            for i in range(channels)
+        },
+        "operations": {
+            "onEvent": {"action": "receive", "channel": {"$ref": "#/channels/channel1"}}
+        },
+        "components": {
+            "messages": {"event": {"name": "event", "payload": {"maximum": 12345}}},
+            "schemas": {},
+        },
+        "x-extension": [1, 2.5, None, True],
+    }
+
+
+def test_iter_spec_json_yields_validated_entries():
+    """Test that JSON entries are validated one at a time."""
+    data = make_document_data()
+    entries = list(iter_spec(io.BytesIO(json.dumps(data).encode()), format="json"))
+
+    channels = [e for e in entries if e.section == "/channels"]
+    assert [e.key for e in channels] == list(data["channels"])
+    assert all(isinstance(e.value, Channel) for e in channels)
+    operations = [e for e in entries if e.section == "/operations"]
+    assert isinstance(operations[0].value, Operation)
+    messages = [e for e in entries if e.section == "/components/messages"]
+    assert messages[0].value == {"name": "event", "payload": {"maximum": 12345}}
+
+
+def test_load_spec_json_small_chunks(tmp_path, monkeypatch):
+    """Test that values split across read chunks are decoded correctly."""
+    from asyncapi_pydantics import streaming
+
+    monkeypatch.setattr(streaming._JSONStream.__init__, "__defaults__", (7,))
+    data = make_document_data(channels=20)
+    path = tmp_path / "spec.json"
+    path.write_text(json.dumps(data, indent=2), encoding="utf-8")
+
+    assert load_spec(path) == AsyncAPI(**data)
+
+
+def test_load_spec_yaml(tmp_path):
+    """Test streaming a YAML document."""
+    yaml = pytest.importorskip("yaml")
+    data = make_document_data()
+    path = tmp_path / "spec.yaml"
+    path.write_text(yaml.safe_dump(data), encoding="utf-8")
+
+    assert load_spec(path) == AsyncAPI(**data)
+
+
+def test_load_spec_yaml_anchors(tmp_path):
+    """Test that YAML anchors and aliases work across entries."""
+    pytest.importorskip("yaml")
+    path = tmp_path / "spec.yml"
+    path.write_text(
+        "asyncapi: 3.0.0\n"
+        "info: {title: Anchors, version: 1.0.0}\n"
+        "channels:\n"
+        "  first: &shared\n"
+        "    address: shared/topic\n"
+        "  second: *shared\n",
+        encoding="utf-8",
+    )
+
+    doc = load_spec(path)
+    assert doc.channels["second"].address == "shared/topic"
+
+
+def test_load_spec_yaml_locations(tmp_path):
+    """Test that validation errors carry the line and column of the value."""
+    pytest.importorskip("yaml")
+    path = tmp_path / "spec.yaml"
+    text = (
+        "asyncapi: 3.0.0\n"
+        "info:\n"
+        "  title: Locations\n"
+        "  version: [1]\n"
+        "channels:\n"
+        "  lights:\n"
+        "    address: lights\n"
+        "    tags:\n"
+        "    - name: first\n"
+        "    - {name: 2}\n"
+        "operations:\n"
+        "  onLights:\n"
+        "    channel: {$ref: '#/channels/lights'}\n"
+    )
+    path.write_text(text, encoding="utf-8")
+    source_map = SourceMap()
+    entries = iter_spec(path, source_map=source_map)
+
+    with pytest.raises(ValidationError) as info:
+        list(entries)
+    assert [error["loc"] for error in info.value.errors()] == [
+        ("channels", "lights", "tags", 1, "name"),
+        ("operations", "onLights", "action"),
+    ]
+    assert info.value.locations == [
+        ("#/channels/lights/tags/1/name", 10, 8),
+        ("#/operations/onLights", 12, 3),
+    ]
+    assert source_map.get("#/info/title") == ("#/info/title", 3, 3)
+
+    path.write_text(text.replace("{name: 2}", "{name: second}"), encoding="utf-8")
+    with pytest.raises(ValidationError) as info:
+        load_spec(path, locations=True)
+    assert [error["loc"] for error in info.value.errors()] == [
+        ("operations", "onLights", "action"),
+        ("info", "version"),
+    ]
+    assert [str(location) for location in info.value.locations] == [
+        "line 12, column 3",
+        "line 4, column 3",
+    ]
+
+    path.write_text(text.replace("onLights", "x").replace("{name: 2}", "{}"))
+    with pytest.raises(ValidationError) as info:
+        load_spec(path)
+    assert not hasattr(info.value, "locations")
+
+
+def test_load_spec_invalid_json():
+    """Test that malformed JSON raises a decode error."""
+    with pytest.raises(json.JSONDecodeError):
+        load_spec(io.BytesIO(b'{"asyncapi": "3.0.0", "channels": {"a": }'))
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
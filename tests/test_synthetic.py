@@ -0,0 +1,60 @@
+"""Test the synthetic document generator and the benchmark runner."""
+
+import json
+import os
+import subprocess
+import sys
+
+import pytest
+
+from asyncapi_pydantics import AsyncAPI
+from asyncapi_pydantics.synthetic import generate_spec
+
+BENCHMARKS = os.path.join(
+    os.path.dirname(__file__), "..", "benchmarks", "run_benchmarks.py"
+)
+
+
+def test_generated_document_sizes():
+    """Test that the requested counts are honoured."""
+    data = generate_spec(servers=2, channels=5, operations=7, messages=3)
+    doc = AsyncAPI.model_validate(data)
+
+    assert len(doc.servers) == 2
+    assert len(doc.channels) == 5
+    assert len(doc.operations) == 7
+    assert all(len(channel.messages) == 3 for channel in doc.channels.values())
+    assert generate_spec(channels=5, seed=1) == generate_spec(channels=5, seed=1)
+
+
+@pytest.mark.parametrize("ref_density", [0.0, 0.5, 1.0])
+def test_generated_references_resolve(ref_density):
+    """Test that every reference in a generated document resolves."""
+    data = generate_spec(channels=4, schema_depth=3, ref_density=ref_density)
+    doc = AsyncAPI.model_validate(data)
+    schemas = data["components"]["schemas"]
+
+    assert bool(schemas) == (ref_density > 0)
+    for operation in doc.operations.values():
+        assert doc.resolver.resolve_channel(operation.channel["$ref"]).address
+        for ref in operation.messages:
+            assert doc.resolver.resolve_message(ref["$ref"]).payload is not None
+    for name in schemas:
+        assert doc.resolve(f"#/components/schemas/{name}") is not None
+
+
+def test_benchmark_runner_smoke():
+    """Test that the benchmark script runs and reports every measurement."""
+    result = subprocess.run(
+        [sys.executable, BENCHMARKS, "--sizes", "2", "--repeat", "1", "--json"],
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    (row,) = json.loads(result.stdout)
+    assert row["channels"] == 2
+    assert {"parse_s", "parse_peak_mb", "dump_json_s", "resolve_s"} <= set(row)
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
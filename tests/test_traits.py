@@ -0,0 +1,48 @@
+"""Test merging of message and operation traits."""
+
+from asyncapi_pydantics.traits import TraitMerger, merge_patch
+
+
+def test_merge_patch():
+    """Test RFC 7386 semantics on nested values."""
+    target = {"a": {"b": 1, "c": 2}, "d": [1], "e": 1}
+    assert merge_patch(target, {"a": {"b": None, "x": 3}, "d": [2], "e": None}) == {
+        "a": {"c": 2, "x": 3},
+        "d": [2],
+    }
+    assert target == {"a": {"b": 1, "c": 2}, "d": [1], "e": 1}
+
+
+def test_message_traits_are_applied(make_document):
+    """Test that traits merge in order and never override the message."""
+    doc = make_document()
+    traits = TraitMerger(doc)
+    pointer = "#/channels/lights/messages/traced"
+    message = traits.message(pointer)
+
+    assert message.traits is None
+    assert message.name == "measurement"
+    assert message.content_type == "application/json"
+    assert message.headers == {
+        "type": "object",
+        "properties": {"id": {"type": "integer"}, "trace": {"type": "string"}},
+    }
+    assert traits.message(pointer) is message
+    assert traits.message(doc.channels["lights"].messages["traced"]) is message
+
+    plain = doc.channels["lights"].messages["dimmed"]
+    assert traits.message(plain) is plain
+
+
+def test_operation_traits_are_applied(make_document):
+    """Test operation traits, including referenced ones."""
+    doc = make_document()
+    traits = TraitMerger(doc)
+    operation = traits.operation(doc.operations["receiveLights"])
+
+    assert operation.summary == "Receive readings."
+    assert operation.description == "From a trait."
+    assert operation.bindings == {"kafka": {"groupId": "lights"}}
+    assert operation.channel == {"$ref": "#/channels/lights"}
+    assert operation.traits is None
+    assert traits.operation("#/operations/receiveLights") is operation
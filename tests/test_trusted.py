@@ -0,0 +1,120 @@
+"""Test trusted loading without validation."""
+
+import pytest
+from pydantic import BaseModel
+
+from asyncapi_pydantics import AsyncAPI
+from asyncapi_pydantics.synthetic import generate_spec
+
+from examples.streetlights_example import create_streetlights_example
+
+
+def assert_identical(validated, trusted, path="$"):
+    """Assert two trees have the same types, values, field sets and order."""
+    assert type(validated) is type(trusted), path
+    if isinstance(validated, BaseModel):
+        assert list(validated.__dict__) == list(trusted.__dict__), path
+        assert validated.model_fields_set == trusted.model_fields_set, path
+        assert validated.__pydantic_extra__ == trusted.__pydantic_extra__, path
+        assert validated.__pydantic_private__ == trusted.__pydantic_private__, path
+        for name, value in validated.__dict__.items():
+            assert_identical(value, trusted.__dict__[name], f"{path}.{name}")
+    elif isinstance(validated, dict):
+        assert list(validated) == list(trusted), path
+        for key, value in validated.items():
+            assert_identical(value, trusted[key], f"{path}/{key}")
+    elif isinstance(validated, list):
+        assert len(validated) == len(trusted), path
+        for index, (left, right) in enumerate(zip(validated, trusted)):
+            assert_identical(left, right, f"{path}[{index}]")
+    else:
+        assert validated == trusted, path
+
+
+# A document exercising aliases, URLs, traits and extensions.
+FEATURES = {
+    "asyncapi": "3.0.0",
+    "x-owner": "lighting",
+    "info": {
+        "title": "Trusted API",
+        "version": "1.0.0",
+        "termsOfService": "https://example.com/terms",
+        "contact": {"email": "team@example.com", "url": "https://example.com"},
+        "tags": [{"name": "lights", "externalDocs": {"url": "https://x.io"}}],
+    },
+    "defaultContentType": "application/json",
+    "servers": {
+        "prod": {
+            "host": "broker.example.com",
+            "protocol": "mqtt",
+            "variables": {"port": {"default": "1883", "enum": ["1883"]}},
+        }
+    },
+    "channels": {
+        "lights": {
+            "address": "lights/{id}",
+            "parameters": {"id": {"description": "Light id."}},
+            "messages": {
+                "on": {
+                    "contentType": "application/json",
+                    "correlationId": {"location": "$message.header#/id"},
+                    "payload": {"type": "object"},
+                },
+                "off": {"$ref": "#/components/messages/off"},
+            },
+        }
+    },
+    "operations": {
+        "turnOn": {
+            "action": "send",
+            "channel": {"$ref": "#/channels/lights"},
+            "traits": [
+                {"$ref": "#/components/operationTraits/common"},
+                {"bindings": {"mqtt": {"qos": 1}}},
+            ],
+            "reply": {"address": {"location": "$message.header#/replyTo"}},
+        }
+    },
+    "components": {
+        "messages": {"off": {"payload": {"type": "string"}}},
+        "securitySchemes": {"user": {"type": "userPassword"}},
+    },
+}
+
+
+@pytest.mark.parametrize(
+    "data",
+    [
+        FEATURES,
+        create_streetlights_example(),
+        generate_spec(servers=2, channels=5, messages=2, ref_density=0.5),
+    ],
+    ids=["features", "streetlights", "synthetic"],
+)
+def test_trusted_tree_matches_validated_tree(data):
+    """Test that trusted loads build exactly the tree validation builds."""
+    validated = AsyncAPI.load(data)
+    trusted = AsyncAPI.load(data, trusted=True)
+
+    assert_identical(validated, trusted)
+    assert trusted == validated
+    assert trusted.model_dump_json(
+        by_alias=True, exclude_unset=True
+    ) == validated.model_dump_json(by_alias=True, exclude_unset=True)
+
+
+def test_trusted_document_is_usable(make_document):
+    """Test that aliases, defaults and the resolver work on trusted trees."""
+    doc = make_document(FEATURES, trusted=True)
+
+    assert make_document(FEATURES, trusted=True, lazy=True) == doc
+    assert doc.default_content_type == "application/json"
+    assert doc.info.tags[0].external_docs.url == "https://x.io"
+    assert doc.components.tags is None
+    assert doc.resolver.resolve_message("#/components/messages/off").payload == {
+        "type": "string"
+    }
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
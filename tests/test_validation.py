@@ -0,0 +1,189 @@
+"""Test compiled payload validators."""
+
+import gc
+import weakref
+
+import pytest
+
+from asyncapi_pydantics import AsyncAPI, Message, Schema
+from asyncapi_pydantics.validation import (
+    PayloadValidationError,
+    SchemaCompileError,
+    compile_schema,
+    message_validator,
+    validate_batch,
+)
+
+LIGHT_MEASURED = {
+    "type": "object",
+    "required": ["lumens", "sentAt"],
+    "properties": {
+        "lumens": {"type": "integer", "minimum": 0, "maximum": 100000},
+        "sentAt": {"type": "string", "pattern": r"^\d{4}-\d{2}-\d{2}"},
+        "mode": {"enum": ["auto", "manual"]},
+        "readings": {"type": "array", "items": {"type": "number"}, "maxItems": 3},
+    },
+    "additionalProperties": False,
+}
+
+
+def test_valid_and_invalid_payloads():
+    """Test the boolean fast path of a compiled validator."""
+    validator = compile_schema(Schema(**LIGHT_MEASURED))
+
+    assert validator({"lumens": 10, "sentAt": "2024-01-01", "mode": "auto"})
+    assert validator({"lumens": 0, "sentAt": "2024-01-01", "readings": [1, 2.5]})
+    assert not validator({"lumens": -1, "sentAt": "2024-01-01"})
+    assert not validator({"lumens": True, "sentAt": "2024-01-01"})
+    assert not validator({"lumens": 1})
+    assert not validator({"lumens": 1, "sentAt": "2024-01-01", "extra": 1})
+    assert not validator({"lumens": 1, "sentAt": "2024-01-01", "mode": "off"})
+    assert not validator({"lumens": 1, "sentAt": "2024-01-01", "readings": [1] * 4})
+    assert not validator("not an object")
+
+
+def test_errors_report_paths():
+    """Test that errors are only collected on failures, with paths."""
+    validator = compile_schema(LIGHT_MEASURED)
+    payload = {"lumens": 5, "sentAt": "yesterday", "readings": [1, "x"]}
+
+    errors = validator.errors(payload)
+    assert {(e.path, e.keyword) for e in errors} == {
+        (("sentAt",), "pattern"),
+        (("readings", 1), "type"),
+    }
+    assert validator.errors({"lumens": 5, "sentAt": "2024-01-01"}) == []
+    with pytest.raises(PayloadValidationError) as exc_info:
+        validator.validate(payload)
+    assert exc_info.value.errors == errors
+
+
+def test_composition_keywords():
+    """Test allOf, anyOf, oneOf, not and conditionals."""
+    assert compile_schema({"allOf": [{"minimum": 1}, {"maximum": 3}]})(2)
+    assert not compile_schema({"allOf": [{"minimum": 1}, {"maximum": 3}]})(4)
+    assert compile_schema({"anyOf": [{"type": "string"}, {"type": "null"}]})(None)
+    one_of = compile_schema({"oneOf": [{"type": "integer"}, {"minimum": 0}]})
+    assert one_of(-1)
+    assert not one_of(1)
+    assert compile_schema({"not": {"type": "string"}})(1)
+    conditional = compile_schema(
+        {"if": {"type": "string"}, "then": {"minLength": 2}, "else": {"minimum": 0}}
+    )
+    assert conditional("ab") and conditional(1)
+    assert not conditional("a") and not conditional(-1)
+
+
+def test_validators_are_cached():
+    """Test that compiling the same schema twice returns the same validator."""
+    schema = Schema(**LIGHT_MEASURED)
+    assert compile_schema(schema) is compile_schema(schema)
+    assert compile_schema(LIGHT_MEASURED) is compile_schema(dict(LIGHT_MEASURED))
+
+    message = Message(payload=LIGHT_MEASURED)
+    assert message_validator(message) is message_validator(message)
+
+
+def test_validators_do_not_keep_documents_alive():
+    """Test that a document is freed once only its cached validators remain."""
+    doc = AsyncAPI.load(
+        {
+            "asyncapi": "3.0.0",
+            "info": {"title": "Lights", "version": "1.0.0"},
+            "components": {
+                "schemas": {"Lumens": {"type": "integer"}},
+                "messages": {
+                    "measured": {"payload": {"$ref": "#/components/schemas/Lumens"}}
+                },
+            },
+        }
+    )
+    resolver = doc.resolver
+    message = resolver.resolve_message("#/components/messages/measured")
+    assert message_validator(message, resolver)(3)
+    assert compile_schema(
+        resolver.resolve_schema("#/components/schemas/Lumens"), resolver
+    )(3)
+    assert message_validator(message, resolver) is message_validator(message, resolver)
+    ref = weakref.ref(doc)
+
+    del doc, resolver, message
+    gc.collect()
+    assert ref() is None
+
+
+def test_message_validator_with_recursive_refs():
+    """Test references into components, including recursive schemas."""
+    doc = AsyncAPI(
+        **{
+            "asyncapi": "3.0.0",
+            "info": {"title": "Tree API", "version": "1.0.0"},
+            "components": {
+                "schemas": {
+                    "Node": {
+                        "type": "object",
+                        "properties": {
+                            "value": {"type": "integer"},
+                            "children": {
+                                "type": "array",
+                                "items": {"$ref": "#/components/schemas/Node"},
+                            },
+                        },
+                    }
+                },
+                "messages": {
+                    "tree": {"payload": {"$ref": "#/components/schemas/Node"}}
+                },
+            },
+        }
+    )
+    message = doc.resolver.resolve_message("#/components/messages/tree")
+    validator = message_validator(message, doc.resolver)
+
+    assert validator({"value": 1, "children": [{"value": 2, "children": []}]})
+    bad = {"value": 1, "children": [{"value": "two"}]}
+    assert [e.path for e in validator.errors(bad)] == [("children", 0, "value")]
+    with pytest.raises(SchemaCompileError):
+        compile_schema({"$ref": "#/components/schemas/Node"})
+
+
+def test_validate_batch():
+    """Test batch validation of decoded payloads and raw buffers."""
+    message = Message(payload=LIGHT_MEASURED)
+    payloads = [
+        {"lumens": 1, "sentAt": "2024-01-01"},
+        b'{"lumens": 2, "sentAt": "2024-01-02"}',
+        {"lumens": -1, "sentAt": "2024-01-01"},
+        b"{not json",
+    ] * 5
+
+    result = validate_batch(message, payloads)
+    assert len(result) == 20
+    assert result.valid_count == 10
+    assert not result.all_valid
+    assert result.is_valid(0) and result.is_valid(1) and not result.is_valid(2)
+    assert result.invalid_indices() == [i for i in range(20) if i % 4 >= 2]
+    assert sorted(result.errors) == result.invalid_indices()
+    assert result.errors[2][0].keyword == "minimum"
+    assert result.errors[3][0].keyword == "decode"
+    assert len(result.bitmap) == 3
+
+    quiet = message_validator(message).validate_batch(payloads, collect_errors=False)
+    assert quiet.bitmap == result.bitmap
+    assert quiet.errors == {}
+    assert validate_batch(message, []).all_valid
+
+
+def test_validate_batch_strings():
+    """Test that strings are payloads unless raw decoding is requested."""
+    result = validate_batch({"type": "string", "minLength": 2}, ["hello", "x"])
+    assert result.invalid_indices() == [1]
+    assert result.errors[1][0].keyword == "minLength"
+
+    raw = validate_batch({"type": "object"}, ['{"a": 1}', "{not json"], raw=True)
+    assert raw.invalid_indices() == [1]
+    assert raw.errors[1][0].keyword == "decode"
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])